@@ -5,15 +5,257 @@ import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Config:
+    # Project root, exposed on the class so helpers can use Config.PROJECT_ROOT
+    PROJECT_ROOT = PROJECT_ROOT
+
     # URLs for each test scenario
-    UPLOAD_URL = "https://the-internet.herokuapp.com/upload"
-    DRAG_AND_DROP_URL = "https://the-internet.herokuapp.com/drag_and_drop" # <-- ENSURE THIS LINE IS PRESENT AND CORRECT
+    THE_INTERNET_BASE_URL = "https://the-internet.herokuapp.com"
+    UPLOAD_URL = THE_INTERNET_BASE_URL + "/upload"
+    DRAG_AND_DROP_URL = THE_INTERNET_BASE_URL + "/drag_and_drop" # <-- ENSURE THIS LINE IS PRESENT AND CORRECT
     AUBERGINE_URL = "https://auberginesolutions.com/"
     TOCKIFY_URL = "https://tockify.com/"
 
     # Browser settings
     HEADLESS_MODE = False
     DEFAULT_WAIT_TIME = 10
+    # Implicit wait for every find_element call. Kept at 0: explicit waits decide how long to wait,
+    # and a non-zero implicit wait makes every "is it absent?" check stall for the full duration.
+    IMPLICIT_WAIT_TIME = 0
+    # Maximum duration of an async script (e.g. BasePage.wait_for_any's in-browser polling loop)
+    SCRIPT_TIMEOUT = 30
+    # Backend of BasePage's explicit waits: "poll" re-checks the condition with one WebDriver command per
+    # poll (WebDriverWait), "observer" blocks in a single async script that re-checks inside the page on
+    # every DOM mutation (see utils/observer_wait.py). Conditions the observer cannot run are still polled.
+    WAIT_BACKEND = "poll"
+    # With the observer backend, milliseconds between extra in-page checks for visibility changes that
+    # mutate nothing (stylesheets, media queries, CSS animations)
+    OBSERVER_FALLBACK_POLL_MS = 250
+    # Chrome page load strategy: "normal" waits for every subresource, "eager" returns once the
+    # HTML is parsed (DOMContentLoaded), "none" returns as soon as navigation starts.
+    # With "eager"/"none", BasePage.go_to_url waits for the page object's ready_conditions() instead.
+    PAGE_LOAD_STRATEGY = "eager"
+    # Chrome launch profile (see DriverManager.build_options): "default", or "lean" to switch off browser
+    # subsystems the scenarios never use and cap renderer processes, so more browsers fit on one CI host
+    BROWSER_LAUNCH_PROFILE = "default"
+    # Switches added by the "lean" profile: no extensions, background networking, component updates,
+    # sync, crash reporting, GPU process or first-run work
+    LEAN_BROWSER_ARGUMENTS = (
+        "--disable-extensions",
+        "--disable-component-extensions-with-background-pages",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--disable-domain-reliability",
+        "--disable-client-side-phishing-detection",
+        "--disable-breakpad",
+        "--metrics-recording-only",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--mute-audio",
+        "--disable-gpu",
+        "--disable-software-rasterizer",
+        "--disable-dev-shm-usage",
+        "--disable-features=Translate,OptimizationHints,MediaRouter,BackForwardCache,AutofillServerCommunication",
+    )
+    # Renderer processes a lean browser may start (None = Chrome's default, one per site). Site isolation
+    # is turned off with a limit, otherwise every cross-site iframe still gets its own process.
+    LEAN_RENDERER_PROCESS_LIMIT = 2
+    # Lean browsers don't load images. Off by default: layout (and so visibility/clickability) can
+    # change without them.
+    LEAN_DISABLE_IMAGES = False
+
+    # Readiness settings (used by BasePage.wait_until_ready and utils/readiness.py)
+    # How often readiness conditions are re-checked, in seconds. Shorter than WebDriverWait's
+    # default 0.5s so a wait returns close to the moment the page is actually ready.
+    READINESS_POLL_INTERVAL = 0.1
+    # Milliseconds without DOM mutations before the DOM counts as stable
+    DOM_QUIET_MS = 300
+    # Milliseconds without network activity (and no fetch/XHR in flight) before the network counts as idle
+    NETWORK_QUIET_MS = 500
+    # Seconds dom_stable/network_idle/page_settled wait for quiet before giving up with a warning and
+    # letting the test proceed, for pages that never go quiet (carousels, live calendars, polling)
+    QUIET_MAX_WAIT = 3
+    # Seconds an element's text/attribute must stay unchanged to count as settled
+    ELEMENT_SETTLE_TIME = 0.3
+
+    # Local stand-in server (utils/local_server.py) for the upload and drag-and-drop pages.
+    # When enabled, a session fixture starts it and points UPLOAD_URL/DRAG_AND_DROP_URL at it,
+    # so those scenarios run without network access to the-internet.herokuapp.com.
+    USE_LOCAL_SERVER = True
+    LOCAL_SERVER_HOST = "127.0.0.1"
+    LOCAL_SERVER_PORT = 0  # 0 = pick a free port
+
+    # Record-and-replay proxy settings (used by utils/replay_proxy.py and pytest --replay)
+    # None: browsers talk to the live sites. "record": traffic goes through the proxy and every
+    # response is stored per test. "replay": responses come from the recording only.
+    REPLAY_MODE = None
+    # Recordings (content-addressed bodies + one cassette per test) and the proxy's certificate
+    REPLAY_STORE_DIR = os.path.join(PROJECT_ROOT, ".cache", "replay")
+    # Fixed latency added to every replayed response, in milliseconds (0 = local-disk speed)
+    REPLAY_LATENCY_MS = 0
+    # What replay does with a request that was not recorded: "error" (504) or "passthrough" (live site)
+    REPLAY_ON_MISS = "error"
+    # Query parameters that differ on every visit (cache busters, timestamps), ignored when matching requests
+    REPLAY_IGNORED_QUERY_PARAMS = ("_", "cb", "cachebuster", "timestamp", "ts", "rnd")
+    # Proxy every browser is started with ("http://host:port"); set by the replay fixture
+    BROWSER_PROXY = None
+    # Start marked tests from profile snapshots while the proxy runs. Off: a snapshot's cached assets
+    # would never reach the recording. On: each snapshot build records/replays its own cassette.
+    PROFILE_SNAPSHOTS_WITH_REPLAY = False
+
+    # Browser pool settings (used by utils/driver_manager.py)
+    # Number of warm browsers kept per test process
+    BROWSER_POOL_SIZE = 1
+    # A browser is quit and replaced after serving this many tests
+    BROWSER_MAX_USES = 20
+
+    # Profile snapshot settings (used by utils/profile_snapshots.py)
+    # Start browsers of tests marked @pytest.mark.browser_profile(page=PageClass) from a pre-baked profile
+    # of that site (consent given, static assets cached)
+    PROFILE_SNAPSHOTS_ENABLED = True
+    PROFILE_SNAPSHOTS_DIR = os.path.join(PROJECT_ROOT, ".cache", "profile_snapshots")
+    # Seconds before a snapshot is rebuilt (consent cookies and cached assets go stale)
+    PROFILE_SNAPSHOT_TTL = 24 * 60 * 60
+
+    # Parallel execution settings (used by utils/parallel_runner.py)
+    # Number of browser workers; None means one worker per CPU core.
+    PARALLEL_WORKERS = None
+    # Each worker gets its own Chrome user-data-dir under this folder so browsers never share state.
+    BROWSER_PROFILES_DIR = os.path.join(PROJECT_ROOT, ".browser_profiles")
+    # Per-worker logs/JUnit files and the merged report are written here.
+    REPORTS_DIR = os.path.join(PROJECT_ROOT, "reports")
+    # Environment variable the runner uses to tell each pytest process which worker it is.
+    WORKER_ID_ENV_VAR = "AUBERGINE_WORKER_ID"
+
+    # Duration history settings (used by utils/duration_history.py to balance parallel workers)
+    DURATION_HISTORY_PATH = os.path.join(PROJECT_ROOT, ".cache", "test_durations.json")
+    # Runs remembered per test; the median of these is the test's expected duration
+    DURATION_HISTORY_SIZE = 10
+    # Expected seconds for tests without history, first matching node-id pattern wins
+    DURATION_ESTIMATES = {
+        "*test_tockify_scenario.py::*": 40,
+        "*test_aubergine_scenario.py::*": 25,
+        "*test_multi_tab_scenario.py::*": 10,
+        "*test_upload_scenario.py::*": 6,
+        "*test_drag_and_drop_scenario.py::*": 5,
+    }
+    DEFAULT_DURATION_ESTIMATE = 15
+
+    # Element cache (see BasePage.enable_element_cache). Off by default; page objects
+    # that re-read the same locators many times can opt in individually.
+    ELEMENT_CACHE_ENABLED = False
+
+    # Resource blocking settings (used by utils/resource_blocking.py)
+    # Page objects declare BLOCKED_URL_PATTERNS / BLOCKED_RESOURCE_TYPES / ALLOWED_URL_PATTERNS;
+    # the browser drops matching requests before they are sent.
+    RESOURCE_BLOCKING_ENABLED = True
+    # Report the requests and bytes blocking saved in the session summary (from Chrome's performance log)
+    RESOURCE_BLOCKING_REPORT = True
+    # Analytics, ad, chat-widget and consent-manager hosts that no scenario asserts on
+    THIRD_PARTY_URL_PATTERNS = (
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*connect.facebook.net*",
+        "*snap.licdn.com*",
+        "*static.hotjar.com*",
+        "*script.hotjar.com*",
+        "*clarity.ms*",
+        "*js.hs-analytics.net*",
+        "*js.hs-banner.com*",
+        "*js.usemessages.com*",
+        "*widget.intercom.io*",
+        "*js.driftt.com*",
+        "*embed.tawk.to*",
+        "*cdn-cookieyes.com*",
+        "*cookielaw.org*",
+    )
+
+    # Step trace settings (used by utils/step_tracer.py)
+    # Record start/end, locator, outcome and wait time of every BasePage action and explicit wait
+    STEP_TRACE_ENABLED = True
+    # Per-test Chrome trace-event JSON files are written here (open in chrome://tracing or Perfetto)
+    TRACES_DIR = os.path.join(PROJECT_ROOT, "reports", "traces")
+    # Number of slowest steps listed in the summary at the end of the session
+    TRACE_SUMMARY_TOP_N = 10
+
+    # Failure artifact settings (used by utils/artifacts.py)
+    # Capture a screenshot, DOM snapshot, console log and URL/frame when a page-object step or a test fails
+    ARTIFACTS_ENABLED = True
+    # Also capture after every passing top-level page-object step (slower, for debugging flaky tests)
+    ARTIFACTS_ON_PASS = False
+    ARTIFACTS_DIR = os.path.join(PROJECT_ROOT, "reports", "artifacts")
+    # Background threads that compress and write artifacts
+    ARTIFACT_WORKERS = 2
+    # Captures that may wait for the writer threads; beyond this, new captures are dropped instead of blocking
+    ARTIFACT_QUEUE_SIZE = 8
+
+    # Event log settings (used by utils/event_log.py instead of print in pages and browser utilities)
+    # Lowest level kept in the per-test ring buffer: "DEBUG", "INFO", "WARNING" or "ERROR"
+    EVENT_LOG_LEVEL = "DEBUG"
+    # Events at this level or above are also printed immediately
+    EVENT_LOG_ECHO_LEVEL = "WARNING"
+    # Most recent events kept per test
+    EVENT_LOG_BUFFER_SIZE = 1000
+    # A failed test's events are written here as JSON lines
+    EVENT_LOG_DIR = os.path.join(PROJECT_ROOT, "reports", "events")
+    # Write every test's events, not only failed ones (pytest -vv does the same)
+    EVENT_LOG_ALWAYS_FLUSH = False
+
+    # Step checkpoint settings (used by utils/checkpoints.py and pytest --resume-from-checkpoint)
+    # Save the browser state after every @checkpoint page-object step
+    CHECKPOINTS_ENABLED = True
+    # One file per test; deleted once the test passes
+    CHECKPOINTS_DIR = os.path.join(PROJECT_ROOT, ".cache", "checkpoints")
+    # Older checkpoints are ignored on resume (sessions and cookies expire), in seconds
+    CHECKPOINT_MAX_AGE = 6 * 60 * 60
+
+    # Consistency check settings (used by utils/consistency_check.py before every pytest run)
+    # Fail the run before any browser starts if a page object or test references a missing
+    # locator/method or a selector does not parse
+    CONSISTENCY_CHECK_ENABLED = True
+    CONSISTENCY_CHECK_DIRS = ("pages", "locators", "tests")
+    # Per-file results, reused while the file's content hash is unchanged
+    CONSISTENCY_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "consistency_check.json")
+
+    # Test impact analysis settings (used by utils/impact_analysis.py and pytest --impacted-since)
+    # Branch/commit changes are compared against by default
+    IMPACT_BASE_REF = "origin/main"
+    # Parsed imports per file, reused while the file's mtime and size are unchanged
+    IMPACT_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "impact_graph.json")
+    # Directories that never contain project code
+    IMPACT_SKIPPED_DIRS = ("__pycache__", "reports", "drivers", "venv")
+    # Changed files that cannot affect any test. Any other non-Python change selects all tests.
+    IMPACT_IGNORED_PATTERNS = ("*.md", "README.md/*", ".gitignore", ".idea/*", "requests.jsonl", "benchmarks/*")
+
+    # Scenario benchmark settings (used by utils/benchmark.py)
+    # How many times each scenario is run per benchmark
+    BENCHMARK_RUNS = 5
+    # Stored medians/p95s that later runs are compared against
+    BENCHMARK_BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+    # A metric regresses when its median is this fraction slower than the baseline...
+    BENCHMARK_REGRESSION_THRESHOLD = 0.20
+    # ...and at least this many milliseconds slower (ignores noise on very short metrics)
+    BENCHMARK_MIN_REGRESSION_MS = 100
+    # Environment variable the benchmark runner uses to tell pytest where to write metrics
+    BENCHMARK_OUTPUT_ENV_VAR = "AUBERGINE_BENCHMARK_OUT"
+
+    # Upload throughput benchmark settings (used by utils/upload_benchmark.py)
+    # Synthetic file sizes to upload through UploadPage, one bucket each (KB/MB/GB are powers of 1024)
+    UPLOAD_BENCHMARK_SIZES = ("1KB", "100KB", "1MB", "10MB", "100MB")
+    # Uploads per size bucket
+    UPLOAD_BENCHMARK_RUNS = 3
+    # Where generated files are written (None = the system temp directory); they are deleted afterwards
+    UPLOAD_BENCHMARK_TMP_DIR = None
+    # Seconds a single upload may take before it counts as failed (large files need more than DEFAULT_WAIT_TIME)
+    UPLOAD_BENCHMARK_TIMEOUT = 300
+
+    # Browser footprint measurement settings (used by utils/browser_footprint.py)
+    # Browsers kept open at the same time per launch profile, as parallel workers would
+    FOOTPRINT_BROWSERS = 4
+    # Seconds to let the browsers settle after loading the page, before memory is sampled
+    FOOTPRINT_SETTLE_TIME = 3
 
     # Test data paths
     TEST_FILE_NAME = "test_file.pdf"
@@ -22,4 +264,22 @@ class Config:
     # Expected values for assertions
     # AUBERGINE_PYTHON_TITLE = "Python | Aubergine Solutions"
     TOCKIFY_EXPECTED_DATE_FORMAT = "28/02/40"
-    TOCKIFY_CALENDAR_TITLE_PART = "Tockify"
\ No newline at end of file
+    TOCKIFY_CALENDAR_TITLE_PART = "Tockify"
+
+    @classmethod
+    def use_the_internet_base_url(cls, base_url):
+        """Points the upload and drag-and-drop scenarios at another host (e.g. the local stand-in server)."""
+        cls.THE_INTERNET_BASE_URL = base_url
+        cls.UPLOAD_URL = base_url + "/upload"
+        cls.DRAG_AND_DROP_URL = base_url + "/drag_and_drop"
+
+    @classmethod
+    def worker_profile_dir(cls):
+        """
+        Returns the Chrome user-data-dir for the current parallel worker,
+        or None when the suite is running serially (no worker id set).
+        """
+        worker_id = os.environ.get(cls.WORKER_ID_ENV_VAR)
+        if worker_id is None:
+            return None
+        return os.path.join(cls.BROWSER_PROFILES_DIR, f"worker-{worker_id}")
\ No newline at end of file
@@ -14,4 +14,15 @@ class AubergineLocators:
     CAROUSEL_CONTAINER = (By.CSS_SELECTOR, ".owl-carousel.wp-block-aubergine-owl-carousel")
 
     # The "Talk to our python experts now" button link
-    TALK_TO_EXPERTS_BUTTON = (By.CSS_SELECTOR, "a.wp-block-button__link[href*='contact']")
\ No newline at end of file
+    TALK_TO_EXPERTS_BUTTON = (By.CSS_SELECTOR, "a.wp-block-button__link[href*='contact']")
+
+    # Cookie consent buttons of the banner variants seen on the site, in order of preference:
+    # the "Accept" button first, then a generic "close" button
+    COOKIE_ACCEPT_BUTTONS = (
+        (By.ID, "hs-eu-confirmation-button"),  # Specific 'Accept' button from the HubSpot banner
+        (By.ID, "hs-eu-close-button"),  # Specific 'Dismiss' button from the HubSpot banner
+        (By.ID, "cn-accept-cookie"),  # Cookie Notice plugin
+        (By.CSS_SELECTOR, ".cli_action_button.wt-cli-accept-btn"),  # CookieLawInfo plugin
+        (By.CSS_SELECTOR, "a.cky-btn.cky-btn-accept"),  # CookieYes banners
+        (By.XPATH, "//button[contains(., 'Accept') or contains(., 'Got it')]"),  # Generic text-based fallback
+    )
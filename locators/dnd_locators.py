@@ -11,4 +11,7 @@ class DragAndDropLocators:
     HEADER_A = (By.XPATH, "//div[@id='column-a']/header")
 
     # The header element inside Column B (to verify text after drag)
-    HEADER_B = (By.XPATH, "//div[@id='column-b']/header")
\ No newline at end of file
+    HEADER_B = (By.XPATH, "//div[@id='column-b']/header")
+
+    # A column header by its text; fill in with .format() (used to check the column order after a drop)
+    HEADER_WITH_TEXT_TEMPLATE = (By.XPATH, "//div[@id='columns']/div/header[normalize-space(text())='{}']")
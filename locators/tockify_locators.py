@@ -15,6 +15,10 @@ class TockifyLocators:
     # The button/element to click to open the month/year date picker
     MONTH_YEAR_NAV = (By.CSS_SELECTOR, ".tic-nav-month-year")
 
+    # The arrows next to the month/year header that step the calendar one month at a time
+    NEXT_MONTH_BUTTON = (By.CSS_SELECTOR, ".tic-nav-arrow.tic-next")
+    PREV_MONTH_BUTTON = (By.CSS_SELECTOR, ".tic-nav-arrow.tic-prev")
+
     # The container for the date picker (month/year selection overlay)
     DATE_PICKER_CONTAINER = (By.CSS_SELECTOR, ".tic-month-picker.tic-show")
 
@@ -24,6 +28,9 @@ class TockifyLocators:
     # The arrow to navigate to the next year in the date picker
     NEXT_YEAR_ARROW = (By.CSS_SELECTOR, ".tic-year-arrow.tic-next")
 
+    # The arrow to navigate to the previous year in the date picker
+    PREV_YEAR_ARROW = (By.CSS_SELECTOR, ".tic-year-arrow.tic-prev")
+
     # A template for month buttons in the date picker (format with month number 1-12)
     # Example: "button.tic-month-btn[data-month='2']" for February
     MONTH_BUTTON_TEMPLATE = "button.tic-month-btn[data-month='{}']"
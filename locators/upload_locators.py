@@ -5,6 +5,10 @@ class UploadLocators:
     # This is directly visible in your HTML: <input id="file-upload" type="file" name="file">
     FILE_INPUT = (By.ID, "file-upload")
 
+    # The hidden file input Dropzone appends to the body for the drag and drop area.
+    # Files chosen through it are previewed in the area (files in FILE_INPUT are not).
+    DROPZONE_INPUT = (By.CSS_SELECTOR, "input.dz-hidden-input")
+
     # The upload button
     # This is directly visible in your HTML: <input class="button" id="file-submit" type="submit" value="Upload">
     UPLOAD_BUTTON = (By.ID, "file-submit")
@@ -20,5 +24,6 @@ class UploadLocators:
     UPLOADED_FILES_DISPLAY = (By.CSS_SELECTOR, ".dz-preview.dz-file-preview .dz-filename [data-dz-name]")
 
     # The success message header that appears after a successful upload (on a new page).
-    # This page usually shows an H2 with text "File Uploaded!".
-    SUCCESS_MESSAGE_HEADER = (By.TAG_NAME, "h2")
\ No newline at end of file
+    # This page shows an H3 with text "File Uploaded!" inside the #content div. Matched by text:
+    # the upload form's own "File Uploader" H3 is inside #content too.
+    SUCCESS_MESSAGE_HEADER = (By.XPATH, "//div[@id='content']//h3[normalize-space()='File Uploaded!']")
\ No newline at end of file
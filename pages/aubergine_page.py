@@ -3,77 +3,92 @@ from locators.aubergine_locators import AubergineLocators
 from config.config import Config
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException  # Ensure TimeoutException is imported
-import time
+from utils.checkpoints import checkpoint
+from utils.event_log import EventLog
 
 
 class AuberginePage(BasePage):
+    # Images stay: the scenario asserts that the first image is displayed.
+    # The HubSpot consent banner stays too, _dismiss_cookie_popup handles it.
+    BLOCKED_URL_PATTERNS = Config.THIRD_PARTY_URL_PATTERNS
+    BLOCKED_RESOURCE_TYPES = ("font", "media")
+    ALLOWED_URL_PATTERNS = ("*js.hs-banner.com*",)
+    # Browsers of tests marked @pytest.mark.browser_profile(page=AuberginePage) start with consent given
+    PROFILE_SNAPSHOT = "aubergine"
+    # Cookies the banner variants of COOKIE_ACCEPT_BUTTONS set once consent is given (or the banner dismissed)
+    CONSENT_COOKIES = ("__hs_cookie_cat_pref", "__hs_opt_out", "cookie_notice_accepted",
+                       "viewed_cookie_policy", "cookieyes-consent")
+    # Seconds to wait for any cookie banner variant to appear before assuming there is none
+    COOKIE_BANNER_TIMEOUT = 5
+
     def __init__(self, driver):
         super().__init__(driver)
         self.locators = AubergineLocators
 
+    def has_consent_cookie(self):
+        """True if a previous visit (e.g. the profile snapshot) already answered the cookie banner."""
+        return any(cookie["name"] in self.CONSENT_COOKIES for cookie in self.driver.get_cookies())
+
     def _dismiss_cookie_popup(self):
         """
-        Attempts to find and click the cookie accept button based on provided outerHTML.
-        This method is designed to be robust.
+        Clicks the accept button of whichever cookie banner variant appears first.
+        All known variants are polled together, so a page without a banner costs
+        COOKIE_BANNER_TIMEOUT seconds once, not once per variant. Browsers that already
+        carry a consent cookie (e.g. from a profile snapshot) skip the wait entirely.
         """
-        # Prioritize the "Accept" button first, then a generic "close" button
-        cookie_accept_locators = [
-            (By.ID, "hs-eu-confirmation-button"),  # Specific 'Accept' button from the provided HTML
-            (By.ID, "hs-eu-close-button"),  # Specific 'Dismiss' button from the provided HTML
-            (By.ID, "cn-accept-cookie"),  # Fallback from previous common locators
-            (By.CSS_SELECTOR, ".cli_action_button.wt-cli-accept-btn"),  # Fallback from previous common locators
-            (By.CSS_SELECTOR, "a.cky-btn.cky-btn-accept"),  # Fallback for Complianz type banners
-            (By.XPATH, "//button[contains(., 'Accept') or contains(., 'Got it')]"),  # Generic text-based fallback
-        ]
-
-        print("Attempting to dismiss cookie consent popup...")
-        for locator in cookie_accept_locators:
+        if self.has_consent_cookie():
+            EventLog.debug("cookie_banner", "Cookie consent already given; no popup expected.")
+            return False
+        EventLog.debug("cookie_banner", "Attempting to dismiss cookie consent popup...")
+        locator, accept_button = self.wait_for_any(self.locators.COOKIE_ACCEPT_BUTTONS, condition="clickable",
+                                                   timeout=self.COOKIE_BANNER_TIMEOUT)
+        if accept_button is None:
+            EventLog.info("cookie_banner", "No cookie consent popup found or could not be dismissed using known locators.")
+            return False  # Cookie not dismissed
+
+        try:
+            # Using JavaScript click can sometimes be more reliable
+            # if the element is covered by another transparent layer.
             try:
-                # Use a short explicit wait for the cookie button itself to appear and be clickable
-                accept_button = self.wait.until(EC.element_to_be_clickable(locator), timeout=5)
-
-                # If found, click it. Using JavaScript click can sometimes be more reliable
-                # if the element is covered by another transparent layer.
-                try:
-                    accept_button.click()
-                except Exception:
-                    self.execute_script("arguments[0].click();", accept_button)
-
-                print(f"Cookie consent popup dismissed using locator: {locator}")
-                time.sleep(1)  # Give a moment for the popup to disappear and page to settle
-                return True  # Cookie dismissed successfully
-            except TimeoutException:
-                pass  # This locator didn't work, try the next one
-            except Exception as e:
-                print(f"Error clicking cookie button with {locator}: {e}")
-                pass  # Continue to next locator if an unexpected error occurs during click
-
-        print("No cookie consent popup found or could not be dismissed using known locators.")
-        return False  # Cookie not dismissed
+                accept_button.click()
+            except Exception:
+                self.execute_script("arguments[0].click();", accept_button)
+
+            # Wait for the popup to actually disappear instead of sleeping
+            self.wait_until_ready(EC.invisibility_of_element(accept_button))
+        except Exception as e:
+            EventLog.warning("cookie_banner", "Error clicking cookie button with %s: %s", locator, e)
+            return False
+        EventLog.info("cookie_banner", "Cookie consent popup dismissed using locator: %s", locator)
+        return True  # Cookie dismissed successfully
+
+    @property
+    def url(self):
+        return Config.AUBERGINE_URL
+
+    def ready_conditions(self):
+        """
+        The homepage is usable once its title is set and the 'Expertise' menu item,
+        the first interaction point, is clickable (see BasePage.ready_conditions).
+        """
+        return (EC.title_contains("Aubergine Solutions"),
+                EC.element_to_be_clickable(self.locators.EXPERTISE_MENU_ITEM))
 
     def load(self):
         """Loads the Aubergine Solutions URL and dismisses cookie popup."""
-        self.go_to_url(Config.AUBERGINE_URL)
+        # go_to_url returns once the title is set and the Expertise menu is clickable
+        self.go_to_url(self.url)
 
         # --- IMPORTANT: Call the cookie dismissal method immediately after loading ---
         self._dismiss_cookie_popup()
 
-        # --- ROBUST PAGE LOAD WAIT for Aubergine Homepage ---
-        # 1. Wait for the page title to contain 'Aubergine Solutions'. This is usually very stable.
-        self.wait.until(EC.title_contains("Aubergine Solutions"),
-                        message=f"Page title does not contain 'Aubergine Solutions' on homepage. Actual: {self.driver.title}")
-        print("Aubergine Solutions homepage title verified.")
+        EventLog.info("page", "Aubergine Solutions homepage seems loaded and stable, Expertise menu is clickable.")
 
-        # 2. Wait for the 'Expertise' menu item to be clickable, as it's the first interaction point.
-        # This confirms the main navigation is ready.
-        self.wait.until(EC.element_to_be_clickable(self.locators.EXPERTISE_MENU_ITEM),
-                        message="Expertise menu item not clickable after homepage load. Locator: " + str(
-                            self.locators.EXPERTISE_MENU_ITEM))
-
-        print("Aubergine Solutions homepage seems loaded and stable, Expertise menu is clickable.")
+    def prepare_profile(self):
+        """Profile snapshot: homepage assets cached and the cookie banner answered."""
+        self.load()
 
+    @checkpoint
     def navigate_to_python_expertise(self):
         """
         Navigates to the Python Expertise page by hovering over 'Expertise'
@@ -83,7 +98,7 @@ class AuberginePage(BasePage):
 
         expertise_menu = self.find_element(self.locators.EXPERTISE_MENU_ITEM)  # Should be quick as waited for in load()
         ActionChains(self.driver).move_to_element(expertise_menu).perform()
-        print("Hovered over 'Expertise' menu.")
+        EventLog.debug("action", "Hovered over 'Expertise' menu.")
 
         # Ensure the submenu is visible AND clickable BEFORE clicking
         self.wait.until(EC.visibility_of_element_located(self.locators.PYTHON_SUBMENU_ITEM),
@@ -93,7 +108,7 @@ class AuberginePage(BasePage):
                         message="Python submenu is visible but not clickable.")
 
         self.click_element(self.locators.PYTHON_SUBMENU_ITEM)
-        print("Clicked on 'Python' submenu.")
+        EventLog.debug("action", "Clicked on 'Python' submenu.")
 
         # Wait for URL and title to reflect navigation
         self.wait.until(EC.url_contains("/python-development-company"),
@@ -107,7 +122,21 @@ class AuberginePage(BasePage):
     def is_carousel_displayed(self):
         return self.is_element_displayed(self.locators.CAROUSEL_CONTAINER)
 
+    def get_python_page_snapshot(self):
+        """
+        Reads the first image, the carousel and the 'Talk to our python experts' link in one round trip.
+        Returns the BasePage.read_elements() snapshot keyed by "first_image", "carousel" and "talk_to_experts";
+        the link entry includes its resolved "href" attribute. Only the image and the carousel have to be
+        displayed; the link only has to be present, since only its href is used.
+        """
+        return self.read_elements({
+            "first_image": self.locators.FIRST_IMAGE_ON_PAGE,
+            "carousel": self.locators.CAROUSEL_CONTAINER,
+            "talk_to_experts": self.locators.TALK_TO_EXPERTS_BUTTON,
+        }, attributes=("href",), wait_for={"first_image": "displayed", "carousel": "displayed",
+                                           "talk_to_experts": "present"})
+
     def open_talk_to_experts_link_in_new_tab(self):
         button = self.find_element(self.locators.TALK_TO_EXPERTS_BUTTON)
         self.execute_script("window.open(arguments[0].href, '_blank');", button)
-        print("Opened 'Talk to our python experts now' button link in a new tab via JS.")
\ No newline at end of file
+        EventLog.info("window", "Opened 'Talk to our python experts now' button link in a new tab via JS.")
\ No newline at end of file
@@ -1,18 +1,154 @@
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                                        InvalidSelectorException, JavascriptException)
 from config.config import Config # Import Config for default wait time
+from utils.browser_scripts import (HTML5_DRAG_AND_DROP_JS, OBSERVE_CONDITION_JS, READ_ELEMENTS_JS, WAIT_FOR_ANY_JS,
+                                   locator_specs)
+import time
+from utils.driver_manager import DriverManager
+from utils.element_cache import ElementCache
+from utils.observer_wait import create_wait
+from utils.event_log import EventLog
+from utils import readiness
+from utils.readiness import install_readiness_probes
+from utils.resource_blocking import ResourceBlocker
+from utils.step_tracer import TracedWait, traced
+from utils.window_registry import WindowRegistry
 
 class BasePage:
+    # Requests this page object never needs, blocked in the browser before navigation
+    # (see apply_resource_blocking). URL patterns use '*' wildcards; resource types are
+    # 'image', 'font', 'media' or 'stylesheet'. ALLOWED_URL_PATTERNS re-enables entries
+    # of a shared list such as Config.THIRD_PARTY_URL_PATTERNS.
+    BLOCKED_URL_PATTERNS = ()
+    BLOCKED_RESOURCE_TYPES = ()
+    ALLOWED_URL_PATTERNS = ()
+    # Name of this site's profile snapshot (see prepare_profile and utils/profile_snapshots.py)
+    PROFILE_SNAPSHOT = None
+
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.DEFAULT_WAIT_TIME)
+        # A WebDriverWait that records every explicit wait in the step trace; with Config.WAIT_BACKEND
+        # "observer" the common expected conditions are evaluated by an in-page MutationObserver
+        self.wait = create_wait(driver, Config.DEFAULT_WAIT_TIME)
+        install_readiness_probes(driver)
+        # Windows/tabs of this driver, shared with every other page object using it
+        self.windows = WindowRegistry.for_driver(driver)
+        # Locators of the frames we are currently inside, outermost first (empty = top-level document)
+        self.frame_path = []
+        # Opt-in cache of resolved elements (see enable_element_cache)
+        self.element_cache = ElementCache() if Config.ELEMENT_CACHE_ENABLED else None
+
+    def enable_element_cache(self):
+        """
+        Turns on the element cache for this page object: repeated reads of the same locator
+        reuse the already-resolved element instead of a new wait + find round trip.
+        """
+        if self.element_cache is None:
+            self.element_cache = ElementCache()
 
+    def _invalidate_element_cache(self, locator=None):
+        """Drops one cached element, or every cached element when no locator is given."""
+        if self.element_cache is not None:
+            self.element_cache.invalidate(None if locator is None else (tuple(self.frame_path), locator))
+
+    def _with_element(self, locator, action):
+        """
+        Runs action(element) on the element for locator, reusing the cached element when the cache
+        is enabled. A stale cached element is dropped and the locator resolved again once.
+        """
+        if self.element_cache is None:
+            return action(self.find_element(locator))
+
+        key = (tuple(self.frame_path), locator)
+        element = self.element_cache.get(key)
+        if element is not None:
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                self.element_cache.invalidate(key)
+        return action(self.find_element(locator))
+
+    def apply_resource_blocking(self):
+        """
+        Sends this page object's block list to the browser (an empty list when blocking is off
+        or the page declares none, which also clears the list a previous page left behind).
+        """
+        patterns = []
+        if Config.RESOURCE_BLOCKING_ENABLED:
+            patterns = ResourceBlocker.patterns_for(self.BLOCKED_URL_PATTERNS, self.BLOCKED_RESOURCE_TYPES,
+                                                    self.ALLOWED_URL_PATTERNS)
+        ResourceBlocker.apply(self.driver, patterns, type(self).__name__)
+
+    def apply_http_cache_setting(self):
+        """
+        Turns the HTTP cache off in this tab while the record-and-replay proxy runs, so every response
+        goes through the proxy (and into the recording) however warm the pooled browser's cache is.
+        """
+        if Config.BROWSER_PROXY:
+            DriverManager.disable_http_cache(self.driver)
+
+    @property
+    def url(self):
+        """The URL load() opens. Page objects with a fixed entry URL override this."""
+        return None
+
+    def ready_conditions(self):
+        """
+        Readiness predicates that mean "this page is usable", checked by go_to_url after navigation.
+        Page objects override this with the element(s) their first interaction needs, so that with
+        Config.PAGE_LOAD_STRATEGY "eager" or "none" navigation returns at time-to-interactive
+        instead of waiting for every image, font and script.
+        """
+        return (readiness.document_interactive(),)
+
+    def prepare_profile(self):
+        """
+        Visits the site with a browser whose profile becomes the PROFILE_SNAPSHOT template:
+        whatever this leaves in cookies, storage and the HTTP cache, later browsers start with.
+        Page objects override this to also give consent or walk through first-visit screens.
+        """
+        self.go_to_url(self.url)
+
+    @traced("navigation")
     def go_to_url(self, url):
-        """Navigates the browser to the specified URL."""
+        """Navigates the browser to the specified URL and waits until the page is usable (see ready_conditions)."""
+        self.apply_resource_blocking()
+        self.apply_http_cache_setting()
         self.driver.get(url)
-        print(f"Navigated to URL: {url}")
+        # A new document means a new top-level frame and no valid cached elements
+        self.frame_path = []
+        self._invalidate_element_cache()
+        self.wait_until_ready(*self.ready_conditions())
+        EventLog.info("navigation", "Navigated to URL: %s", url)
+
+    @traced("navigation")
+    def start_navigation(self, url=None):
+        """
+        Starts navigating the current tab to url (default: self.url) and returns immediately,
+        whatever Config.PAGE_LOAD_STRATEGY is. Returns this page's ready conditions, to be
+        checked later with is_ready() (e.g. by utils.tab_orchestrator while other tabs load).
+        """
+        url = url or self.url
+        self.apply_resource_blocking()
+        self.apply_http_cache_setting()
+        self.driver.execute_script("window.location.assign(arguments[0]);", url)
+        self.frame_path = []
+        self._invalidate_element_cache()
+        EventLog.info("navigation", "Started navigation to URL: %s", url)
+        return self.ready_conditions()
 
+    def is_ready(self, conditions=None):
+        """Checks the ready conditions once, without waiting. Returns True only if all of them hold."""
+        for condition in conditions or self.ready_conditions():
+            try:
+                if not condition(self.driver):
+                    return False
+            except (NoSuchElementException, StaleElementReferenceException, JavascriptException):
+                return False  # The new document is not there yet
+        return True
+
+    @traced("read")
     def find_element(self, locator):
         """
         Waits for and finds a single element using its locator.
@@ -20,11 +156,15 @@ class BasePage:
         """
         try:
             # EC.presence_of_element_located ensures the element is in the DOM
-            return self.wait.until(EC.presence_of_element_located(locator),
-                                  message=f"Element not found using {locator} within {Config.DEFAULT_WAIT_TIME} seconds.")
+            element = self.wait.until(EC.presence_of_element_located(locator),
+                                      message=f"Element not found using {locator} within {Config.DEFAULT_WAIT_TIME} seconds.")
         except TimeoutException:
             raise NoSuchElementException(f"Element not found after {Config.DEFAULT_WAIT_TIME} seconds: {locator}")
+        if self.element_cache is not None:
+            self.element_cache.put((tuple(self.frame_path), locator), element)
+        return element
 
+    @traced("action")
     def click_element(self, locator):
         """
         Waits for an element to be clickable and then clicks it.
@@ -32,66 +172,228 @@ class BasePage:
         element = self.wait.until(EC.element_to_be_clickable(locator),
                                   message=f"Element not clickable using {locator} within {Config.DEFAULT_WAIT_TIME} seconds.")
         element.click()
-        print(f"Clicked element: {locator}")
+        EventLog.debug("click", "Clicked element: %s", locator)
 
+    @traced("action")
     def type_into_element(self, locator, text):
         """
         Finds an element, clears its content, and then sends text to it.
         """
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
-        print(f"Typed '{text}' into element: {locator}")
+        def clear_and_type(element):
+            element.clear()
+            element.send_keys(text)
+
+        self._with_element(locator, clear_and_type)
+        EventLog.debug("type", "Typed '%s' into element: %s", text, locator)
 
+    @traced("read")
     def get_element_text(self, locator):
         """
         Finds an element and returns its visible text, stripped of leading/trailing whitespace.
         """
-        element = self.find_element(locator)
-        return element.text.strip()
+        return self._with_element(locator, lambda element: element.text.strip())
 
+    @traced("read")
     def is_element_displayed(self, locator):
         """
         Checks if an element is present in the DOM and visible on the page.
         Returns True if displayed, False otherwise.
         """
+        if self.element_cache is not None:
+            key = (tuple(self.frame_path), locator)
+            cached_element = self.element_cache.get(key)
+            if cached_element is not None:
+                try:
+                    if cached_element.is_displayed():
+                        return True
+                except StaleElementReferenceException:
+                    self.element_cache.invalidate(key)
         try:
             # EC.visibility_of_element_located ensures it's in DOM and visible
             element = self.wait.until(EC.visibility_of_element_located(locator),
                                      message=f"Element {locator} is not visible.")
-            return element.is_displayed()
         except (TimeoutException, NoSuchElementException):
             return False # Element not found or not visible
+        if self.element_cache is not None:
+            self.element_cache.put((tuple(self.frame_path), locator), element)
+        return True
 
+    @traced("script")
     def execute_script(self, script, *args):
         """
         Executes JavaScript in the browser.
         """
         return self.driver.execute_script(script, *args)
 
-    def switch_to_new_tab(self):
+    @traced("read")
+    def read_elements(self, named_locators, attributes=(), wait_for="present", timeout=None):
         """
-        Waits for a new tab to open and switches WebDriver focus to it.
-        Assumes there will be exactly two windows after the new tab opens.
+        Reads several elements in one execute_script call.
+        named_locators is a dict like {"header_a": (By.XPATH, "..."), ...}; the result maps each name to
+        {"present", "displayed", "text", "attributes", "rect"} (only "present"/"displayed" for missing elements).
+        wait_for ('present', 'displayed' or None) is a single shared wait for all elements, or a dict
+        {name: 'present'/'displayed'/None} when elements need different conditions; each poll is one
+        round trip. If the wait times out, the last snapshot is returned so callers can assert on it.
         """
-        self.wait.until(EC.number_of_windows_to_be(2))
-        # Find the handle of the new tab (which is not the current one)
-        new_tab_handle = [handle for handle in self.driver.window_handles if handle != self.driver.current_window_handle][0]
-        self.driver.switch_to.window(new_tab_handle)
-        print("Switched to new tab.")
+        specs = locator_specs(named_locators)
+        attributes = list(attributes)
+        conditions = wait_for if isinstance(wait_for, dict) else {name: wait_for for name in named_locators}
+        snapshot = {}
+
+        def all_ready(driver):
+            snapshot.update(driver.execute_script(READ_ELEMENTS_JS, specs, attributes))
+            return all(snapshot[name][condition] for name, condition in conditions.items() if condition)
+
+        wait = TracedWait(self.driver, timeout or Config.DEFAULT_WAIT_TIME,
+                          poll_frequency=Config.READINESS_POLL_INTERVAL)
+        try:
+            wait.until(all_ready)
+        except TimeoutException:
+            missing = [f"{name} ({condition})" for name, condition in conditions.items()
+                       if condition and not snapshot.get(name, {}).get(condition)]
+            EventLog.warning("wait", "Elements not ready within timeout: %s", ", ".join(missing))
+        return snapshot
+
+    @traced("action")
+    def drag_and_drop(self, source, target=None, offset=None, expected_order=None):
+        """
+        Drags source onto target by firing the HTML5 drag events inside the browser, in one execute_script
+        call (ActionChains pointer moves do not reliably trigger dragstart/drop in Chrome).
+        offset (x, y) in pixels moves the drop point from the target's centre, or from the source's centre
+        when there is no target; the element under that point receives the drop.
+        expected_order is an optional list of locators that must match elements in this document order
+        after the drop, checked in the same call.
+        Returns {"dropped", "target", "order_ok"}; order_ok is None when no expected_order was given.
+        """
+        if target is None and offset is None:
+            raise ValueError("drag_and_drop needs a target locator, an offset, or both.")
+        source_spec, target_spec = locator_specs({"source": source, "target": target or source})
+        order_specs = locator_specs({str(index): locator for index, locator in enumerate(expected_order)}) \
+            if expected_order else None
+        result = self.driver.execute_script(HTML5_DRAG_AND_DROP_JS, source_spec, target_spec if target else None,
+                                            list(offset) if offset else None, order_specs)
+        if "error" in result:
+            raise NoSuchElementException(result["error"])
+        # Drop handlers usually re-render the elements involved
+        self._invalidate_element_cache()
+        EventLog.debug("action", "Dragged %s to %s (offset %s): dropped=%s on '%s', order_ok=%s",
+                       source, target, offset, result["dropped"], result["target"], result["order_ok"])
+        return result
+
+    @traced("window")
+    def switch_to_new_tab(self, name=None):
+        """
+        Waits for a tab this driver has not seen before to open, registers it
+        (optionally under name, see switch_to_tab) and switches WebDriver focus to it.
+        Works with any number of windows already open.
+        """
+        new_tab_handle = self.wait.until(self.windows.new_window_opened(), message="No new tab was opened.")
+        self.windows.register(new_tab_handle, name)
+        self.windows.switch_to(new_tab_handle)
+        self.frame_path = []
+        self._invalidate_element_cache()
+        EventLog.debug("window", "Switched to new tab.")
+        return new_tab_handle
+
+    @traced("window")
+    def switch_to_tab(self, name):
+        """Switches WebDriver focus to a tab registered under name."""
+        self.windows.switch_to(self.windows.handle(name))
+        self.frame_path = []
+        self._invalidate_element_cache()
+        EventLog.debug("window", "Switched to tab: %s", name)
 
+    @traced("window")
     def switch_to_main_tab(self):
         """
-        Switches WebDriver focus back to the first (main) browser tab/window.
+        Switches WebDriver focus back to the main browser tab/window
+        (the one that was active when the first page object was created for this driver).
         """
-        main_tab_handle = self.driver.window_handles[0]
-        self.driver.switch_to.window(main_tab_handle)
-        print("Switched back to main tab.")
+        self.windows.switch_to(self.windows.main_handle)
+        self.frame_path = []
+        self._invalidate_element_cache()
+        EventLog.debug("window", "Switched back to main tab.")
 
+    @traced("window")
+    def switch_to_frame(self, locator):
+        """
+        Waits for an iframe to be available and switches WebDriver focus into it.
+        """
+        self.wait.until(EC.frame_to_be_available_and_switch_to_it(locator),
+                        message=f"Frame {locator} not available or could not be switched to.")
+        self.frame_path.append(locator)
+        self._invalidate_element_cache()
+        EventLog.debug("frame", "Switched to frame: %s", locator)
+
+    @traced("window")
+    def switch_to_default_content(self):
+        """
+        Switches WebDriver focus back to the top-level document.
+        """
+        self.driver.switch_to.default_content()
+        self.frame_path = []
+        self._invalidate_element_cache()
+        EventLog.debug("frame", "Switched to default content.")
+
+    @traced("wait")
     def wait_for_invisibility(self, locator):
         """
         Waits for an element to become invisible or not present in the DOM.
         Useful for waiting for loading spinners to disappear.
         """
         self.wait.until(EC.invisibility_of_element_located(locator))
-        print(f"Waited for element {locator} to become invisible.")
\ No newline at end of file
+        EventLog.debug("wait", "Waited for element %s to become invisible.", locator)
+
+    @traced("wait")
+    def wait_for_any(self, locators, condition="clickable", timeout=None):
+        """
+        Waits for whichever of several locators matches first, polling all of them together
+        inside the browser (one async script instead of one wait per locator). The script polls every
+        50 ms, or re-checks on DOM mutations with Config.WAIT_BACKEND "observer".
+        condition is 'present', 'displayed' or 'clickable'. Earlier locators win when several match.
+        Returns (locator, element) for the match, or (None, None) once the timeout expires.
+        """
+        timeout = Config.DEFAULT_WAIT_TIME if timeout is None else timeout
+        # The in-browser loop must finish before the driver's script timeout aborts it
+        timeout = min(timeout, Config.SCRIPT_TIMEOUT - 1)
+        named_locators = {str(index): locator for index, locator in enumerate(locators)}
+        specs = locator_specs(named_locators)
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+            try:
+                # No WebDriver round trip per check either way
+                if Config.WAIT_BACKEND == "observer":
+                    result = self.driver.execute_async_script(OBSERVE_CONDITION_JS, specs, condition, None,
+                                                              remaining_ms, Config.OBSERVER_FALLBACK_POLL_MS)
+                else:
+                    result = self.driver.execute_async_script(WAIT_FOR_ANY_JS, specs, condition, remaining_ms, 50)
+                break
+            except JavascriptException:
+                # The document was replaced mid-poll (navigation); keep polling on the new one
+                if time.monotonic() >= deadline:
+                    result = None
+                    break
+        if result is None:
+            EventLog.debug("wait", "None of %d locators became %s within %s seconds.", len(named_locators), condition, timeout)
+            return None, None
+        if "error" in result:
+            raise InvalidSelectorException(f"Invalid locator {named_locators[result['name']]}: {result['error']}")
+        locator = named_locators[result["name"]]
+        EventLog.debug("wait", "First %s match: %s", condition, locator)
+        return locator, result["element"]
+
+    @traced("wait")
+    def wait_until_ready(self, *conditions, timeout=None):
+        """
+        Waits until every readiness condition holds, checking every Config.READINESS_POLL_INTERVAL seconds.
+        Conditions are utils.readiness predicates (dom_stable, network_idle, element_settled, ...)
+        or any selenium expected condition. Returns the value of the last condition.
+        """
+        # Expected conditions among them are observed in-page with Config.WAIT_BACKEND "observer"
+        wait = create_wait(self.driver, timeout or Config.DEFAULT_WAIT_TIME,
+                           poll_frequency=Config.READINESS_POLL_INTERVAL)
+        result = None
+        for condition in conditions:
+            result = wait.until(condition, message=f"Page not ready: {getattr(condition, '__qualname__', condition)}")
+        return result
@@ -1,27 +1,45 @@
 from pages.base_page import BasePage
 from locators.dnd_locators import DragAndDropLocators
 from config.config import Config # Import correct for nested config
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support import expected_conditions as EC
+from utils import readiness
+from utils.event_log import EventLog
 
 class DragAndDropPage(BasePage):
     def __init__(self, driver):
         super().__init__(driver)
         self.locators = DragAndDropLocators
+        # The column headers are read repeatedly before and after the drag
+        self.enable_element_cache()
+
+    @property
+    def url(self):
+        return Config.DRAG_AND_DROP_URL
+
+    def ready_conditions(self):
+        """
+        The page is usable once the document is parsed (the drag handlers are attached by an
+        inline script at the end of the body) and column A is visible.
+        """
+        return (readiness.document_interactive(), EC.visibility_of_element_located(self.locators.COLUMN_A))
 
     def load(self):
         """Loads the drag and drop URL."""
-        self.go_to_url(Config.DRAG_AND_DROP_URL)
+        self.go_to_url(self.url)
 
     def drag_a_to_b(self):
         """
-        Performs a drag and drop action from Column A to Column B.
+        Performs a drag and drop action from Column A to Column B, and checks in the same
+        round trip that the headers swapped (header 'B' now comes before header 'A').
         """
-        column_a = self.find_element(self.locators.COLUMN_A)
-        column_b = self.find_element(self.locators.COLUMN_B)
-        actions = ActionChains(self.driver)
-        # The drag_and_drop method directly drags one element to another
-        actions.drag_and_drop(column_a, column_b).perform()
-        print("Performed drag and drop of 'A' to 'B'.")
+        by, template = self.locators.HEADER_WITH_TEXT_TEMPLATE
+        swapped_order = [(by, template.format(text)) for text in ("B", "A")]
+        result = self.drag_and_drop(self.locators.COLUMN_A, self.locators.COLUMN_B, expected_order=swapped_order)
+        if result["dropped"] and result["order_ok"]:
+            EventLog.info("drag_and_drop", "Performed drag and drop of 'A' to 'B'.")
+        else:
+            EventLog.warning("drag_and_drop", "Drag and drop of 'A' to 'B' did not swap the columns: %s", result)
+        return result
 
     def get_column_a_header_text(self):
         """Gets the text from Column A's header."""
@@ -29,4 +47,13 @@ class DragAndDropPage(BasePage):
 
     def get_column_b_header_text(self):
         """Gets the text from Column B's header."""
-        return self.get_element_text(self.locators.HEADER_B)
\ No newline at end of file
+        return self.get_element_text(self.locators.HEADER_B)
+
+    def get_headers_snapshot(self):
+        """
+        Reads both column headers in one round trip.
+        Returns a dict like {"column_a": "A", "column_b": "B"}.
+        """
+        snapshot = self.read_elements({"column_a": self.locators.HEADER_A, "column_b": self.locators.HEADER_B},
+                                      wait_for="displayed")
+        return {name: entry.get("text") for name, entry in snapshot.items()}
\ No newline at end of file
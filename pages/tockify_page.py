@@ -3,42 +3,62 @@ from locators.tockify_locators import TockifyLocators
 from config.config import Config
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-import time
+from selenium.common.exceptions import NoSuchElementException
+from datetime import datetime
+from utils import readiness
+from utils.checkpoints import checkpoint
+from utils.event_log import EventLog
 
 
 class TockifyPage(BasePage):
+    # The scenario only reads calendar text and buttons, so no images, fonts or video are needed
+    BLOCKED_URL_PATTERNS = Config.THIRD_PARTY_URL_PATTERNS
+    BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+    # Rough cost, in WebDriver round trips, of jumping through the month/year picker:
+    # open picker, jump years (one script call), confirm year, click month.
+    # Month-by-month stepping is only used when it is cheaper than this.
+    PICKER_NAVIGATION_COST = 4
+
     def __init__(self, driver):
         super().__init__(driver)
         self.locators = TockifyLocators
+        # Calendar header/picker elements are read repeatedly while navigating months
+        self.enable_element_cache()
+
+    @property
+    def url(self):
+        return Config.TOCKIFY_URL
+
+    def ready_conditions(self):
+        """
+        The page is usable once its title is set and the calendar iframe is in the DOM;
+        the calendar inside the iframe is waited for by switch_to_calendar_iframe().
+        """
+        return (EC.title_contains("Tockify"), EC.presence_of_element_located(self.locators.CALENDAR_IFRAME))
 
     def load(self):
-        """Loads the Tockify URL."""
-        self.go_to_url(Config.TOCKIFY_URL)
-        # Wait for the main page title to be present
-        self.wait.until(EC.title_contains("Tockify"),
-                        message=f"Page title does not contain 'Tockify' on main page. Actual: {self.driver.title}")
-        print("Tockify main page seems loaded and title verified.")
+        """Loads the Tockify URL; go_to_url returns once the title is set and the calendar iframe exists."""
+        self.go_to_url(self.url)
+        EventLog.info("page", "Tockify main page seems loaded and title verified.")
 
     def switch_to_calendar_iframe(self):
         """Switches to the Tockify calendar iframe."""
         # Wait for the iframe to be present and switch to it
-        self.wait.until(EC.frame_to_be_available_and_switch_to_it(self.locators.CALENDAR_IFRAME),
-                        message="Tockify calendar iframe not available or could not be switched to.")
-        print("Switched to Tockify calendar iframe.")
+        self.switch_to_frame(self.locators.CALENDAR_IFRAME)
 
         # Wait for the loading spinner inside the iframe to become invisible
         try:
-            self.wait.until(EC.invisibility_of_element_located(self.locators.IFRAME_LOADING_SPINNER),
+            self.wait.until(EC.invisibility_of_element_located(self.locators.LOADING_SPINNER),
                             message="Tockify iframe loading spinner did not become invisible.")
-            print("Waited for element ('css selector', '.spinner.spinner__double-circles') to become invisible.")
+            EventLog.debug("wait", "Tockify iframe loading spinner became invisible.")
         except Exception as e:
             # This catch is for cases where the spinner might not always appear or disappear quickly
-            print(f"Warning: Spinner invisibility check failed or timed out: {e}. Proceeding anyway.")
+            EventLog.warning("wait", "Spinner invisibility check failed or timed out: %s. Proceeding anyway.", e)
 
-        # --- CRITICAL CHANGE: INCREASED SLEEP AFTER SPINNER DISAPPEARS ---
-        # Give more time for the calendar UI to fully render after the spinner is gone.
-        time.sleep(10)  # Increased from 1 second to 2 seconds for added stability.
+        # Wait for the calendar UI inside the iframe to finish rendering and fetching its events
+        self.wait_until_ready(readiness.page_settled())
 
+    @checkpoint
     def load_and_switch_to_calendar_iframe(self):
         """Loads the main Tockify page and then switches to the calendar iframe."""
         self.load()
@@ -47,59 +67,110 @@ class TockifyPage(BasePage):
         # After switching and waiting for spinner, ensure a core calendar element is visible.
         self.wait.until(EC.visibility_of_element_located(self.locators.MONTH_YEAR_NAV),
                         message='Calendar navigation inside iframe not visible after loading.')
-        print("Calendar navigation element inside iframe is visible.")
+        EventLog.info("page", "Calendar navigation element inside iframe is visible.")
+
+    def _read_displayed_month(self):
+        """
+        Reads the month/year shown in the calendar header (e.g. 'February 2040')
+        and returns it as a datetime for the first day of that month.
+        """
+        def displayed_month(driver):
+            try:
+                text = driver.find_element(*self.locators.MONTH_YEAR_NAV).text.strip()
+                return datetime.strptime(text, "%B %Y")
+            except ValueError:
+                return False  # Header is still rendering, poll again
+
+        return self.wait.until(displayed_month,
+                               message="Could not get current month/year text from calendar navigation.")
 
+    @staticmethod
+    def _months_between(current, target):
+        """Number of months from current to target (negative if target is in the past)."""
+        return (target.year - current.year) * 12 + (target.month - current.month)
+
+    def _plan_month_navigation(self, current, target):
+        """
+        Picks the cheapest way to reach the target month.
+        Returns 'none', 'step' (month arrows) or 'picker' (month/year picker).
+        """
+        distance = abs(self._months_between(current, target))
+        if distance == 0:
+            return "none"
+        if distance <= self.PICKER_NAVIGATION_COST:
+            return "step"
+        return "picker"
+
+    def _step_months(self, current, target):
+        """Clicks the next/previous month arrow until the target month is displayed."""
+        delta = self._months_between(current, target)
+        button = self.locators.NEXT_MONTH_BUTTON if delta > 0 else self.locators.PREV_MONTH_BUTTON
+        step = 1 if delta > 0 else -1
+        for _ in range(abs(delta)):
+            month_index = current.year * 12 + current.month - 1 + step
+            current = current.replace(year=month_index // 12, month=month_index % 12 + 1)
+            self.click_element(button)
+            # Wait for the header to show the expected month instead of sleeping
+            self.wait.until(EC.text_to_be_present_in_element(self.locators.MONTH_YEAR_NAV, current.strftime("%B %Y")),
+                            message=f"Calendar did not move to {current.strftime('%B %Y')}.")
+            EventLog.debug("calendar", "Navigated to: %s", current.strftime("%B %Y"))
+
+    def _jump_with_picker(self, target):
+        """Opens the month/year picker, jumps to the target year and clicks the target month."""
+        self.click_element(self.locators.MONTH_YEAR_NAV)
+        self.wait.until(EC.visibility_of_element_located(self.locators.DATE_PICKER_CONTAINER),
+                        message="Month/year picker did not open.")
+
+        year_delta = target.year - int(self.get_element_text(self.locators.YEAR_DISPLAY))
+        if year_delta:
+            arrow = self.locators.NEXT_YEAR_ARROW if year_delta > 0 else self.locators.PREV_YEAR_ARROW
+            # Click the year arrow |year_delta| times inside a single script call
+            # instead of paying one WebDriver round trip per year.
+            error = self.execute_script(
+                "var arrow = document.querySelector(arguments[0]);"
+                "if (!arrow) { return 'Year arrow ' + arguments[0] + ' not found in the month/year picker.'; }"
+                "for (var i = 0; i < arguments[1]; i++) { arrow.click(); }"
+                "return null;",
+                arrow[1], abs(year_delta))
+            if error:
+                raise NoSuchElementException(error)
+            self.wait.until(EC.text_to_be_present_in_element(self.locators.YEAR_DISPLAY, str(target.year)),
+                            message=f"Month/year picker did not reach year {target.year}.")
+
+        month_button = (By.CSS_SELECTOR, self.locators.MONTH_BUTTON_TEMPLATE.format(target.month))
+        self.click_element(month_button)
+        self.wait.until(EC.text_to_be_present_in_element(self.locators.MONTH_YEAR_NAV, target.strftime("%B %Y")),
+                        message=f"Calendar did not jump to {target.strftime('%B %Y')}.")
+        EventLog.debug("calendar", "Jumped to: %s", target.strftime("%B %Y"))
+
+    @checkpoint
     def select_date(self, target_date_str):
         """
         Selects a date on the calendar.
         target_date_str example: "28 Feb 2040"
+        Far-away months are reached through the month/year picker, nearby ones with the month arrows.
         """
-        # Parse the target date
-        from datetime import datetime
         target_date = datetime.strptime(target_date_str, "%d %b %Y")
 
-        # Navigate to the correct month and year first
-        # It's better to get the text, parse it, and then check against target_date.
-        # Adding a loop to robustly read the month/year
-        max_attempts = 10  # Prevent infinite loops for far-off dates
-        attempts = 0
-        while attempts < max_attempts:
-            try:
-                current_month_year_text = self.wait.until(
-                    EC.visibility_of_element_located(self.locators.MONTH_YEAR_NAV)
-                ).text.strip()
-                current_month_year = datetime.strptime(current_month_year_text, "%B %Y")
-                break
-            except Exception as e:
-                time.sleep(0.5)  # Wait a bit if element not visible immediately
-                attempts += 1
-        if attempts == max_attempts:
-            raise TimeoutError("Could not get current month/year text from calendar navigation.")
-
-        # Navigate to future/past months if needed
-        while current_month_year.year < target_date.year or \
-                (current_month_year.year == target_date.year and current_month_year.month < target_date.month):
-            self.click_element(self.locators.NEXT_MONTH_BUTTON)
-            time.sleep(0.5)  # Give UI time to update
-            current_month_year_text = self.get_element_text(self.locators.MONTH_YEAR_NAV)
-            current_month_year = datetime.strptime(current_month_year_text, "%B %Y")
-            print(f"Navigated to: {current_month_year_text}")
-
-        while current_month_year.year > target_date.year or \
-                (current_month_year.year == target_date.year and current_month_year.month > target_date.month):
-            self.click_element(self.locators.PREV_MONTH_BUTTON)
-            time.sleep(0.5)  # Give UI time to update
-            current_month_year_text = self.get_element_text(self.locators.MONTH_YEAR_NAV)
-            current_month_year = datetime.strptime(current_month_year_text, "%B %Y")
-            print(f"Navigated to: {current_month_year_text}")
+        current_month_year = self._read_displayed_month()
+        plan = self._plan_month_navigation(current_month_year, target_date)
+        if plan == "step":
+            self._step_months(current_month_year, target_date)
+        elif plan == "picker":
+            self._jump_with_picker(target_date)
 
         # Click the day
-        day_locator = (By.XPATH, self.locators.DAY_IN_CALENDAR_XPATH_TEMPLATE.format(day=target_date.day))
+        day_locator = (By.XPATH, self.locators.DAY_BUTTON_TEMPLATE[1].format(target_date.day))
         self.wait.until(EC.element_to_be_clickable(day_locator),
                         message=f"Date '{target_date.day}' not clickable.")
         self.click_element(day_locator)
-        print(f"Selected date: {target_date_str}")
-        time.sleep(1)  # Small pause after clicking a date for event details to load.
+        EventLog.info("calendar", "Selected date: %s", target_date_str)
+        # Wait for the event details for the selected date to load
+        self.wait_until_ready(readiness.page_settled())
+
+    def select_date_from_calendar(self, day, month, year):
+        """Selects a date given as numbers, e.g. select_date_from_calendar(28, 2, 2040)."""
+        self.select_date(datetime(year, month, day).strftime("%d %b %Y"))
 
     def get_selected_date_display(self):
         """
@@ -107,10 +178,10 @@ class TockifyPage(BasePage):
         This is usually in the event details view.
         """
         # Wait for the event details to appear after selecting a date.
-        self.wait.until(EC.visibility_of_element_located(self.locators.EVENT_DATE_DISPLAY),
+        self.wait.until(EC.visibility_of_element_located(self.locators.DATE_DISPLAY),
                         message="Event date display element not visible after selecting date.")
 
-        return self.get_element_text(self.locators.EVENT_DATE_DISPLAY)
+        return self.get_element_text(self.locators.DATE_DISPLAY)
 
     def click_monthly_tab(self):
         """Clicks the 'Monthly' tab."""
@@ -118,7 +189,7 @@ class TockifyPage(BasePage):
         # Wait for the monthly view to load, e.g., by waiting for the calendar grid to be visible again
         self.wait.until(EC.visibility_of_element_located(self.locators.CALENDAR_GRID),
                         message="Calendar grid not visible after switching to Monthly tab.")
-        print("Clicked 'Monthly' tab and calendar grid is visible.")
+        EventLog.info("calendar", "Clicked 'Monthly' tab and calendar grid is visible.")
 
     def is_calendar_grid_displayed(self):
         """Checks if the main calendar grid is displayed."""
@@ -129,7 +200,7 @@ class TockifyPage(BasePage):
         return self.driver.title
 
     def get_calendar_title(self):
-        """Gets the title displayed on the calendar itself (e.g., "Demo Calendar")."""
-        self.wait.until(EC.visibility_of_element_located(self.locators.CALENDAR_TITLE_DISPLAY),
-                        message="Calendar title display element not visible.")
-        return self.get_element_text(self.locators.CALENDAR_TITLE_DISPLAY)
\ No newline at end of file
+        """Gets the title displayed on the calendar itself: its month/year header (e.g., "February 2040")."""
+        self.wait.until(EC.visibility_of_element_located(self.locators.MONTH_YEAR_NAV),
+                        message="Calendar month/year header not visible.")
+        return self.get_element_text(self.locators.MONTH_YEAR_NAV)
\ No newline at end of file
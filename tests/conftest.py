@@ -1,9 +1,8 @@
+import contextlib
 import pytest
+import json
 import os
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 
 # --- IMPORTANT PATH ADJUSTMENT ---
 # Calculate project_root relative to conftest.py's location.
@@ -15,65 +14,306 @@ if project_root not in sys.path:
 
 # Import Config after sys.path is set
 from config.config import Config
+from utils.artifacts import ArtifactCollector
+from utils.benchmark import BenchmarkRecorder
+from utils.checkpoints import CheckpointStore
+from utils.consistency_check import ConsistencyChecker
+from utils.driver_manager import DriverManager
+from utils.duration_history import DurationHistory
+from utils.element_cache import ElementCache
+from utils.event_log import EventLog
+from utils.impact_analysis import select_tests
+from utils.local_server import LocalTestServer
+from utils.profile_snapshots import ProfileSnapshots
+from utils.replay_proxy import ReplayProxy
+from utils.resource_blocking import ResourceBlocker
+from utils.step_tracer import StepTracer
 
 
-@pytest.fixture(scope="module")
-def browser_setup():
+@pytest.fixture(scope="session", autouse=True)
+def local_server():
     """
-    Pytest fixture to set up and tear down the WebDriver.
-    Yields the WebDriver instance to the tests.
+    Starts the local stand-in for the-internet.herokuapp.com (if Config.USE_LOCAL_SERVER is set)
+    and points the upload and drag-and-drop URLs at it for the whole session.
     """
-    options = Options()
+    if not Config.USE_LOCAL_SERVER:
+        yield None
+        return
+    server = LocalTestServer()
+    original_base_url = Config.THE_INTERNET_BASE_URL
+    Config.use_the_internet_base_url(server.start())
+    yield server
+    Config.use_the_internet_base_url(original_base_url)
+    server.stop()
+    timings_path = server.write_timings(os.path.join(Config.REPORTS_DIR, "local_server_timings.json"))
+    print(f"Local server request timings written to: {timings_path}")
 
-    if Config.HEADLESS_MODE:
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--window-size=1920,1080")
 
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    options.add_argument("--log-level=3")
-
-    # Determine the correct chromedriver executable name based on OS
-    driver_executable_name = "chromedriver.exe" if os.name == 'nt' else "chromedriver"
-
-    # --- ADD DEBUG PRINT STATEMENTS HERE ---
-    print(f"\n--- DEBUGGING PATH ---")
-    print(f"Current script (__file__): {os.path.abspath(__file__)}")
-    print(f"Calculated project_root: {project_root}")
-    print(f"Expected driver_executable_name: {driver_executable_name}")
-    # --- END DEBUG PRINT STATEMENTS ---
-
-    # Use the 'project_root' calculated at the top of this conftest.py file
-    driver_path = os.path.join(project_root, "drivers", driver_executable_name)
+@pytest.fixture(scope="session", autouse=True)
+def replay_proxy(request):
+    """
+    With --replay record|replay (or Config.REPLAY_MODE), starts the record-and-replay proxy
+    (see utils/replay_proxy.py) and routes every browser through it for the whole session.
+    """
+    mode = request.config.getoption("--replay") or Config.REPLAY_MODE
+    if not mode:
+        yield None
+        return
+    proxy = ReplayProxy(mode)
+    Config.BROWSER_PROXY = proxy.start()
+    yield proxy
+    Config.BROWSER_PROXY = None
+    proxy.stop()
 
-    print(f"Attempting to find Chromedriver at: {driver_path}") # More specific print
-    print(f"Does the path exist? {os.path.exists(driver_path)}")
-    print(f"Is it a file? {os.path.isfile(driver_path)}")
 
+@pytest.fixture(autouse=True)
+def replay_cassette(replay_proxy, request):
+    """Records into / replays from the test's own cassette while the proxy is running."""
+    if replay_proxy is None:
+        yield
+        return
+    replay_proxy.use_cassette(request.node.nodeid)
+    yield
+    replay_proxy.save()
 
-    if not os.path.exists(driver_path):
-        pytest.fail(f"Chromedriver not found at: {driver_path}. Please download the compatible ChromeDriver and place it in the 'drivers' folder.")
 
-    driver = None
+@pytest.fixture(scope="session")
+def browser_pool(replay_proxy):
+    """
+    Session-wide pool of warm browsers sharing one chromedriver service (see DriverManager).
+    Browsers are pre-launched once and reused across test modules.
+    Depends on replay_proxy so that browsers start with the proxy when one is running.
+    """
     try:
-        service = Service(executable_path=driver_path)
-        driver = webdriver.Chrome(service=service, options=options)
+        DriverManager.warm_up()
+    except Exception as e:
+        DriverManager.shutdown()
+        pytest.fail(f"Error initializing WebDriver: {e}")
+    yield DriverManager
+    DriverManager.shutdown()
 
-        driver.set_page_load_timeout(Config.DEFAULT_WAIT_TIME)
-        driver.implicitly_wait(Config.DEFAULT_WAIT_TIME)
 
-        print("\nWebDriver initialized successfully.")
-        yield driver
+@pytest.fixture
+def browser_setup(browser_pool, replay_proxy, request):
+    """
+    Pytest fixture that hands a warm WebDriver from the pool to the test.
+    After the test the browser is reset (cookies, storage, windows, frames, about:blank)
+    and returned to the pool, or recycled if it is worn out or unhealthy.
+    If the test failed, failure artifacts are captured before the reset.
+    Tests marked @pytest.mark.browser_profile(page=PageClass) get a browser started from that
+    page's profile snapshot (see utils/profile_snapshots.py), built first if missing or expired.
+    While the replay proxy runs they start from an empty profile, unless Config.PROFILE_SNAPSHOTS_WITH_REPLAY.
+    """
+    profile = None
+    marker = request.node.get_closest_marker("browser_profile")
+    use_snapshots = Config.PROFILE_SNAPSHOTS_ENABLED and (replay_proxy is None or Config.PROFILE_SNAPSHOTS_WITH_REPLAY)
+    if marker is not None and use_snapshots:
+        page_class = marker.kwargs["page"]
+        site = page_class.PROFILE_SNAPSHOT
+        # A snapshot build's own traffic is recorded/replayed separately from the test's
+        with replay_proxy.using_cassette(f"profile_snapshot::{site}") if replay_proxy else contextlib.nullcontext():
+            if ProfileSnapshots.ensure(site, lambda driver: page_class(driver).prepare_profile()):
+                profile = site
+    try:
+        driver = browser_pool.acquire(profile)
     except Exception as e:
         pytest.fail(f"Error initializing WebDriver: {e}")
+    # The cold start of this browser (in warm_up or acquire), not how long the hand-out took
+    BenchmarkRecorder.driver_startup_ms = driver._startup_ms
+    yield driver
+    try:
+        report = getattr(request.node, "rep_call", None)
+        if report is not None and report.failed:
+            # The browser is still as the failing step left it; exceptions the test never saw are not captured
+            failed_step = getattr(request.node, "failed_step", None)
+            if failed_step:
+                ArtifactCollector.capture(driver, failed_step["reason"], step=failed_step["step"],
+                                          frame_path=failed_step["frame_path"])
+            else:
+                ArtifactCollector.capture(driver, f"test failed: {request.node.nodeid}", step="test_failure")
+        ResourceBlocker.collect(driver)
     finally:
-        if driver:
-            driver.quit()
-            print("WebDriver closed.")
+        # Always reset and return the browser, even if reporting on it failed
+        browser_pool.release(driver)
+
+
+@pytest.fixture(autouse=True)
+def step_trace(request):
+    """
+    Records a timing trace of every page-object step in the test and exports it
+    to Config.TRACES_DIR as Chrome trace-event JSON.
+    The test's event log (see utils/event_log.py) is written to Config.EVENT_LOG_DIR
+    if the test failed, or always with pytest -vv.
+    """
+    StepTracer.start_test(request.node.nodeid)
+    ArtifactCollector.start_test(request.node.nodeid)
+    EventLog.start_test(request.node.nodeid)
+    yield
+    file_name = request.node.nodeid.replace("/", "_").replace("::", "__") + ".json"
+    trace_path = StepTracer.export_test(os.path.join(Config.TRACES_DIR, file_name))
+    BenchmarkRecorder.record_test(request.node.nodeid, StepTracer.events())
+    if trace_path:
+        EventLog.debug("trace", "Step trace written to: %s", trace_path)
+    failed = any(getattr(getattr(request.node, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
+    EventLog.finish_test(failed, verbose=request.config.getoption("verbose") >= 2)
+
 
 @pytest.fixture(autouse=True)
-def reset_browser_state(browser_setup):
-    driver = browser_setup
-    driver.get("about:blank")
-    yield
\ No newline at end of file
+def step_checkpoints(request):
+    """
+    Tracks the @checkpoint page-object steps of the test (see utils/checkpoints.py).
+    With --resume-from-checkpoint, a test that failed last time skips the steps that already succeeded.
+    Checkpoints are deleted once the test passes.
+    """
+    CheckpointStore.start_test(request.node.nodeid, resume=request.config.getoption("--resume-from-checkpoint"))
+    yield
+    report = getattr(request.node, "rep_call", None)
+    CheckpointStore.finish_test(passed=report is not None and report.passed)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "browser_profile(page=PageClass): start the test's browser from the "
+                                       "page class's profile snapshot (see utils/profile_snapshots.py)")
+    if config.getoption("--wait-backend"):
+        Config.WAIT_BACKEND = config.getoption("--wait-backend")
+    if config.getoption("--launch-profile"):
+        Config.BROWSER_LAUNCH_PROFILE = config.getoption("--launch-profile")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--impacted-since", metavar="REF", default=None,
+                     help="Only run tests affected by changes since git REF, e.g. origin/main (see utils/impact_analysis.py).")
+    parser.addoption("--replay", choices=("record", "replay"), default=None,
+                     help="Record the live sites' responses per test, or replay them offline (see utils/replay_proxy.py).")
+    parser.addoption("--skip-consistency-check", action="store_true", default=False,
+                     help="Do not check page objects, locators and selectors before the run (see utils/consistency_check.py).")
+    parser.addoption("--resume-from-checkpoint", action="store_true", default=False,
+                     help="Resume failed tests from their last successful checkpointed step (see utils/checkpoints.py).")
+    parser.addoption("--wait-backend", choices=("poll", "observer"), default=None,
+                     help="How explicit waits check their condition (default: Config.WAIT_BACKEND; see utils/observer_wait.py).")
+    parser.addoption("--launch-profile", choices=("default", "lean"), default=None,
+                     help="Chrome launch profile (default: Config.BROWSER_LAUNCH_PROFILE; lean fits more browsers per host).")
+
+
+def pytest_sessionstart(session):
+    """
+    Fails the run in milliseconds, before any browser starts, if a page object or test references
+    a locator or method that does not exist, or a selector does not parse.
+    """
+    if not Config.CONSISTENCY_CHECK_ENABLED or session.config.getoption("--skip-consistency-check"):
+        return
+    problems = ConsistencyChecker().run()
+    if problems:
+        pytest.exit("Page object consistency check failed (run with --skip-consistency-check to ignore):\n"
+                    + "\n".join(problems), returncode=pytest.ExitCode.USAGE_ERROR)
+
+
+def pytest_collection_modifyitems(config, items):
+    """With --impacted-since, deselects the tests whose files cannot be affected by the changed files."""
+    base_ref = config.getoption("--impacted-since")
+    if not base_ref:
+        return
+    try:
+        test_files, reasons, changed = select_tests(base_ref)
+    except RuntimeError as e:
+        raise pytest.UsageError(f"--impacted-since {base_ref}: {e}")
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if test_files is None:
+        if reporter:
+            reporter.write_line(f"Impact analysis: running all tests ({reasons['*']} changed).")
+        return
+    selected = set(test_files)
+    keep, deselected = [], []
+    for item in items:
+        test_file = os.path.relpath(str(item.fspath), project_root).replace(os.sep, "/")
+        (keep if test_file in selected else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = keep
+    if reporter:
+        reporter.write_line(f"Impact analysis: {len(changed)} changed file(s) since {base_ref}, "
+                            f"{len(selected)} affected test file(s), {len(deselected)} test(s) deselected.")
+
+
+# Seconds per test in this session (setup + call + teardown), recorded in the duration history at the end
+_test_durations = {}
+# Tests whose body actually ran; a test that errored in setup says nothing about its duration
+_tests_called = set()
+
+
+def pytest_runtest_logreport(report):
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0) + report.duration
+    if report.when == "call" and not report.skipped:
+        _tests_called.add(report.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """
+    Records this session's test durations for duration-aware scheduling (see utils/parallel_runner.py).
+    A parallel worker leaves them in a file for the runner, which is the only writer of the history.
+    """
+    durations = {node_id: seconds for node_id, seconds in _test_durations.items() if node_id in _tests_called}
+    if not durations:
+        return
+    worker_id = os.environ.get(Config.WORKER_ID_ENV_VAR)
+    if worker_id is None:
+        DurationHistory().record_many(durations).save()
+        return
+    durations_path = DurationHistory.worker_durations_path(worker_id)
+    os.makedirs(os.path.dirname(durations_path), exist_ok=True)
+    with open(durations_path, "w") as durations_file:
+        json.dump(durations, durations_file)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Keeps each phase's report on the test item (item.rep_call, ...) so fixtures can see if the test failed,
+    and which page-object step its exception was raised from.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    if call.excinfo is not None:
+        # Set by the innermost traced step or wait the exception came from (see utils/step_tracer.py)
+        item.failed_step = getattr(call.excinfo.value, "_failed_step", None)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Prints the slowest page-object steps, the element cache hit rate and the resource blocking savings of the session."""
+    slowest = StepTracer.slowest_steps()
+    if slowest:
+        terminalreporter.section(f"slowest {len(slowest)} page-object steps")
+        for duration_ms, test_name, step_name, target in slowest:
+            terminalreporter.write_line(f"{duration_ms:10.1f} ms  {step_name}  {target or ''}  ({test_name})")
+
+    cache_stats = ElementCache.session_stats()
+    if cache_stats["hits"] or cache_stats["misses"]:
+        terminalreporter.write_line(f"Element cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), "
+                                    f"{cache_stats['invalidations']} invalidation(s).")
+
+    for page_name, blocking in ResourceBlocker.report().items():
+        terminalreporter.write_line(f"Resource blocking ({page_name}): {blocking['requests_blocked']} request(s) blocked, "
+                                    f"~{blocking['estimated_bytes_saved'] / 1024:.0f} KiB saved, "
+                                    f"{blocking['bytes_loaded'] / 1024:.0f} KiB loaded.")
+
+    for test_name, stats in ReplayProxy.session_stats.items():
+        if any(stats.values()):
+            terminalreporter.write_line(f"Replay ({test_name}): {stats['recorded']} recorded, "
+                                        f"{stats['replayed']} replayed, {stats['missed']} not in the recording.")
+
+    event_logs = EventLog.written()
+    if event_logs:
+        terminalreporter.section("event logs")
+        for test_name, log_path in event_logs.items():
+            terminalreporter.write_line(f"{test_name}: {log_path}")
+
+    # Let the writer threads finish before the session ends
+    artifact_indexes = ArtifactCollector.shutdown()
+    if artifact_indexes:
+        terminalreporter.section("failure artifacts")
+        for test_name, index_path in artifact_indexes.items():
+            terminalreporter.write_line(f"{test_name}: {index_path}")
+    if ArtifactCollector.stats["dropped"] or ArtifactCollector.stats["failed"]:
+        terminalreporter.write_line(f"Artifacts: {ArtifactCollector.stats['dropped']} capture(s) dropped "
+                                    f"(queue full), {ArtifactCollector.stats['failed']} failed.")
@@ -1,7 +1,7 @@
 import sys
 import os
 import pytest
-import time # Used for small delays where necessary for UI stability
+from selenium.webdriver.support import expected_conditions as EC
 
 # Adjust sys.path to enable imports from the project root.
 # This ensures that modules like 'pages.aubergine_page' and 'config.config' can be found.
@@ -16,6 +16,8 @@ from config.config import Config # Import Config from config/config.py
 
 
 # The 'browser_setup' fixture is defined in tests/conftest.py and automatically discovered by pytest.
+# Its browser starts from the Aubergine profile snapshot: cookie consent given, homepage assets cached.
+@pytest.mark.browser_profile(page=AuberginePage)
 def test_scenario_3_aubergine_solutions(browser_setup):
     """
     Test Scenario 3: Aubergine Solutions Navigation
@@ -42,26 +44,29 @@ def test_scenario_3_aubergine_solutions(browser_setup):
         f"Page title does not contain 'Python' after navigation. Actual title: {driver.title}"
     print(f"Navigated to Python expertise page. Title: {driver.title}")
 
+    # Steps 3-5 read the image, the carousel and the link in a single round trip
+    snapshot = page.get_python_page_snapshot()
+
     # 3. Verify the first image present on the page is displayed using assertion.
-    first_image_element = page.get_first_image_element()
-    assert first_image_element.is_displayed(), \
+    assert snapshot["first_image"]["displayed"], \
         "First image on Python expertise page is not displayed."
     print("Verification: First image on page is displayed.")
 
     # 4. Verify the carousel displayed.
-    # This method checks for visibility based on its locator
-    assert page.is_carousel_displayed(), \
+    assert snapshot["carousel"]["displayed"], \
         "Carousel element is not displayed on the Python expertise page."
     print("Verification: Carousel is displayed.")
+    assert snapshot["talk_to_experts"]["present"], \
+        "'Talk to our python experts now' link not found on the Python expertise page."
 
     # 5. Open “Talk to our python experts now” button link in the new tab.
     # We store the main window handle before opening a new tab
     main_window_handle = driver.current_window_handle
     page.open_talk_to_experts_link_in_new_tab()
-    time.sleep(2) # Give a short delay for the new tab to fully open and load content
 
-    # Switch to the newly opened tab
+    # Switch to the newly opened tab and wait for it to navigate to the contact page
     page.switch_to_new_tab()
+    page.wait_until_ready(EC.url_contains("contact"))
     # Verify that the URL of the new tab contains "contact"
     assert "contact" in driver.current_url, \
         f"New tab URL does not contain 'contact'. Actual URL: {driver.current_url}"
@@ -0,0 +1,96 @@
+import sys
+import os
+import textwrap
+
+# Adjust sys.path to enable imports from the project root.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.consistency_check import ConsistencyChecker, check_selector
+
+LOCATORS = """
+from selenium.webdriver.common.by import By
+
+
+class TockifyLocators:
+    EVENT_LINK = (By.XPATH, "//a[contains(@class, 'eventCard')]")
+    DATE_PICKER = (By.CSS_SELECTOR, "button.datePicker")
+"""
+
+PAGE = """
+from locators.tockify_locators import TockifyLocators
+
+
+class TockifyPage:
+    def __init__(self, driver):
+        self.driver = driver
+        self.locators = TockifyLocators
+
+    def open_picker(self):
+        return self.locators.DATE_PICKER
+
+    def open_event(self):
+        return self.locators.{locator}
+"""
+
+TEST = """
+from pages.tockify_page import TockifyPage
+
+
+def test_events(driver):
+    page = TockifyPage(driver)
+    page.{method}()
+"""
+
+
+def _checker(tmp_path, locator="EVENT_LINK", method="open_event", locators=LOCATORS):
+    files = {
+        "locators/tockify_locators.py": locators,
+        "pages/tockify_page.py": PAGE.format(locator=locator),
+        "tests/test_tockify.py": TEST.format(method=method),
+    }
+    for file_path, source in files.items():
+        (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file_path).write_text(textwrap.dedent(source))
+    return ConsistencyChecker(root=str(tmp_path), cache_path=str(tmp_path / ".cache" / "consistency.json"))
+
+
+def test_consistent_tree_has_no_problems(tmp_path):
+    assert _checker(tmp_path).run() == []
+
+
+def test_missing_locator_is_reported(tmp_path):
+    problems = _checker(tmp_path, locator="EVENT_TITLE").run()
+    assert problems == ["pages/tockify_page.py:14: TockifyLocators has no locator EVENT_TITLE (used by TockifyPage)"]
+
+
+def test_missing_page_method_is_reported(tmp_path):
+    problems = _checker(tmp_path, method="open_events").run()
+    assert problems == ["tests/test_tockify.py:7: TockifyPage has no attribute or method open_events"]
+
+
+def test_malformed_selector_is_reported(tmp_path):
+    problems = _checker(tmp_path, locators=LOCATORS.replace("'eventCard')]", "'eventCard']")).run()
+    assert len(problems) == 1 and problems[0].startswith("locators/tockify_locators.py:6: ")
+
+
+def test_cached_results_are_reused_until_a_file_changes(tmp_path):
+    checker = _checker(tmp_path)
+    checker.run()
+    assert checker.parsed == 3
+    checker.run()
+    assert checker.parsed == 0
+    (tmp_path / "pages" / "tockify_page.py").write_text(textwrap.dedent(PAGE.format(locator="EVENT_TITLE")))
+    assert len(checker.run()) == 1 and checker.parsed == 1
+
+
+def test_check_selector():
+    assert check_selector("xpath", "//h3[normalize-space(text())='{}']") is None
+    assert check_selector("css selector", "  ") == "empty selector"
+    assert "compound class names" in check_selector("class name", "btn primary")
+
+
+def test_project_tree_is_consistent(tmp_path):
+    # The page objects, locators and tests shipped with the framework
+    assert ConsistencyChecker(cache_path=str(tmp_path / "consistency.json")).run() == []
@@ -1,7 +1,6 @@
 import sys
 import os
 import pytest
-import time # For time.sleep
 
 # Adjust sys.path to import modules from the project root
 # This assumes the test file is at SeleniumAutomationProject/tests/test_drag_and_drop_scenario.py
@@ -30,23 +29,24 @@ def test_scenario_2_drag_and_drop(browser_setup):
     # 1. Hit the URL - https://the-internet.herokuapp.com/drag_and_drop
     page.load()
 
-    # Verify initial positions before drag and drop
-    initial_header_a = page.get_column_a_header_text()
-    initial_header_b = page.get_column_b_header_text()
+    # Verify initial positions before drag and drop (both headers read in one round trip)
+    initial_headers = page.get_headers_snapshot()
+    initial_header_a = initial_headers["column_a"]
+    initial_header_b = initial_headers["column_b"]
     assert initial_header_a == "A", f"Initial Column A header expected 'A', but was '{initial_header_a}'"
     assert initial_header_b == "B", f"Initial Column B header expected 'B', but was '{initial_header_b}'"
     print(f"Initial positions verified: Column A: '{initial_header_a}', Column B: '{initial_header_b}'")
 
     # 2. Switch the position of ‘A’ and ‘B’ using the offset method.
-    # Selenium's `ActionChains.drag_and_drop(source_element, target_element)`
-    # implicitly uses offsets to drop the source element at the center of the target element.
+    # The page fires the HTML5 drag events in the browser, dropping at the centre of column B
+    # (BasePage.drag_and_drop also accepts an explicit pixel offset), in a single round trip.
     page.drag_a_to_b()
-    time.sleep(1) # Small pause to allow the UI to visually update after drag-and-drop
 
     # 3. Verify using assertion.
     # After dragging A to B, Column A should now contain 'B' and Column B should contain 'A'.
-    final_header_a = page.get_column_a_header_text()
-    final_header_b = page.get_column_b_header_text()
+    final_headers = page.get_headers_snapshot()
+    final_header_a = final_headers["column_a"]
+    final_header_b = final_headers["column_b"]
     assert final_header_a == "B", f"After drag and drop, Column A header expected 'B', but was '{final_header_a}'"
     assert final_header_b == "A", f"After drag and drop, Column B header expected 'A', but was '{final_header_b}'"
     print(f"Final positions verified: Column A: '{final_header_a}', Column B: '{final_header_b}'")
@@ -0,0 +1,73 @@
+import sys
+import os
+
+# Adjust sys.path to enable imports from the project root.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.impact_analysis import ImpactAnalysis, ImportGraph
+
+TREE = {
+    "config/config.py": "class Config:\n    pass\n",
+    "utils/driver_manager.py": "from config.config import Config\n",
+    "utils/readiness.py": "from config.config import Config\n",
+    "locators/upload_locators.py": "class UploadLocators:\n    pass\n",
+    "locators/tockify_locators.py": "class TockifyLocators:\n    pass\n",
+    "pages/base_page.py": "from utils import readiness\n",
+    "pages/upload_page.py": "from pages.base_page import BasePage\nfrom locators.upload_locators import UploadLocators\n",
+    "pages/tockify_page.py": "from .base_page import BasePage\nfrom locators.tockify_locators import TockifyLocators\n",
+    "tests/conftest.py": "from utils.driver_manager import DriverManager\n",
+    "tests/test_upload.py": "from pages.upload_page import UploadPage\n",
+    "tests/test_tockify.py": "from pages.tockify_page import TockifyPage\n",
+}
+ALL_TESTS = ["tests/test_tockify.py", "tests/test_upload.py"]
+
+
+def _analysis(tmp_path):
+    for file_path, source in TREE.items():
+        (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file_path).write_text(source)
+    graph = ImportGraph(root=str(tmp_path), cache_path=str(tmp_path / ".cache" / "impact_graph.json")).build()
+    return ImpactAnalysis(graph)
+
+
+def test_imports_resolve_to_project_files(tmp_path):
+    graph = _analysis(tmp_path).graph
+    assert graph.dependencies["pages/tockify_page.py"] == {"pages/base_page.py", "locators/tockify_locators.py"}
+    assert graph.dependencies["pages/base_page.py"] == {"utils/readiness.py"}
+    assert graph.dependencies["tests/conftest.py"] == {"utils/driver_manager.py"}
+
+
+def test_changed_test_selects_only_itself(tmp_path):
+    tests, reasons = _analysis(tmp_path).affected_tests(["tests/test_upload.py"])
+    assert tests == ["tests/test_upload.py"]
+    assert reasons == {"tests/test_upload.py": "tests/test_upload.py"}
+
+
+def test_transitive_dependency_selects_its_tests(tmp_path):
+    analysis = _analysis(tmp_path)
+    assert analysis.affected_tests(["locators/tockify_locators.py"])[0] == ["tests/test_tockify.py"]
+    # utils/readiness.py <- pages/base_page.py <- both pages <- both tests
+    assert analysis.affected_tests(["utils/readiness.py"])[0] == ALL_TESTS
+
+
+def test_conftest_dependency_selects_every_test_it_loads_with(tmp_path):
+    analysis = _analysis(tmp_path)
+    tests, reasons = analysis.affected_tests(["utils/driver_manager.py"])
+    assert tests == ALL_TESTS
+    assert set(reasons.values()) == {"utils/driver_manager.py"}
+    assert analysis.affected_tests(["tests/conftest.py"])[0] == ALL_TESTS
+
+
+def test_non_python_and_ignored_files(tmp_path):
+    analysis = _analysis(tmp_path)
+    assert analysis.affected_tests(["requirements.txt/requirements.txt"]) == (None, {"*": "requirements.txt/requirements.txt"})
+    assert analysis.affected_tests(["README.md/readme", "notes.md"]) == ([], {})
+
+
+def test_cached_imports_are_refreshed_when_a_file_changes(tmp_path):
+    _analysis(tmp_path)
+    (tmp_path / "tests" / "test_upload.py").write_text("from pages.tockify_page import TockifyPage\n")
+    graph = ImportGraph(root=str(tmp_path), cache_path=str(tmp_path / ".cache" / "impact_graph.json")).build()
+    assert ImpactAnalysis(graph).affected_tests(["locators/upload_locators.py"])[0] == []
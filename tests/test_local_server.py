@@ -0,0 +1,87 @@
+import sys
+import os
+import io
+import http.client
+
+import pytest
+
+# Adjust sys.path to enable imports from the project root.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils import local_server
+from utils.local_server import LocalTestServer, read_multipart
+
+BOUNDARY = b"----WebKitFormBoundary7MA4YWxkTrZu0gW"
+
+
+def _multipart(*parts):
+    """Encodes (name, filename or None, content) parts as a multipart/form-data body."""
+    body = b""
+    for name, filename, content in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += b"--" + BOUNDARY + b"\r\n"
+        body += f"Content-Disposition: {disposition}\r\n".encode()
+        if filename:
+            body += b"Content-Type: application/pdf\r\n"
+        body += b"\r\n" + content + b"\r\n"
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+
+def _read(body, boundary=BOUNDARY):
+    return read_multipart(io.BytesIO(body), len(body), boundary)
+
+
+def test_reads_fields_and_file_sizes():
+    body = _multipart(("note", None, b"hello"), ("file", "sample.pdf", b"%PDF-1.4" + b"x" * 1000))
+    assert _read(body) == [
+        {"name": "note", "filename": None, "size": 5},
+        {"name": "file", "filename": "sample.pdf", "size": 1008},
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 45, 4096])
+def test_boundaries_split_across_reads(monkeypatch, chunk_size):
+    # Content containing CR LF and almost-delimiters must be counted, not mistaken for a boundary
+    content = (b"\r\n--" + BOUNDARY[:-1] + b"\r\n") * 50 + b"\r\n-"
+    body = _multipart(("file", "a.pdf", content), ("file", "b.pdf", b""))
+    monkeypatch.setattr(local_server, "_READ_CHUNK_SIZE", chunk_size)
+    assert _read(body) == [
+        {"name": "file", "filename": "a.pdf", "size": len(content)},
+        {"name": "file", "filename": "b.pdf", "size": 0},
+    ]
+
+
+def test_reads_only_content_length_and_drains_the_epilogue():
+    body = _multipart(("file", "a.pdf", b"data")) + b"epilogue"
+    stream = io.BytesIO(body + b"NEXT REQUEST")
+    assert read_multipart(stream, len(body), BOUNDARY) == [{"name": "file", "filename": "a.pdf", "size": 4}]
+    assert stream.read() == b"NEXT REQUEST"
+
+
+def test_truncated_body_returns_the_parts_seen():
+    # The client went away mid-body: no closing boundary, the size counted so far is a lower bound
+    body = _multipart(("file", "a.pdf", b"x" * 100))[:-40]
+    parts = _read(body)
+    assert [part["filename"] for part in parts] == ["a.pdf"]
+    assert parts[0]["size"] <= 100
+
+
+def test_server_records_uploaded_files():
+    server = LocalTestServer(port=0)
+    port = int(server.start().rsplit(":", 1)[1])
+    try:
+        body = _multipart(("file", "sample.pdf", b"x" * 2048))
+        connection = http.client.HTTPConnection(server.host, port, timeout=5)
+        connection.request("POST", "/upload", body,
+                           {"Content-Type": f"multipart/form-data; boundary={BOUNDARY.decode()}"})
+        response = connection.getresponse()
+        page = response.read().decode()
+        connection.close()
+    finally:
+        server.stop()
+    assert response.status == 200
+    assert "File Uploaded!" in page and "sample.pdf" in page
+    assert server.uploads[0]["files"] == [{"name": "file", "filename": "sample.pdf", "size": 2048}]
+    assert server.uploads[0]["bytes"] == 2048
@@ -0,0 +1,67 @@
+import sys
+import os
+from selenium.webdriver.support import expected_conditions as EC
+
+# Adjust sys.path to enable imports from the project root.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pages.upload_page import UploadPage
+from pages.drag_and_drop_page import DragAndDropPage
+from utils.tab_orchestrator import TabOrchestrator
+from config.config import Config
+
+
+def upload_in_tab(page):
+    """Scenario 1 steps; yields while the upload result page loads so the other tab can run."""
+    page.upload_file_by_drag_drop_area(Config.TEST_FILE_PATH)
+    displayed_file_name = page.get_displayed_file_name()
+    page.click_upload_button()
+    yield EC.visibility_of_element_located(page.locators.SUCCESS_MESSAGE_HEADER)
+    return {"file_name": displayed_file_name, "message": page.get_upload_success_message()}
+
+
+def drag_and_drop_in_tab(page):
+    """Scenario 2 steps."""
+    page.drag_a_to_b()
+    return page.get_headers_snapshot()
+
+
+def test_scenario_5_upload_and_drag_and_drop_in_parallel_tabs(browser_setup):
+    """
+    Test Scenario 5: File upload and drag and drop in two tabs of one browser
+    1. Open the upload page and the drag and drop page in separate tabs at the same time.
+    2. Upload the pdf file in the first tab and swap 'A' and 'B' in the second, each as soon as its page is ready.
+    3. Verify both results using assertions.
+    4. Close the tabs and return to the main tab. (Handled by TabOrchestrator)
+    """
+    driver = browser_setup  # Get the driver instance from the fixture
+    main_window_handle = driver.current_window_handle
+
+    print("\n--- Running Test Scenario 5: Parallel Tabs ---")
+
+    # 1. & 2. Both navigations start before either page is used
+    orchestrator = TabOrchestrator(driver)
+    orchestrator.add("upload", UploadPage, upload_in_tab)
+    orchestrator.add("drag_and_drop", DragAndDropPage, drag_and_drop_in_tab)
+    results = orchestrator.run()
+
+    # 3. Verify both results using assertions.
+    for name, outcome in results.items():
+        assert outcome["error"] is None, f"Tab '{name}' failed: {outcome['error']}"
+
+    upload = results["upload"]["result"]
+    assert Config.TEST_FILE_NAME in upload["file_name"], \
+        f"Displayed file name '{upload['file_name']}' does not contain expected file name '{Config.TEST_FILE_NAME}'"
+    assert "File Uploaded!" in upload["message"], \
+        f"Success message expected 'File Uploaded!', but got '{upload['message']}'"
+
+    headers = results["drag_and_drop"]["result"]
+    assert headers == {"column_a": "B", "column_b": "A"}, f"Columns were not swapped: {headers}"
+
+    # 4. Only the main tab is left, and it is the current one again
+    assert driver.window_handles == [main_window_handle], f"Tabs left open: {driver.window_handles}"
+    assert driver.current_window_handle == main_window_handle, "Did not return to the main tab."
+
+    print("Test Scenario 5 Completed Successfully.")
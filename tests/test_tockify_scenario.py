@@ -1,7 +1,6 @@
 import sys
 import os
 import pytest
-import time  # Used for small delays for UI stability, consider replacing with explicit waits if flakiness occurs
 
 # Adjust sys.path to enable imports from the project root.
 # This ensures that modules like 'pages.tockify_page' and 'config.config' can be found.
@@ -40,7 +39,6 @@ def test_scenario_4_tockify_calendar(browser_setup):
     target_month_num = 2  # February is the 2nd month
     target_year = 2040
     page.select_date_from_calendar(target_day, target_month_num, target_year)
-    time.sleep(1)  # Small delay to allow date selection to visually reflect on the page
 
     # 3. Verify the date displayed as ‘28/02/40’ in the calendar using assertion.
     # The get_selected_date_display method will switch back to iframe, get text, then switch to default content.
@@ -50,9 +48,8 @@ def test_scenario_4_tockify_calendar(browser_setup):
     print(f"Verification: Date '{displayed_date_text}' displayed as expected.")
 
     # 4. Select the ‘Monthly’ tab.
-    # The select_monthly_tab method handles switching to iframe, clicking, then switching back.
-    page.select_monthly_tab()
-    time.sleep(1)  # Small delay to allow view to change to monthly grid
+    # The click_monthly_tab method clicks the tab and waits for the calendar grid.
+    page.click_monthly_tab()
 
     # 5. Verify the calendar grid and title of the page displayed using assertion.
     # The is_calendar_grid_displayed method handles switching to iframe, checking, then switching back.
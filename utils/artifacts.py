@@ -0,0 +1,136 @@
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import Config
+from utils.driver_manager import DriverManager
+from utils.event_log import EventLog
+from utils.file_names import slug
+
+# One round trip for everything the page itself can tell us
+_PAGE_STATE_JS = """
+return {url: window.location.href, title: document.title, readyState: document.readyState,
+        dom: document.documentElement ? document.documentElement.outerHTML : ''};
+"""
+
+
+class ArtifactCollector:
+    """
+    Captures failure artifacts (screenshot, DOM snapshot, console log, URL and frame path) without
+    slowing the test down more than the browser round trips themselves.
+
+    capture() only talks to the browser (page state script, screenshot, console log). Decoding,
+    gzip compression and disk writes are handed to a small background thread pool. At most
+    Config.ARTIFACT_QUEUE_SIZE captures can be waiting to be written; further captures are dropped
+    (and counted) rather than blocking the test. Each test gets a folder under Config.ARTIFACTS_DIR
+    with an index.json listing its artifacts, updated as they are written.
+    """
+    _executor = None
+    _slots = None  # Bounds the number of captures waiting for the writer threads
+    _lock = threading.Lock()
+    _test_name = None
+    _sequence = 0
+    _indexes = {}  # test name -> list of index entries
+    stats = {"captured": 0, "dropped": 0, "failed": 0}
+
+    @classmethod
+    def _ensure_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=Config.ARTIFACT_WORKERS, thread_name_prefix="artifacts")
+                cls._slots = threading.BoundedSemaphore(Config.ARTIFACT_QUEUE_SIZE)
+
+    @classmethod
+    def start_test(cls, test_name):
+        with cls._lock:
+            cls._test_name = test_name
+            cls._sequence = 0
+
+    @classmethod
+    def test_dir(cls, test_name):
+        return os.path.join(Config.ARTIFACTS_DIR, slug(test_name.replace("::", "__"), 150))
+
+    @classmethod
+    def capture(cls, driver, reason, step=None, frame_path=None):
+        """
+        Grabs the browser state for the current test and queues it for writing.
+        Never raises: a browser that cannot be captured (e.g. already gone) is only reported.
+        """
+        if not Config.ARTIFACTS_ENABLED or driver is None:
+            return
+        cls._ensure_executor()
+        if not cls._slots.acquire(blocking=False):
+            cls.stats["dropped"] += 1
+            EventLog.warning("artifacts", "Artifact queue full (%d); dropped capture for: %s", Config.ARTIFACT_QUEUE_SIZE, reason)
+            return
+
+        start = time.perf_counter()
+        try:
+            state = driver.execute_script(_PAGE_STATE_JS)
+            screenshot = driver.get_screenshot_as_base64()
+            try:
+                console = DriverManager.get_log(driver, "browser")
+            except WebDriverException:
+                console = []  # Browser logging not enabled for this driver
+        except WebDriverException as e:
+            cls._slots.release()
+            cls.stats["failed"] += 1
+            EventLog.warning("artifacts", "Could not capture artifacts for '%s': %s", reason, e.__class__.__name__)
+            return
+
+        with cls._lock:
+            cls._sequence += 1
+            test_name = cls._test_name or "session"
+            entry = {
+                "sequence": cls._sequence, "step": step, "reason": reason,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "url": state.get("url"), "title": state.get("title"),
+                "ready_state": state.get("readyState"),
+                "frame_path": [list(locator) for locator in frame_path] if frame_path else [],
+                "capture_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+        cls.stats["captured"] += 1
+        cls._executor.submit(cls._write, test_name, entry, screenshot, state.get("dom", ""), console)
+
+    @classmethod
+    def _write(cls, test_name, entry, screenshot, dom, console):
+        """Runs on a writer thread: decodes, compresses and writes one capture, then updates the test's index."""
+        try:
+            directory = cls.test_dir(test_name)
+            os.makedirs(directory, exist_ok=True)
+            prefix = f"{entry['sequence']:03d}-{slug(entry['step'] or entry['reason'])}"
+            files = {"screenshot": prefix + ".png", "dom": prefix + ".html.gz", "console": prefix + ".console.json.gz"}
+            with open(os.path.join(directory, files["screenshot"]), "wb") as screenshot_file:
+                screenshot_file.write(base64.b64decode(screenshot))
+            with gzip.open(os.path.join(directory, files["dom"]), "wt", encoding="utf-8") as dom_file:
+                dom_file.write(dom)
+            with gzip.open(os.path.join(directory, files["console"]), "wt", encoding="utf-8") as console_file:
+                json.dump(console, console_file)
+            entry["files"] = files
+
+            with cls._lock:
+                index = cls._indexes.setdefault(test_name, [])
+                index.append(entry)
+                index.sort(key=lambda item: item["sequence"])
+                with open(os.path.join(directory, "index.json"), "w") as index_file:
+                    json.dump({"test": test_name, "artifacts": index}, index_file, indent=2)
+        except Exception as e:
+            cls.stats["failed"] += 1
+            EventLog.error("artifacts", "Writing artifacts for '%s' failed: %s", entry["reason"], e)
+        finally:
+            cls._slots.release()
+
+    @classmethod
+    def shutdown(cls):
+        """Waits for every queued capture to be written. Returns {test name: index.json path}."""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with cls._lock:
+            return {test_name: os.path.join(cls.test_dir(test_name), "index.json") for test_name in cls._indexes}
@@ -0,0 +1,215 @@
+import argparse
+import glob
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Allow running this file directly (python utils/benchmark.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+
+# Trace categories that are reported as separate phases (see utils/step_tracer.py)
+PHASES = ("navigation", "action", "read", "wait", "script", "window")
+
+
+class BenchmarkRecorder:
+    """
+    Collects per-test metrics inside a pytest process started by the benchmark runner.
+    Only active when the runner sets Config.BENCHMARK_OUTPUT_ENV_VAR to a results file.
+    """
+    driver_startup_ms = None
+
+    @classmethod
+    def enabled(cls):
+        return bool(os.environ.get(Config.BENCHMARK_OUTPUT_ENV_VAR))
+
+    @classmethod
+    def record_test(cls, test_name, events):
+        """Derives the metrics of one test from its step trace and appends them to the results file."""
+        if not cls.enabled() or not events:
+            return
+        start_us = min(event["ts"] for event in events)
+        end_us = max(event["ts"] + event["dur"] for event in events)
+        top_level = [event for event in events if event["args"].get("depth", 0) == 0]
+        metrics = {"steps_ms": (end_us - start_us) / 1000}
+        if cls.driver_startup_ms is not None:
+            metrics["driver_startup_ms"] = cls.driver_startup_ms
+        actions = [event for event in events if event["cat"] == "action"]
+        if actions:
+            first_action = min(actions, key=lambda event: event["ts"])
+            metrics["time_to_first_interaction_ms"] = (first_action["ts"] + first_action["dur"] - start_us) / 1000
+        for phase in PHASES:
+            metrics[f"{phase}_ms"] = sum(event["dur"] for event in top_level if event["cat"] == phase) / 1000
+
+        with open(os.environ[Config.BENCHMARK_OUTPUT_ENV_VAR], "a") as results_file:
+            results_file.write(json.dumps({"test": test_name, "metrics": metrics}) + "\n")
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ScenarioBenchmark:
+    """
+    Runs each scenario K times and reports driver startup, time-to-first-interaction,
+    per-phase durations and total wall time as median/p95. Results can be saved as a
+    baseline and compared against it with a regression threshold.
+    """
+
+    def __init__(self, runs=None, scenarios=None, threshold=None, baseline_path=None):
+        self.runs = runs or Config.BENCHMARK_RUNS
+        self.threshold = Config.BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold
+        self.baseline_path = baseline_path or Config.BENCHMARK_BASELINE_PATH
+        available = self.discover_scenarios()
+        unknown = set(scenarios or ()) - set(available)
+        if unknown:
+            raise ValueError(f"Unknown scenario(s): {sorted(unknown)}. Available: {sorted(available)}")
+        self.scenarios = {name: path for name, path in available.items() if not scenarios or name in scenarios}
+
+    @staticmethod
+    def discover_scenarios():
+        """Maps scenario names to test files, e.g. {'upload': 'tests/test_upload_scenario.py'}."""
+        scenarios = {}
+        for path in sorted(glob.glob(os.path.join(Config.PROJECT_ROOT, "tests", "test_*_scenario.py"))):
+            name = os.path.basename(path)[len("test_"):-len("_scenario.py")]
+            scenarios[name] = os.path.relpath(path, Config.PROJECT_ROOT)
+        return scenarios
+
+    def _run_once(self, test_path):
+        """Runs one scenario in a fresh pytest process and returns its metrics (or None if it failed)."""
+        fd, results_path = tempfile.mkstemp(suffix=".jsonl", prefix="benchmark-")
+        os.close(fd)
+        env = dict(os.environ)
+        env[Config.BENCHMARK_OUTPUT_ENV_VAR] = results_path
+        try:
+            start = time.perf_counter()
+            process = subprocess.run([sys.executable, "-m", "pytest", test_path, "-q", "-p", "no:cacheprovider"],
+                                     cwd=Config.PROJECT_ROOT, env=env, capture_output=True, text=True)
+            wall_ms = (time.perf_counter() - start) * 1000
+            if process.returncode != 0:
+                print(process.stdout[-2000:])
+                return None
+            metrics = {"wall_ms": wall_ms}
+            with open(results_path) as results_file:
+                for line in results_file:
+                    # A scenario file may hold several tests: durations add up, startup happens once
+                    for key, value in json.loads(line)["metrics"].items():
+                        if key == "driver_startup_ms":
+                            metrics[key] = value
+                        else:
+                            metrics[key] = metrics.get(key, 0) + value
+            return metrics
+        finally:
+            os.remove(results_path)
+
+    def run(self):
+        """Returns {scenario: {metric: {"median", "p95"}}}; scenarios with a failed run are reported as errors."""
+        results = {}
+        for name, test_path in self.scenarios.items():
+            samples = []
+            for run_index in range(self.runs):
+                metrics = self._run_once(test_path)
+                if metrics is None:
+                    print(f"[{name}] run {run_index + 1}/{self.runs} FAILED")
+                    break
+                print(f"[{name}] run {run_index + 1}/{self.runs}: {metrics['wall_ms']:.0f} ms wall time")
+                samples.append(metrics)
+            if len(samples) < self.runs:
+                results[name] = {"error": "scenario failed"}
+                continue
+            results[name] = {metric: {"median": round(statistics.median(s[metric] for s in samples), 1),
+                                      "p95": round(_percentile([s[metric] for s in samples], 95), 1)}
+                             for metric in sorted(set().union(*samples)) if all(metric in s for s in samples)}
+        return results
+
+    def save_baseline(self, results):
+        os.makedirs(os.path.dirname(self.baseline_path), exist_ok=True)
+        with open(self.baseline_path, "w") as baseline_file:
+            json.dump({"created": datetime.now(timezone.utc).isoformat(), "runs": self.runs, "scenarios": results},
+                      baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline written to: {self.baseline_path}")
+
+    def compare(self, results):
+        """
+        Compares medians against the stored baseline. A metric regresses when it is slower than
+        baseline * (1 + threshold) and by more than Config.BENCHMARK_MIN_REGRESSION_MS.
+        Returns a list of human-readable regression messages.
+        """
+        with open(self.baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)["scenarios"]
+        regressions = []
+        for name, metrics in results.items():
+            if "error" in metrics:
+                regressions.append(f"{name}: {metrics['error']}")
+                continue
+            for metric, values in metrics.items():
+                reference = baseline.get(name, {}).get(metric)
+                if not reference:
+                    continue
+                limit = reference["median"] * (1 + self.threshold)
+                if values["median"] > limit and values["median"] - reference["median"] > Config.BENCHMARK_MIN_REGRESSION_MS:
+                    regressions.append(f"{name}.{metric}: median {values['median']:.0f} ms vs baseline "
+                                       f"{reference['median']:.0f} ms (limit {limit:.0f} ms)")
+        return regressions
+
+
+def print_results(results):
+    for name, metrics in results.items():
+        print(f"\n{name}")
+        if "error" in metrics:
+            print(f"  {metrics['error']}")
+            continue
+        for metric, values in metrics.items():
+            print(f"  {metric:32} median {values['median']:10.1f} ms   p95 {values['p95']:10.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the browser scenarios against a stored baseline.")
+    parser.add_argument("-k", "--runs", type=int, default=None, help="Runs per scenario (default: Config.BENCHMARK_RUNS).")
+    parser.add_argument("-s", "--scenarios", default=None,
+                        help="Comma-separated scenario names (default: all, e.g. upload,drag_and_drop,aubergine,tockify).")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Allowed slowdown as a fraction (default: Config.BENCHMARK_REGRESSION_THRESHOLD).")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON path (default: Config.BENCHMARK_BASELINE_PATH).")
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the new baseline.")
+    args = parser.parse_args(argv)
+
+    benchmark = ScenarioBenchmark(runs=args.runs, threshold=args.threshold, baseline_path=args.baseline,
+                                  scenarios=args.scenarios.split(",") if args.scenarios else None)
+    results = benchmark.run()
+    print_results(results)
+
+    failed = [name for name, metrics in results.items() if "error" in metrics]
+    if args.update_baseline:
+        if failed:
+            print(f"\nNot updating the baseline: scenario(s) failed: {', '.join(failed)}")
+            return 1
+        benchmark.save_baseline(results)
+        return 0
+    if not os.path.exists(benchmark.baseline_path):
+        print(f"\nNo baseline at {benchmark.baseline_path}; run with --update-baseline to create one.")
+        return 1 if failed else 0
+    regressions = benchmark.compare(results)
+    if regressions:
+        print("\nPerformance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo performance regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
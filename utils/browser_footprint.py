@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Allow running this file directly (python utils/browser_footprint.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+from utils.benchmark import _percentile
+from utils.driver_manager import DriverManager
+from utils.local_server import LocalTestServer
+
+_METRICS = ("startup_ms", "load_ms", "rss_mb", "pss_mb", "processes")
+
+
+def _parent_pids():
+    """{pid: parent pid} of every running process, read from /proc/<pid>/stat."""
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue  # Exited while we were looking
+        # Field 2 (the command name) is in parentheses and may contain spaces; the parent pid is field 4
+        parents[int(name)] = int(stat.rsplit(")", 1)[1].split()[1])
+    return parents
+
+
+def _process_tree(root_pids, parents):
+    children = {}
+    for pid, parent in parents.items():
+        children.setdefault(parent, []).append(pid)
+    tree, pending = [], list(root_pids)
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, ()))
+    return tree
+
+
+def _read_kb(path, field):
+    try:
+        with open(path) as proc_file:
+            for line in proc_file:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def process_tree_memory(root_pids, parents=None):
+    """
+    Memory of the given processes and all their descendants (a browser: its browser, zygote, GPU,
+    utility and renderer processes) as {"processes", "rss_mb", "pss_mb"}.
+    RSS counts pages shared between the processes once per process. PSS splits each shared page
+    among the processes sharing it, so PSS totals add up to what the browsers really take from
+    the host; it is None where /proc/<pid>/smaps_rollup is missing (Linux before 4.14).
+    """
+    tree = _process_tree(root_pids, parents or _parent_pids())
+    rss_kb = [_read_kb(f"/proc/{pid}/status", "VmRSS:") for pid in tree]
+    pss_kb = [_read_kb(f"/proc/{pid}/smaps_rollup", "Pss:") for pid in tree]
+    return {
+        "processes": len(tree),
+        "rss_mb": round(sum(kb for kb in rss_kb if kb) / 1024, 1),
+        "pss_mb": round(sum(kb for kb in pss_kb if kb) / 1024, 1) if any(kb is not None for kb in pss_kb) else None,
+    }
+
+
+def _stats(values):
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {"median": round(statistics.median(values), 1), "p95": round(_percentile(values, 95), 1)}
+
+
+class BrowserFootprint:
+    """
+    Measures how much a browser costs a CI host under each Chrome launch profile
+    (Config.BROWSER_LAUNCH_PROFILE "default" and "lean").
+
+    For every profile, Config.FOOTPRINT_BROWSERS browsers are started one after another on the shared
+    chromedriver service and kept open together, like parallel workers. Each one loads the page
+    (by default the drag-and-drop page of the local stand-in server). After
+    Config.FOOTPRINT_SETTLE_TIME seconds the memory of each browser's process tree is read from /proc.
+    Reported per browser (median/p95):
+      startup_ms - create_driver() until the session is ready
+      load_ms    - driver.get() of the page
+      rss_mb     - resident memory summed over the browser's processes
+      pss_mb     - proportional memory (shared pages split among their users)
+      processes  - number of processes the browser runs
+    plus the RSS/PSS total of all browsers of the profile, and the lean profile's change against
+    the default one in percent.
+    """
+
+    def __init__(self, profiles=("default", "lean"), browsers=None, url=None, settle_time=None):
+        self.profiles = list(profiles)
+        self.browsers = browsers or Config.FOOTPRINT_BROWSERS
+        self.url = url
+        self.settle_time = Config.FOOTPRINT_SETTLE_TIME if settle_time is None else settle_time
+
+    @staticmethod
+    def _launch():
+        """Starts one browser; returns (driver, startup_ms, pids of the processes chromedriver started for it)."""
+        service_pid = DriverManager._get_service().process.pid
+        before = {pid for pid, parent in _parent_pids().items() if parent == service_pid}
+        start = time.perf_counter()
+        driver = DriverManager.create_driver()
+        startup_ms = (time.perf_counter() - start) * 1000
+        roots = [pid for pid, parent in _parent_pids().items() if parent == service_pid and pid not in before]
+        return driver, startup_ms, roots
+
+    def measure(self, launch_profile, url):
+        """Returns the metrics of one launch profile (see the class docstring)."""
+        original_profile = Config.BROWSER_LAUNCH_PROFILE
+        Config.BROWSER_LAUNCH_PROFILE = launch_profile
+        drivers, samples = [], []
+        try:
+            for index in range(self.browsers):
+                driver, startup_ms, roots = self._launch()
+                drivers.append(driver)
+                start = time.perf_counter()
+                driver.get(url)
+                load_ms = (time.perf_counter() - start) * 1000
+                samples.append({"startup_ms": startup_ms, "load_ms": load_ms, "roots": roots})
+                print(f"[{launch_profile}] browser {index + 1}/{self.browsers}: "
+                      f"{startup_ms:.0f} ms startup, {load_ms:.0f} ms load")
+            time.sleep(self.settle_time)
+            parents = _parent_pids()
+            for sample in samples:
+                sample.update(process_tree_memory(sample.pop("roots"), parents))
+        finally:
+            Config.BROWSER_LAUNCH_PROFILE = original_profile
+            for driver in drivers:
+                DriverManager._quit(driver)
+
+        results = {metric: _stats([sample[metric] for sample in samples]) for metric in _METRICS}
+        results["browsers"] = len(samples)
+        results["total_rss_mb"] = round(sum(sample["rss_mb"] for sample in samples), 1)
+        pss_values = [sample["pss_mb"] for sample in samples if sample["pss_mb"] is not None]
+        results["total_pss_mb"] = round(sum(pss_values), 1) if pss_values else None
+        return results
+
+    def run(self):
+        """Returns {launch profile: metrics}, plus "lean_vs_default" when both were measured."""
+        if not os.path.isdir("/proc/self"):
+            print("No /proc on this system: only startup and load times are measured.")
+        server = None
+        url = self.url
+        original_base_url = Config.THE_INTERNET_BASE_URL
+        results = {}
+        try:
+            if url is None:
+                server = LocalTestServer()
+                Config.use_the_internet_base_url(server.start())
+                url = Config.DRAG_AND_DROP_URL
+            for launch_profile in self.profiles:
+                try:
+                    results[launch_profile] = self.measure(launch_profile, url)
+                except Exception as e:
+                    print(f"[{launch_profile}] FAILED: {e}")
+                    results[launch_profile] = {"error": f"{e.__class__.__name__}: {e}"}
+        finally:
+            DriverManager.shutdown()
+            Config.use_the_internet_base_url(original_base_url)
+            if server is not None:
+                server.stop()
+        comparison = self.compare(results.get("default"), results.get("lean"))
+        if comparison:
+            results["lean_vs_default"] = comparison
+        return results
+
+    @staticmethod
+    def compare(default, lean):
+        """Percent change of each median (and total) from the default profile to the lean one."""
+        if not default or not lean or "error" in default or "error" in lean:
+            return None
+        comparison = {}
+        for metric in _METRICS:
+            if default[metric] and lean[metric] and default[metric]["median"]:
+                comparison[metric] = round((lean[metric]["median"] / default[metric]["median"] - 1) * 100, 1)
+        for metric in ("total_rss_mb", "total_pss_mb"):
+            if default[metric] and lean[metric]:
+                comparison[metric] = round((lean[metric] / default[metric] - 1) * 100, 1)
+        return comparison
+
+    @staticmethod
+    def write_results(results, file_path=None):
+        file_path = file_path or os.path.join(Config.REPORTS_DIR, "browser_footprint.json")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+        print(f"Browser footprint results written to: {file_path}")
+        return file_path
+
+
+def print_results(results):
+    def column(metrics, metric, unit):
+        value = metrics.get(metric)
+        return f"{value['median']:.0f}/{value['p95']:.0f}{unit}" if value else "-"
+
+    print(f"\n{'profile':>8} {'startup (med/p95)':>18} {'load (med/p95)':>16} {'RSS MB (med/p95)':>17} "
+          f"{'PSS MB (med/p95)':>17} {'procs':>6} {'total PSS MB':>13}")
+    for launch_profile, metrics in results.items():
+        if launch_profile == "lean_vs_default":
+            continue
+        if "error" in metrics:
+            print(f"{launch_profile:>8}  {metrics['error']}")
+            continue
+        print(f"{launch_profile:>8} {column(metrics, 'startup_ms', ' ms'):>18} {column(metrics, 'load_ms', ' ms'):>16} "
+              f"{column(metrics, 'rss_mb', ''):>17} {column(metrics, 'pss_mb', ''):>17} "
+              f"{column(metrics, 'processes', ''):>6} {metrics['total_pss_mb'] or '-':>13}")
+    comparison = results.get("lean_vs_default")
+    if comparison:
+        print("lean vs default: " + ", ".join(f"{metric} {change:+.1f}%" for metric, change in comparison.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-browser memory (RSS/PSS) and startup time of the "
+                                                 "default and lean Chrome launch profiles.")
+    parser.add_argument("--profiles", default="default,lean",
+                        help="Comma-separated launch profiles to measure (default: default,lean).")
+    parser.add_argument("-n", "--browsers", type=int, default=None,
+                        help="Browsers open at the same time per profile (default: Config.FOOTPRINT_BROWSERS).")
+    parser.add_argument("--url", default=None,
+                        help="Page every browser loads (default: the local server's drag-and-drop page).")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: reports/browser_footprint.json).")
+    args = parser.parse_args(argv)
+
+    footprint = BrowserFootprint(profiles=args.profiles.split(","), browsers=args.browsers, url=args.url)
+    results = footprint.run()
+    print_results(results)
+    footprint.write_results(results, args.output)
+    return 1 if any("error" in metrics for metrics in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
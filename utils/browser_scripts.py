@@ -0,0 +1,192 @@
+"""
+JavaScript snippets shared by BasePage methods that do their work inside the browser
+in a single execute_script call instead of one WebDriver command per element.
+"""
+
+# Resolves a selenium locator ('css selector', 'xpath', 'id', ...) to the first matching
+# element in the current document/frame, and approximates WebElement.is_displayed().
+LOCATOR_HELPERS_JS = """
+function __aubergineFind(by, value) {
+  switch (by) {
+    case 'css selector': return document.querySelector(value);
+    case 'xpath':
+      return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case 'id': return document.getElementById(value);
+    case 'name': return document.querySelector('[name="' + CSS.escape(value) + '"]');
+    case 'class name': return document.querySelector('.' + CSS.escape(value));
+    case 'tag name': return document.querySelector(value);
+    case 'link text':
+    case 'partial link text':
+      var links = document.getElementsByTagName('a');
+      for (var i = 0; i < links.length; i++) {
+        var text = (links[i].innerText || '').trim();
+        if (by === 'link text' ? text === value : text.indexOf(value) !== -1) { return links[i]; }
+      }
+      return null;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+function __aubergineIsDisplayed(el) {
+  if (el.checkVisibility) {
+    return el.checkVisibility({opacityProperty: true, visibilityProperty: true});
+  }
+  var style = window.getComputedStyle(el);
+  return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) &&
+    style.visibility !== 'hidden' && style.opacity !== '0';
+}
+"""
+
+# arguments[0]: list of {name, by, value}; arguments[1]: list of attribute/property names.
+# Returns {name: {present, displayed, text, attributes, rect}} for every requested element.
+READ_ELEMENTS_JS = LOCATOR_HELPERS_JS + """
+var specs = arguments[0], attributeNames = arguments[1], result = {};
+for (var i = 0; i < specs.length; i++) {
+  var spec = specs[i], el = __aubergineFind(spec.by, spec.value);
+  if (!el) { result[spec.name] = {present: false, displayed: false}; continue; }
+  var attributes = {};
+  for (var j = 0; j < attributeNames.length; j++) {
+    var name = attributeNames[j], prop = el[name];
+    // Like WebElement.get_attribute: prefer the (resolved) property, fall back to the attribute
+    attributes[name] = (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function')
+      ? prop : el.getAttribute(name);
+  }
+  var rect = el.getBoundingClientRect();
+  result[spec.name] = {
+    present: true,
+    displayed: __aubergineIsDisplayed(el),
+    text: (el.innerText || el.textContent || '').trim(),
+    attributes: attributes,
+    rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+  };
+}
+return result;
+"""
+
+# Async script. arguments: list of {name, by, value}, condition ('present', 'displayed' or 'clickable'),
+# timeout in ms, poll interval in ms. Polls inside the browser until one of the locators matches and
+# returns {name, element} for the first match (in list order), or null when the timeout expires.
+# An invalid selector is reported as {name, error}.
+WAIT_FOR_ANY_JS = LOCATOR_HELPERS_JS + """
+var specs = arguments[0], condition = arguments[1], timeoutMs = arguments[2], pollMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+function matches(el) {
+  if (!el) { return false; }
+  if (condition === 'present') { return true; }
+  if (!__aubergineIsDisplayed(el)) { return false; }
+  return condition === 'displayed' || !el.disabled;
+}
+(function poll() {
+  for (var i = 0; i < specs.length; i++) {
+    var el;
+    try { el = __aubergineFind(specs[i].by, specs[i].value); }
+    catch (e) { done({name: specs[i].name, error: e.message}); return; }
+    if (matches(el)) { done({name: specs[i].name, element: el}); return; }
+  }
+  if (Date.now() >= deadline) { done(null); return; }
+  setTimeout(poll, pollMs);
+})();
+"""
+
+
+def locator_specs(named_locators):
+    """Turns {name: (By.X, value)} into the JSON-friendly list the scripts above expect."""
+    return [{"name": name, "by": locator[0], "value": locator[1]} for name, locator in named_locators.items()]
+
+# arguments: source {by, value}; target {by, value} or null; offset [x, y] in px or null; list of
+# {name, by, value} expected in this document order after the drop, or null.
+# Fires the HTML5 drag sequence (dragstart, drag, dragenter, dragover, drop/dragleave, dragend) with
+# one shared DataTransfer. The drop point is the target's centre, moved by offset; without a target,
+# the source's centre moved by offset, and the element there receives the drop. As in a real drag,
+# drop only fires if a dragover handler called preventDefault().
+# Returns {dropped, target, order_ok} (order_ok null when no order was given) or {error}.
+HTML5_DRAG_AND_DROP_JS = LOCATOR_HELPERS_JS + """
+var sourceSpec = arguments[0], targetSpec = arguments[1], offset = arguments[2], order = arguments[3];
+var source = __aubergineFind(sourceSpec.by, sourceSpec.value);
+if (!source) { return {error: 'Drag source not found: ' + sourceSpec.value}; }
+source.scrollIntoView({block: 'center', inline: 'center'});
+var origin = targetSpec ? __aubergineFind(targetSpec.by, targetSpec.value) : source;
+if (!origin) { return {error: 'Drop target not found: ' + targetSpec.value}; }
+function centre(el) {
+  var rect = el.getBoundingClientRect();
+  return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+}
+var from = centre(source), to = centre(origin);
+if (offset) { to = [to[0] + offset[0], to[1] + offset[1]]; }
+var target = (targetSpec && !offset) ? origin : document.elementFromPoint(to[0], to[1]);
+if (!target) { return {error: 'No element at drop point (' + to[0] + ', ' + to[1] + ')'}; }
+var data = new DataTransfer();
+function fire(el, type, point) {
+  // dispatchEvent returns false when a handler called preventDefault()
+  return el.dispatchEvent(new DragEvent(type, {bubbles: true, cancelable: true, composed: true,
+    clientX: point[0], clientY: point[1], dataTransfer: data}));
+}
+if (!fire(source, 'dragstart', from)) { return {dropped: false, target: null, order_ok: null}; }
+fire(source, 'drag', from);
+fire(target, 'dragenter', to);
+var accepted = !fire(target, 'dragover', to);
+fire(target, accepted ? 'drop' : 'dragleave', to);
+fire(source, 'dragend', to);
+var result = {dropped: accepted, target: target.id || target.tagName.toLowerCase(), order_ok: null};
+if (order) {
+  var previous = null;
+  result.order_ok = true;
+  for (var i = 0; i < order.length; i++) {
+    var el = __aubergineFind(order[i].by, order[i].value);
+    if (!el || (previous && !(previous.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING))) {
+      result.order_ok = false;
+      break;
+    }
+    previous = el;
+  }
+}
+return result;
+"""
+
+# Async script. arguments: list of {name, by, value}, condition ('present', 'displayed', 'clickable', 'text'
+# or 'invisible'), the text for 'text', timeout in ms, fallback re-check interval in ms.
+# Checks once, then again on every DOM mutation and on transition/animation end, load, scroll and resize
+# (visibility can change without a mutation), plus every fallback interval for style changes nothing
+# announces. Returns {name, element} for the first spec that holds (element null for 'invisible'),
+# {name, error} for an invalid selector, or null once the timeout expires.
+OBSERVE_CONDITION_JS = LOCATOR_HELPERS_JS + """
+var specs = arguments[0], condition = arguments[1], text = arguments[2];
+var timeoutMs = arguments[3], fallbackMs = arguments[4];
+var done = arguments[arguments.length - 1];
+var events = ['transitionend', 'animationend', 'load', 'scroll', 'resize'];
+var finished = false, observer = null, fallback = null, timeout = null;
+function holds(el) {
+  if (condition === 'present') { return !!el; }
+  if (condition === 'invisible') { return !el || !__aubergineIsDisplayed(el); }
+  if (condition === 'text') { return !!el && (el.innerText || el.textContent || '').indexOf(text) !== -1; }
+  if (!el || !__aubergineIsDisplayed(el)) { return false; }
+  return condition === 'displayed' || !el.disabled;
+}
+function finish(result) {
+  if (finished) { return; }
+  finished = true;
+  if (observer) { observer.disconnect(); }
+  clearInterval(fallback);
+  clearTimeout(timeout);
+  for (var i = 0; i < events.length; i++) { window.removeEventListener(events[i], check, true); }
+  done(result);
+}
+function check() {
+  if (finished) { return; }
+  for (var i = 0; i < specs.length; i++) {
+    var el;
+    try { el = __aubergineFind(specs[i].by, specs[i].value); }
+    catch (e) { finish({name: specs[i].name, error: e.message}); return; }
+    if (holds(el)) { finish({name: specs[i].name, element: condition === 'invisible' ? null : el}); return; }
+  }
+}
+check();
+if (!finished) {
+  // Mutation callbacks are batched, so a burst of DOM changes costs one check
+  observer = new MutationObserver(check);
+  observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+  for (var i = 0; i < events.length; i++) { window.addEventListener(events[i], check, true); }
+  fallback = setInterval(check, fallbackMs);
+  timeout = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
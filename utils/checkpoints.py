@@ -0,0 +1,241 @@
+import functools
+import hashlib
+import json
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import Config
+from utils import readiness
+from utils.driver_manager import DriverManager
+from utils.event_log import EventLog
+from utils.file_names import slug
+
+# Everything the page can tell us in one round trip
+_STORAGE_STATE_JS = """
+function dump(storage) {
+  var items = {};
+  for (var i = 0; i < storage.length; i++) { var key = storage.key(i); items[key] = storage.getItem(key); }
+  return items;
+}
+try {
+  return {origin: window.location.origin, url: window.location.href,
+          local: dump(window.localStorage), session: dump(window.sessionStorage)};
+} catch (e) {
+  return {origin: window.location.origin, url: window.location.href, local: {}, session: {}};
+}
+"""
+
+# Runs at the start of every new document (all frames) while a checkpoint is being restored,
+# so the page sees its saved storage from its very first script on.
+_SEED_STORAGE_JS = """
+(function (storage) {
+  var saved = storage[window.location.origin];
+  if (!saved) { return; }
+  try {
+    Object.keys(saved.local).forEach(function (key) { window.localStorage.setItem(key, saved.local[key]); });
+    Object.keys(saved.session).forEach(function (key) { window.sessionStorage.setItem(key, saved.session[key]); });
+  } catch (e) {}
+})(%s);
+"""
+
+
+def _arguments_hash(args, kwargs):
+    """
+    Identifies the arguments a step was called with, so a rerun with different ones (e.g. another
+    date) runs the step instead of skipping it. Arguments without a stable repr never match.
+    """
+    encoded = json.dumps([args, kwargs], default=repr, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Step-level checkpoints for long scenarios.
+
+    After a @checkpoint step succeeds, the browser state is saved for the current test: URL, cookies
+    (all domains), localStorage/sessionStorage of the top-level document and the current frame, the
+    frame path and the frame's own URL, plus the step's (JSON) return value. While a test fails, its
+    checkpoints are kept in Config.CHECKPOINTS_DIR; a passing test deletes them.
+
+    When the test is run again with resume enabled (pytest --resume-from-checkpoint), the steps that
+    already succeeded are skipped: at the last of them the saved state is restored, and the test
+    continues from the step after it. A step matches its checkpoint by name and arguments; if the
+    sequence stops matching partway, the last skipped step's state is restored before the rest of
+    the test runs normally. State that only lives in page memory (and not in the URL, cookies or
+    storage) cannot be restored, so only checkpoint steps whose outcome is reflected there.
+    """
+    _test_name = None
+    _saved = []      # Checkpoints of the previous (failed) run, in step order
+    _recorded = []   # Checkpoints of this run
+    _depth = 0       # Checkpoint steps currently running (only the outermost one is checkpointed)
+    _unrestored = None  # Last skipped checkpoint whose state has not been restored yet
+
+    @classmethod
+    def path(cls, test_name):
+        return os.path.join(Config.CHECKPOINTS_DIR, slug(test_name.replace("::", "__"), 150) + ".json")
+
+    @classmethod
+    def start_test(cls, test_name, resume=False):
+        cls._test_name = test_name
+        cls._recorded = []
+        cls._depth = 0
+        cls._saved = []
+        cls._unrestored = None
+        if not resume:
+            return
+        try:
+            with open(cls.path(test_name)) as checkpoint_file:
+                data = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return
+        if time.time() - data.get("saved_at", 0) > Config.CHECKPOINT_MAX_AGE:
+            EventLog.warning("checkpoint", "Ignoring checkpoints older than %s seconds for %s.", Config.CHECKPOINT_MAX_AGE, test_name)
+            return
+        cls._saved = data["checkpoints"]
+        if cls._saved:
+            EventLog.warning("checkpoint", "Resuming %s after step %s (%d checkpointed step(s) will be skipped).",
+                             test_name, cls._saved[-1]["step"], len(cls._saved))
+
+    @classmethod
+    def finish_test(cls, passed):
+        """Deletes the test's checkpoints once it passes; keeps them for a resume otherwise."""
+        if passed and os.path.exists(cls.path(cls._test_name)):
+            os.remove(cls.path(cls._test_name))
+        cls._test_name = None
+
+    @classmethod
+    def _save(cls):
+        os.makedirs(Config.CHECKPOINTS_DIR, exist_ok=True)
+        with open(cls.path(cls._test_name), "w") as checkpoint_file:
+            json.dump({"test": cls._test_name, "saved_at": time.time(), "checkpoints": cls._recorded},
+                      checkpoint_file, indent=1)
+
+    @classmethod
+    def next_saved(cls, step, arguments):
+        """
+        Returns the saved checkpoint for this step if the previous run got past it with the same
+        arguments, else None. A step sequence that differs from the saved one ends the resume.
+        """
+        position = len(cls._recorded)
+        if (position < len(cls._saved) and cls._saved[position]["step"] == step
+                and cls._saved[position].get("arguments") == arguments):
+            return cls._saved[position]
+        if cls._saved:
+            EventLog.warning("checkpoint", "Step %s does not match the saved checkpoints; running the rest of the test normally.", step)
+            cls._saved = []
+        return None
+
+    @classmethod
+    def capture(cls, page, step, arguments, result):
+        """Saves the browser state after a successful step."""
+        driver = page.driver
+        storage = {}
+        frame_url = None
+        if page.frame_path:
+            frame_state = driver.execute_script(_STORAGE_STATE_JS)
+            frame_url = frame_state["url"]
+            storage[frame_state["origin"]] = {"local": frame_state["local"], "session": frame_state["session"]}
+            driver.switch_to.default_content()
+        top_state = driver.execute_script(_STORAGE_STATE_JS)
+        storage[top_state["origin"]] = {"local": top_state["local"], "session": top_state["session"]}
+        if page.frame_path:
+            # Back into the frame the step left us in
+            for locator in page.frame_path:
+                driver.switch_to.frame(driver.find_element(*locator))
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except WebDriverException:
+            cookies = driver.get_cookies()  # Current domain only
+        try:
+            json.dumps(result)
+        except TypeError:
+            EventLog.warning("checkpoint", "Return value of %s is not JSON serializable; a resumed run gets None instead.", step)
+            result = None
+
+        cls._recorded.append({
+            "step": step, "arguments": arguments, "url": top_state["url"], "frame_path": [list(locator) for locator in page.frame_path],
+            "frame_url": frame_url, "cookies": cookies, "storage": storage, "result": result,
+        })
+        cls._save()
+
+    @classmethod
+    def restore(cls, page, checkpoint):
+        """Brings the browser back to a checkpoint's state: cookies and storage first, then URL and frames."""
+        driver = page.driver
+        script_id = None
+        try:
+            DriverManager.set_cookies(driver, checkpoint["cookies"])
+            script_id = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": _SEED_STORAGE_JS % json.dumps(checkpoint["storage"])})["identifier"]
+        except WebDriverException as e:
+            EventLog.warning("checkpoint", "Could not restore cookies/storage through DevTools (%s); restoring the URL only.", e.__class__.__name__)
+
+        try:
+            page.go_to_url(checkpoint["url"])
+            for locator in checkpoint["frame_path"]:
+                page.switch_to_frame(tuple(locator))
+            frame_url = checkpoint["frame_url"]
+            if frame_url and page.execute_script("return window.location.href;") != frame_url:
+                page.execute_script("window.location.replace(arguments[0]);", frame_url)
+                page.wait_until_ready(
+                    lambda d: d.execute_script("return window.location.href;") == frame_url,
+                    readiness.document_interactive())
+        finally:
+            if script_id is not None:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+        EventLog.info("checkpoint", "Restored checkpoint after step %s: %s", checkpoint["step"], checkpoint["url"])
+
+    @classmethod
+    def skip(cls, checkpoint, restored):
+        """Marks a saved step as done in this run (its checkpoint carries over)."""
+        cls._recorded.append(checkpoint)
+        cls._unrestored = None if restored else checkpoint
+        if len(cls._recorded) == len(cls._saved):
+            cls._saved = []  # Resume complete: the following steps run normally
+            cls._save()
+
+    @classmethod
+    def restore_skipped(cls, page):
+        """
+        Restores the last skipped step's state if the resume ended before reaching the step that
+        would have restored it, so the step about to run starts where the skipped ones left off.
+        """
+        if cls._unrestored is not None:
+            checkpoint, cls._unrestored = cls._unrestored, None
+            cls.restore(page, checkpoint)
+
+
+def checkpoint(func):
+    """
+    Decorator for page-object steps: saves a checkpoint after the step succeeds, and skips the step
+    when resuming a test whose previous run already got past it (see CheckpointStore).
+    Nested checkpoint steps are part of the outermost one.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not Config.CHECKPOINTS_ENABLED or CheckpointStore._test_name is None or CheckpointStore._depth:
+            return func(self, *args, **kwargs)
+
+        step = f"{type(self).__name__}.{func.__name__}"
+        arguments = _arguments_hash(args, kwargs)
+        saved = CheckpointStore.next_saved(step, arguments)
+        if saved is not None:
+            last = len(CheckpointStore._recorded) == len(CheckpointStore._saved) - 1
+            if last:
+                CheckpointStore.restore(self, saved)  # The last good checkpoint
+            else:
+                EventLog.info("checkpoint", "Skipping step %s (checkpointed).", step)
+            CheckpointStore.skip(saved, restored=last)
+            return saved["result"]
+
+        CheckpointStore.restore_skipped(self)
+        CheckpointStore._depth += 1
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            CheckpointStore._depth -= 1
+        CheckpointStore.capture(self, step, arguments, result)
+        return result
+    return wrapper
@@ -0,0 +1,319 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+
+# Allow running this file directly (python utils/consistency_check.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+from utils.event_log import EventLog
+
+# Optional: real CSS/XPath parsers. Without them only the basic structure of selectors is checked.
+try:
+    import cssselect
+except ImportError:
+    cssselect = None
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+# Which real parsers checked the cached facts; installing or removing one re-parses every file
+_PARSERS = [name for name, module in (("cssselect", cssselect), ("lxml", etree)) if module is not None]
+
+# Bump when the facts extracted from a file change shape, so cached entries are re-parsed
+_CACHE_VERSION = 1
+
+# selenium.webdriver.common.by.By attribute -> strategy
+_BY_STRATEGIES = {
+    "ID": "id", "NAME": "name", "XPATH": "xpath", "CSS_SELECTOR": "css selector", "CLASS_NAME": "class name",
+    "TAG_NAME": "tag name", "LINK_TEXT": "link text", "PARTIAL_LINK_TEXT": "partial link text",
+}
+# str.format placeholders in locator templates, e.g. "...normalize-space(text())='{}']"
+_PLACEHOLDER = re.compile(r"\{[^{}]*\}")
+
+
+def _balanced(selector):
+    """Structural check used when no real parser is installed: quotes closed, brackets nested properly."""
+    closing = {"(": ")", "[": "]"}
+    stack = []
+    quote = None
+    for character in selector:
+        if quote:
+            if character == quote:
+                quote = None
+        elif character in "'\"":
+            quote = character
+        elif character in closing:
+            stack.append(closing[character])
+        elif character in ")]":
+            if not stack or stack.pop() != character:
+                return f"unexpected '{character}'"
+    if quote:
+        return f"unterminated {quote} string"
+    if stack:
+        return f"missing '{stack[-1]}'"
+    return None
+
+
+def check_selector(strategy, selector):
+    """Returns why a locator's selector is invalid, or None. Template placeholders count as a value."""
+    selector = _PLACEHOLDER.sub("1", selector)
+    if not selector.strip():
+        return "empty selector"
+    if strategy == "css selector":
+        if cssselect is not None:
+            try:
+                cssselect.parse(selector)
+            except cssselect.SelectorError as e:
+                return f"invalid CSS selector: {e}"
+            return None
+        return _balanced(selector)
+    if strategy == "xpath":
+        if etree is not None:
+            try:
+                etree.XPath(selector)
+            except etree.XPathSyntaxError as e:
+                return f"invalid XPath: {e}"
+            return None
+        return _balanced(selector)
+    if strategy == "class name" and len(selector.split()) > 1:
+        return "compound class names are not supported by By.CLASS_NAME; use a CSS selector"
+    return None
+
+
+class _FileVisitor(ast.NodeVisitor):
+    """Collects the classes, their members, locator/member references and selectors of one file."""
+
+    def __init__(self):
+        self.classes = {}  # name -> {"bases", "members", "locators_class", "line"}
+        self.references = []  # [kind, owner, name, line]
+        self.selector_errors = []  # [line, message]
+        self._class = None
+        self._variables = [{}]  # Per function scope: variable -> page class it was created from
+
+    def visit_ClassDef(self, node):
+        outer, self._class = self._class, node.name
+        members = set()
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                members.add(statement.name)
+            elif isinstance(statement, ast.Assign):
+                members.update(target.id for target in statement.targets if isinstance(target, ast.Name))
+            elif isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+                members.add(statement.target.id)
+        self.classes[node.name] = {
+            "bases": [base.id for base in node.bases if isinstance(base, ast.Name)]
+                     + ["?" for base in node.bases if not isinstance(base, ast.Name)],
+            "members": sorted(members), "locators_class": None, "line": node.lineno,
+        }
+        self.generic_visit(node)
+        self.classes[node.name]["members"] = sorted(set(self.classes[node.name]["members"]))
+        self._class = outer
+
+    def visit_FunctionDef(self, node):
+        self._variables.append({})
+        self.generic_visit(node)
+        self._variables.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Assign(self, node):
+        # page = TockifyPage(driver)
+        if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self._variables[-1][target.id] = node.value.func.id
+        # self.locators = TockifyLocators
+        if self._class:
+            for target in node.targets:
+                if self._is_self_attribute(target) and isinstance(node.value, ast.Name) and target.attr == "locators":
+                    self.classes[self._class]["locators_class"] = node.value.id
+        self.generic_visit(node)
+
+    @staticmethod
+    def _is_self_attribute(node):
+        return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+
+    def visit_Attribute(self, node):
+        value = node.value
+        if self._class and self._is_self_attribute(node):
+            if isinstance(node.ctx, ast.Store):
+                self.classes[self._class]["members"].append(node.attr)
+            else:
+                self.references.append(["member", self._class, node.attr, node.lineno])
+        elif self._class and self._is_self_attribute(value) and value.attr == "locators":
+            # self.locators.NAME
+            self.references.append(["locator", self._class, node.attr, node.lineno])
+        elif isinstance(value, ast.Name):
+            page_class = self._variables[-1].get(value.id)
+            if page_class:
+                # page.method / page.ATTRIBUTE on a variable created from a page class
+                self.references.append(["member", page_class, node.attr, node.lineno])
+            elif value.id[:1].isupper() and isinstance(node.ctx, ast.Load) and value.id != "By":
+                # TockifyLocators.NAME / Config.NAME: only checked if the class is one of ours
+                self.references.append(["class_attribute", value.id, node.attr, node.lineno])
+        elif isinstance(value, ast.Attribute) and value.attr == "locators" and isinstance(value.value, ast.Name):
+            # page.locators.NAME
+            page_class = self._variables[-1].get(value.value.id)
+            if page_class:
+                self.references.append(["locator", page_class, node.attr, node.lineno])
+        self.generic_visit(node)
+
+    def visit_Tuple(self, node):
+        # (By.CSS_SELECTOR, "...") anywhere: locator classes, page objects, tests
+        if (len(node.elts) == 2 and isinstance(node.elts[0], ast.Attribute)
+                and isinstance(node.elts[0].value, ast.Name) and node.elts[0].value.id == "By"
+                and isinstance(node.elts[1], ast.Constant) and isinstance(node.elts[1].value, str)):
+            strategy = _BY_STRATEGIES.get(node.elts[0].attr)
+            if strategy is None:
+                self.selector_errors.append([node.lineno, f"unknown locator strategy By.{node.elts[0].attr}"])
+            else:
+                error = check_selector(strategy, node.elts[1].value)
+                if error:
+                    self.selector_errors.append([node.lineno, f"{error} in ({strategy!r}, {node.elts[1].value!r})"])
+        self.generic_visit(node)
+
+
+class ConsistencyChecker:
+    """
+    Static check of page objects, locators and tests, run before any browser starts.
+
+    Every locator a page object or test references (self.locators.NAME, page.locators.NAME,
+    XLocators.NAME) must exist in its locator class, every member used on a page object
+    (self.method(), page.method()) must be defined on the class or a base class, and every
+    (By.<strategy>, selector) literal must parse. CSS and XPath are checked with cssselect and
+    lxml when installed, otherwise (with a warning) only for balanced quotes and brackets.
+
+    Per-file results are cached in Config.CONSISTENCY_CACHE_PATH keyed by content hash, so only
+    changed files are parsed again.
+    """
+
+    def __init__(self, root=None, directories=None, cache_path=None):
+        self.root = root or Config.PROJECT_ROOT
+        self.directories = directories or Config.CONSISTENCY_CHECK_DIRS
+        self.cache_path = cache_path or Config.CONSISTENCY_CACHE_PATH
+        self.parsed = 0  # Files parsed (not served from the cache) by the last run()
+
+    def python_files(self):
+        files = []
+        for directory in self.directories:
+            for current, subdirectories, file_names in os.walk(os.path.join(self.root, directory)):
+                subdirectories[:] = [name for name in subdirectories if name != "__pycache__"]
+                files.extend(os.path.relpath(os.path.join(current, name), self.root).replace(os.sep, "/")
+                             for name in file_names if name.endswith(".py"))
+        return sorted(files)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != _CACHE_VERSION or cache.get("parsers") != _PARSERS:
+            return {}
+        return cache.get("files", {})
+
+    @staticmethod
+    def _facts(source, file_path):
+        try:
+            tree = ast.parse(source, filename=file_path)
+        except SyntaxError as e:
+            return {"classes": {}, "references": [], "selector_errors": [[e.lineno or 0, f"syntax error: {e.msg}"]]}
+        visitor = _FileVisitor()
+        visitor.visit(tree)
+        return {"classes": visitor.classes, "references": visitor.references, "selector_errors": visitor.selector_errors}
+
+    def collect(self):
+        """Returns {file: facts}, parsing only the files whose content changed since the cached run."""
+        cache = self._load_cache()
+        facts = {}
+        self.parsed = 0
+        for file_path in self.python_files():
+            with open(os.path.join(self.root, file_path), "rb") as source_file:
+                source = source_file.read()
+            digest = hashlib.sha256(source).hexdigest()
+            entry = cache.get(file_path)
+            if entry is None or entry["hash"] != digest:
+                entry = {"hash": digest, "facts": self._facts(source, file_path)}
+                self.parsed += 1
+            facts[file_path] = entry
+        if self.parsed or set(facts) != set(cache):
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w") as cache_file:
+                json.dump({"version": _CACHE_VERSION, "parsers": _PARSERS, "files": facts}, cache_file)
+        return {file_path: entry["facts"] for file_path, entry in facts.items()}
+
+    def run(self):
+        """Returns the problems found as 'file:line: message' strings (empty when everything resolves)."""
+        missing = sorted({"cssselect", "lxml"} - set(_PARSERS))
+        if missing:
+            EventLog.warning("consistency", "%s not installed: selectors are only checked for balanced quotes and "
+                             "brackets, so malformed CSS/XPath can slip through. Install requirements.txt/requirements.txt.",
+                             " and ".join(missing))
+        facts = self.collect()
+        classes = {}
+        for file_facts in facts.values():
+            classes.update(file_facts["classes"])
+
+        def members_of(class_name):
+            """All members of a class and its bases, or None if a base is not one of our classes."""
+            members = set()
+            pending = [class_name]
+            while pending:
+                info = classes.get(pending.pop())
+                if info is None:
+                    return None
+                members.update(info["members"])
+                pending.extend(base for base in info["bases"] if base != "object")
+            return members
+
+        def locators_class_of(class_name):
+            pending = [class_name]
+            while pending:
+                info = classes.get(pending.pop())
+                if info is None:
+                    return None
+                if info["locators_class"]:
+                    return info["locators_class"]
+                pending.extend(info["bases"])
+            return None
+
+        problems = []
+        for file_path, file_facts in sorted(facts.items()):
+            for line, message in file_facts["selector_errors"]:
+                problems.append(f"{file_path}:{line}: {message}")
+            for kind, owner, name, line in file_facts["references"]:
+                if kind == "locator":
+                    locators_class = locators_class_of(owner)
+                    members = members_of(locators_class) if locators_class else None
+                    if members is not None and name not in members:
+                        problems.append(f"{file_path}:{line}: {locators_class} has no locator {name} (used by {owner})")
+                else:
+                    members = members_of(owner) if owner in classes else None
+                    if members is not None and name not in members:
+                        what = "locator" if owner.endswith("Locators") else "attribute or method"
+                        problems.append(f"{file_path}:{line}: {owner} has no {what} {name}")
+        return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check page objects, locators and tests for unresolved references "
+                                                 "and malformed selectors without starting a browser.")
+    parser.parse_args(argv)
+    checker = ConsistencyChecker()
+    problems = checker.run()
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} problem(s) in {len(checker.python_files())} file(s) ({checker.parsed} parsed, "
+          f"rest cached).")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,71 +1,397 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.file_detector import UselessFileDetector
+from selenium.common.exceptions import WebDriverException
+from concurrent.futures import ThreadPoolExecutor
 from config.config import Config  # Import the Config class from your config.py
+from utils.event_log import EventLog
+from utils.profile_snapshots import ProfileSnapshots
+from utils.window_registry import WindowRegistry
+import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
 
 
 class DriverManager:
-    _driver = None  # A class-level variable to store the single WebDriver instance (singleton pattern)
+    """
+    Single factory for every Chrome WebDriver used by the suite.
+
+    All browsers are sessions on one shared chromedriver service. Browsers are kept warm in a
+    pool for the whole session: release() resets a browser's state cheaply (cookies, storage,
+    extra windows, frames, about:blank) and hands it to the next test, and only recycles it after
+    Config.BROWSER_MAX_USES tests or when it fails a health check.
+
+    Browsers can start from a site's profile snapshot (see utils/profile_snapshots.py); the pool
+    is keyed by profile, so a test only gets a browser cloned from the snapshot it asked for.
+    """
+    _service = None  # The shared chromedriver process
+    _idle = {}  # Profile (None = empty profile) -> warm browsers waiting to be handed out
+    _driver = None  # Driver handed out by the legacy get_driver()/quit_driver() API
+    _lock = threading.RLock()
 
     @classmethod
-    def get_driver(cls):
+    def _driver_path(cls):
+        """Returns the chromedriver path inside the project's 'drivers' folder."""
+        # Determine the correct chromedriver executable name based on OS
+        driver_executable_name = "chromedriver.exe" if os.name == 'nt' else "chromedriver"
+        driver_path = os.path.join(Config.PROJECT_ROOT, "drivers", driver_executable_name)
+        if not os.path.exists(driver_path):
+            raise FileNotFoundError(
+                f"Chromedriver not found at: {driver_path}. "
+                "Please download the compatible ChromeDriver and place it in the 'drivers' folder."
+            )
+        return driver_path
+
+    @classmethod
+    def _get_service(cls):
+        """Starts the shared chromedriver service on first use."""
+        with cls._lock:
+            if cls._service is None:
+                service = Service(executable_path=cls._driver_path())
+                service.start()
+                cls._service = service
+                EventLog.info("driver", "Chromedriver service started at %s", service.service_url)
+            return cls._service
+
+    @classmethod
+    def build_options(cls, user_data_dir=None):
         """
-        Initializes and returns a Chrome WebDriver instance.
-        It uses a singleton pattern, meaning it will create the driver only once.
-        Configures headless mode and suppresses logging based on settings in config.py.
+        Chrome options shared by every browser the suite launches.
+        user_data_dir is a profile directory to start from (e.g. a snapshot clone).
         """
-        if cls._driver is None:
-            options = Options()
+        options = Options()
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
+
+        # Configure headless mode if enabled in config.py
+        if Config.HEADLESS_MODE:
+            options.add_argument("--headless")
+            options.add_argument("--disable-gpu")  # Recommended for headless on some OS
+            options.add_argument("--no-sandbox")  # Necessary for some CI/CD environments
+            options.add_argument("--window-size=1920,1080")  # Set a consistent window size for headless
+
+        if Config.BROWSER_LAUNCH_PROFILE == "lean":
+            cls._add_lean_options(options)
+        elif Config.BROWSER_LAUNCH_PROFILE != "default":
+            raise ValueError(f"Unknown browser launch profile: {Config.BROWSER_LAUNCH_PROFILE!r} "
+                             f"(expected 'default' or 'lean')")
+
+        # Suppress "DevTools listening on ws://..." and other console logs
+        options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        options.add_argument("--log-level=3")  # Suppress INFO/WARNING logs from ChromeDriver
+
+        # Isolated profile directory (parallel workers, profile snapshot clones; see create_driver)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+
+        # Route traffic through the record/replay proxy, which presents its own certificate for every site
+        if Config.BROWSER_PROXY:
+            options.add_argument(f"--proxy-server={Config.BROWSER_PROXY}")
+            options.add_argument("--ignore-certificate-errors")
+
+        # DevTools network events: the origins reset_state clears storage for, and the resource blocking report
+        logging_prefs = {"performance": "ALL"}
+        # Console messages are saved with failure artifacts
+        if Config.ARTIFACTS_ENABLED:
+            logging_prefs["browser"] = "ALL"
+        options.set_capability("goog:loggingPrefs", logging_prefs)
+        return options
+
+    @staticmethod
+    def _add_lean_options(options):
+        """Adds the "lean" launch profile's switches (Config.LEAN_*) to options."""
+        for argument in Config.LEAN_BROWSER_ARGUMENTS:
+            if argument not in options.arguments:
+                options.add_argument(argument)
+        if Config.LEAN_RENDERER_PROCESS_LIMIT:
+            options.add_argument(f"--renderer-process-limit={Config.LEAN_RENDERER_PROCESS_LIMIT}")
+            options.add_argument("--disable-site-isolation-trials")
+        if Config.LEAN_DISABLE_IMAGES:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
-            # Configure headless mode if enabled in config.py
-            if Config.HEADLESS_MODE:
-                options.add_argument("--headless")
-                options.add_argument("--disable-gpu")  # Recommended for headless on some OS
-                options.add_argument("--no-sandbox")  # Necessary for some CI/CD environments
-                options.add_argument("--window-size=1920,1080")  # Set a consistent window size for headless
+    @classmethod
+    def create_driver(cls, profile=None, user_data_dir=None):
+        """
+        Launches a new Chrome session on the shared chromedriver service.
+        The session talks to chromedriver directly, so quitting it leaves the service running.
+        With a profile, the browser starts from a fresh clone of that site's profile snapshot;
+        in a parallel worker it otherwise gets a new empty directory under Config.worker_profile_dir()
+        (every browser in the pool needs its own: Chrome refuses to share one). Either is deleted
+        again when the browser quits. user_data_dir uses a profile directory as-is.
+        """
+        temp_dir = None
+        start = time.perf_counter()
+        try:
+            if profile is not None:
+                user_data_dir = ProfileSnapshots.clone(profile, parent_dir=Config.worker_profile_dir())
+                temp_dir = os.path.dirname(user_data_dir)
+            elif user_data_dir is None and Config.worker_profile_dir():
+                os.makedirs(Config.worker_profile_dir(), exist_ok=True)
+                user_data_dir = temp_dir = tempfile.mkdtemp(prefix="browser-", dir=Config.worker_profile_dir())
+            service = cls._get_service()
+            driver = webdriver.Remote(command_executor=ChromeRemoteConnection(service.service_url),
+                                      options=cls.build_options(user_data_dir),
+                                      # chromedriver runs locally, so file inputs can take local paths as-is
+                                      file_detector=UselessFileDetector())
+
+            # Set page load timeout (time to wait for page to load)
+            driver.set_page_load_timeout(Config.DEFAULT_WAIT_TIME)
 
-            # Suppress "DevTools listening on ws://..." and other console logs
-            options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            options.add_argument("--log-level=3")  # Suppress INFO/WARNING logs from ChromeDriver
+            # No implicit wait: page objects use explicit waits, and an implicit wait would
+            # add its full duration to every check for an element that is (correctly) absent.
+            driver.implicitly_wait(Config.IMPLICIT_WAIT_TIME)
+
+            # Upper bound for async scripts such as BasePage.wait_for_any's in-browser polling
+            driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
+
+            driver._pool_uses = 0
+            driver._profile = profile
+            driver._temp_profile_dir = temp_dir
+            driver._seen_origins = set()  # Origins documents were loaded from (see read_performance_log)
+            # Cold start of this browser, whenever it happened (warm_up or acquire); hand-outs are ~0 ms
+            driver._startup_ms = (time.perf_counter() - start) * 1000
+            EventLog.info("driver", "WebDriver initialized successfully (profile snapshot: %s).", profile)
+            return driver
+        except Exception as e:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            EventLog.error("driver", "Error initializing WebDriver: %s", e)
+            # Re-raise the exception to propagate the error up the call stack
+            raise e
+
+    @classmethod
+    def warm_up(cls, count=None, profile=None):
+        """Pre-launches browsers (in parallel) so the first tests don't pay for a cold start."""
+        count = Config.BROWSER_POOL_SIZE if count is None else count
+        with cls._lock:
+            missing = count - len(cls._idle.get(profile, ()))
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            drivers = list(executor.map(lambda _: cls.create_driver(profile), range(missing)))
+        with cls._lock:
+            cls._idle.setdefault(profile, []).extend(drivers)
+        EventLog.info("pool", "Browser pool warmed up with %d browser(s).", len(drivers))
+
+    @classmethod
+    def is_healthy(cls, driver):
+        """Cheap liveness check: the browser still answers a script round trip."""
+        try:
+            return driver.execute_script("return 1;") == 1
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def get_log(driver, log_type):
+        """
+        Reads (and empties) one of Chrome's log buffers, e.g. 'browser' or 'performance'.
+        The Remote driver has no get_log() helper, so the command is sent directly.
+        """
+        return driver.execute(Command.GET_LOG, {"type": log_type})["value"]
+
+    @staticmethod
+    def disable_http_cache(driver):
+        """
+        Turns the HTTP cache off in the current tab (a DevTools setting, so needed once per tab),
+        so every request reaches the network, or the proxy.
+        """
+        window = WindowRegistry.for_driver(driver).current
+        disabled_windows = getattr(driver, "_cache_disabled_windows", set())
+        if window in disabled_windows:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        except WebDriverException as e:
+            EventLog.warning("driver", "Could not disable the HTTP cache: %s", e.__class__.__name__)
+            return
+        disabled_windows.add(window)
+        driver._cache_disabled_windows = disabled_windows
 
+    @classmethod
+    def read_performance_log(cls, driver):
+        """
+        Drains the browser's performance log (DevTools events) and returns its entries as parsed
+        messages ({"method", "params"}). The origin of every document and frame loaded is remembered
+        on the driver, so reset_state can clear their storage. Every reader must go through here:
+        the log is emptied by each read. Raises WebDriverException if performance logging is off.
+        """
+        messages = []
+        if getattr(driver, "_seen_origins", None) is None:
+            driver._seen_origins = set()
+        for entry in cls.get_log(driver, "performance"):
             try:
-                # Determine the correct chromedriver executable name based on OS
-                driver_executable_name = "chromedriver.exe" if os.name == 'nt' else "chromedriver"
-                # Construct the absolute path to the chromedriver executable
-                driver_path = os.path.join(Config.PROJECT_ROOT, "drivers", driver_executable_name)
-
-                # Check if the chromedriver exists at the specified path
-                if not os.path.exists(driver_path):
-                    raise FileNotFoundError(
-                        f"Chromedriver not found at: {driver_path}. "
-                        "Please download the compatible ChromeDriver and place it in the 'drivers' folder."
-                    )
-
-                # Initialize the Chrome WebDriver
-                cls._driver = webdriver.Chrome(options=options)
-
-                # Set page load timeout (time to wait for page to load)
-                cls._driver.set_page_load_timeout(Config.DEFAULT_WAIT_TIME)
-
-                # Set implicit wait (time to wait for an element to be present)
-                # While explicit waits are preferred, implicit can be a fallback
-                # for basic element presence checks.
-                cls._driver.implicitly_wait(Config.DEFAULT_WAIT_TIME)
-
-                print("WebDriver initialized successfully.")
-            except Exception as e:
-                print(f"Error initializing WebDriver: {e}")
-                # Re-raise the exception to propagate the error up the call stack
-                raise e
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if message.get("method") == "Network.requestWillBeSent":
+                params = message.get("params", {})
+                if params.get("type") == "Document":
+                    origin = cls._origin(params.get("request", {}).get("url", ""))
+                    if origin:
+                        driver._seen_origins.add(origin)
+            messages.append(message)
+        return messages
+
+    @staticmethod
+    def _origin(url):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc}"
+
+    @staticmethod
+    def set_cookies(driver, cookies):
+        """
+        Sets cookies of any domain at once, as returned by DevTools' Network.getAllCookies
+        (which has read-only fields Network.setCookies rejects).
+        """
+        fields = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+        params = [{key: cookie[key] for key in fields if key in cookie} for cookie in cookies]
+        for cookie in params:
+            if cookie.get("expires", 0) <= 0:
+                cookie.pop("expires", None)  # Session cookie
+        if params:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+
+    @classmethod
+    def acquire(cls, profile=None):
+        """
+        Hands out a warm browser from the pool, or launches a new one if none is idle.
+        profile names a site whose profile snapshot the browser must start from (see ProfileSnapshots.ensure).
+        """
+        driver = None
+        while driver is None:
+            with cls._lock:
+                idle = cls._idle.get(profile)
+                candidate = idle.pop() if idle else None
+            if candidate is None:
+                driver = cls.create_driver(profile)
+            elif cls.is_healthy(candidate):
+                driver = candidate
+            else:
+                EventLog.warning("pool", "Discarding a pooled browser that failed its health check.")
+                cls._quit(candidate)
+        return driver
+
+    @classmethod
+    def reset_state(cls, driver):
+        """
+        Brings a browser back to a clean state without restarting it:
+        one window, top-level frame, no cookies, on about:blank. Local storage, IndexedDB, cache storage
+        and service workers are cleared for every origin the browser loaded a document or frame from
+        since the last reset (other tabs and origins navigated away from included), as seen in the
+        performance log. sessionStorage belongs to a tab: closed tabs take theirs along, and the kept
+        tab's is cleared for its current page.
+        A browser started from a profile snapshot gets the snapshot's cookies (e.g. consent) back;
+        its HTTP cache is kept anyway.
+        """
+        try:
+            cls.read_performance_log(driver)  # Origins loaded since the log was last read
+        except WebDriverException:
+            pass  # Performance logging unavailable: only the current origin is known
+        registry = WindowRegistry.detach(driver)
+        handles = driver.window_handles
+        keep = registry.main_handle if registry and registry.main_handle in handles else handles[0]
+        for handle in handles:
+            if handle != keep:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(keep)
+        driver.switch_to.default_content()
+
+        origin = driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+            "return window.location.origin;")
+        origins = set(getattr(driver, "_seen_origins", ()))
+        if origin and origin != "null":
+            origins.add(origin)
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for seen_origin in sorted(origins):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": seen_origin,
+                    "storageTypes": "local_storage,indexeddb,websql,service_workers,cache_storage,file_systems"})
+            driver._seen_origins = set()
+        except WebDriverException:
+            driver.delete_all_cookies()  # Only clears the current domain, but better than nothing
+        snapshot = ProfileSnapshots.current(driver._profile) if getattr(driver, "_profile", None) else None
+        if snapshot:
+            cls.set_cookies(driver, snapshot["cookies"])
+        driver.get("about:blank")
+
+    @classmethod
+    def release(cls, driver):
+        """
+        Returns a browser to the pool after a test. It is reset and kept warm, or quit if it has
+        served Config.BROWSER_MAX_USES tests, fails to reset, or the pool already has enough idle browsers.
+        """
+        driver._pool_uses = getattr(driver, "_pool_uses", 0) + 1
+        if driver._pool_uses >= Config.BROWSER_MAX_USES:
+            EventLog.info("pool", "Recycling browser after %d uses.", driver._pool_uses)
+            cls._quit(driver)
+            return
+        try:
+            cls.reset_state(driver)
+        except WebDriverException as e:
+            EventLog.warning("pool", "Browser reset failed (%s); recycling it.", e.__class__.__name__)
+            cls._quit(driver)
+            return
+        with cls._lock:
+            idle = cls._idle.setdefault(getattr(driver, "_profile", None), [])
+            if len(idle) < Config.BROWSER_POOL_SIZE:
+                idle.append(driver)
+                return
+        cls._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass  # The browser is already gone
+        temp_dir = getattr(driver, "_temp_profile_dir", None)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @classmethod
+    def shutdown(cls):
+        """Quits every pooled browser and stops the shared chromedriver service."""
+        with cls._lock:
+            idle, cls._idle = cls._idle, {}
+        for drivers in idle.values():
+            for driver in drivers:
+                cls._quit(driver)
+        with cls._lock:
+            if cls._service is not None:
+                cls._service.stop()
+                cls._service = None
+                EventLog.info("pool", "WebDriver pool closed.")
+
+    @classmethod
+    def get_driver(cls):
+        """
+        Returns a single shared WebDriver instance for code outside pytest (singleton pattern).
+        The browser comes from the same pool as the tests' browsers.
+        """
+        if cls._driver is None:
+            cls._driver = cls.acquire()
         return cls._driver
 
     @classmethod
     def quit_driver(cls):
         """
-        Quits the WebDriver instance if it's running.
+        Quits the WebDriver instance returned by get_driver() and stops the shared service.
         Resets the _driver variable to None.
         """
         if cls._driver:
-            cls._driver.quit()
+            cls._quit(cls._driver)
             cls._driver = None
-            print("WebDriver closed.")
\ No newline at end of file
+            cls.shutdown()
+            EventLog.info("driver", "WebDriver closed.")
@@ -0,0 +1,61 @@
+import fnmatch
+import json
+import os
+import statistics
+
+from config.config import Config
+
+
+class DurationHistory:
+    """
+    Local store of how long each test took in recent runs (setup + call + teardown, in seconds).
+
+    Stored in Config.DURATION_HISTORY_PATH as {node id: [seconds, ...]}, keeping the last
+    Config.DURATION_HISTORY_SIZE runs per test. estimate() uses the median of that history, and
+    falls back to Config.DURATION_ESTIMATES for tests that have never run here.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.DURATION_HISTORY_PATH
+        try:
+            with open(self.path) as history_file:
+                self.samples = json.load(history_file)
+        except (OSError, ValueError):
+            self.samples = {}
+
+    def record(self, node_id, seconds):
+        history = self.samples.setdefault(node_id, [])
+        history.append(round(seconds, 3))
+        del history[:-Config.DURATION_HISTORY_SIZE]
+        return self
+
+    def record_many(self, durations):
+        for node_id, seconds in durations.items():
+            self.record(node_id, seconds)
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as history_file:
+            json.dump(self.samples, history_file, indent=1, sort_keys=True)
+        return self.path
+
+    @staticmethod
+    def static_estimate(node_id):
+        """First matching Config.DURATION_ESTIMATES pattern, else Config.DEFAULT_DURATION_ESTIMATE."""
+        for pattern, seconds in Config.DURATION_ESTIMATES.items():
+            if fnmatch.fnmatch(node_id, pattern):
+                return seconds
+        return Config.DEFAULT_DURATION_ESTIMATE
+
+    def estimate(self, node_id):
+        """Expected duration of a test in seconds: median of its history, or the static estimate."""
+        history = self.samples.get(node_id)
+        if history:
+            return statistics.median(history)
+        return self.static_estimate(node_id)
+
+    @staticmethod
+    def worker_durations_path(worker_id):
+        """Where a parallel worker leaves the durations of its tests for the runner to record."""
+        return os.path.join(Config.REPORTS_DIR, f"worker-{worker_id}-durations.json")
@@ -0,0 +1,46 @@
+import threading
+
+
+class ElementCache:
+    """
+    Opt-in cache of resolved WebElements, keyed by (frame path, locator).
+
+    BasePage clears it on navigation, frame switch and tab switch, and drops single entries
+    when WebDriver reports a StaleElementReferenceException. Hit/miss counts are kept per
+    cache instance and summed for the whole session on the class.
+    """
+    _session_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._elements = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _count(self, kind):
+        self.stats[kind] += 1
+        with ElementCache._lock:
+            ElementCache._session_stats[kind] += 1
+
+    def get(self, key):
+        """Returns the cached element for key, or None (counted as a miss)."""
+        element = self._elements.get(key)
+        self._count("hits" if element is not None else "misses")
+        return element
+
+    def put(self, key, element):
+        self._elements[key] = element
+
+    def invalidate(self, key=None):
+        """Drops one entry, or the whole cache when key is None."""
+        if key is None:
+            if self._elements:
+                self._elements.clear()
+                self._count("invalidations")
+        elif self._elements.pop(key, None) is not None:
+            self._count("invalidations")
+
+    @classmethod
+    def session_stats(cls):
+        """Returns the hit/miss/invalidation counts summed over every cache in this process."""
+        with cls._lock:
+            return dict(cls._session_stats)
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from config.config import Config
+from utils.file_names import slug
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_LEVELS = {name: level for level, name in _LEVEL_NAMES.items()}
+
+
+class EventLog:
+    """
+    Structured event log for page objects and the browser infrastructure, replacing print().
+
+    Logging an event costs a level comparison and, if it passes, one append of the raw
+    (time, level, event, template, args, fields) tuple to an in-memory ring buffer of the last
+    Config.EVENT_LOG_BUFFER_SIZE events. Messages are %-formatted only when the buffer is written:
+    as JSON lines to Config.EVENT_LOG_DIR when the test fails, or after every test in verbose mode.
+    Events at Config.EVENT_LOG_ECHO_LEVEL or above are also printed right away.
+
+        EventLog.info("click", "Clicked element: %s", locator)
+    """
+    _min_level = _LEVELS[Config.EVENT_LOG_LEVEL]
+    _echo_level = _LEVELS[Config.EVENT_LOG_ECHO_LEVEL]
+    _buffer = deque(maxlen=Config.EVENT_LOG_BUFFER_SIZE)
+    _test_name = None
+    _written = {}  # test name -> JSON lines file, for the session summary
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, level=None, echo_level=None, buffer_size=None):
+        """Changes the level names/buffer size Config set at import time, e.g. configure(level="DEBUG")."""
+        if level is not None:
+            cls._min_level = _LEVELS[level]
+        if echo_level is not None:
+            cls._echo_level = _LEVELS[echo_level]
+        if buffer_size is not None:
+            cls._buffer = deque(cls._buffer, maxlen=buffer_size)
+
+    @classmethod
+    def is_enabled_for(cls, level):
+        """For callers whose arguments are expensive to compute in the first place."""
+        return level >= cls._min_level
+
+    @classmethod
+    def log(cls, level, event, message, *args, **fields):
+        if level < cls._min_level:
+            return
+        cls._buffer.append((time.time(), level, event, message, args, fields))
+        if level >= cls._echo_level:
+            print(f"[{_LEVEL_NAMES[level]}] {cls._format(message, args)}")
+
+    @classmethod
+    def debug(cls, event, message, *args, **fields):
+        cls.log(DEBUG, event, message, *args, **fields)
+
+    @classmethod
+    def info(cls, event, message, *args, **fields):
+        cls.log(INFO, event, message, *args, **fields)
+
+    @classmethod
+    def warning(cls, event, message, *args, **fields):
+        cls.log(WARNING, event, message, *args, **fields)
+
+    @classmethod
+    def error(cls, event, message, *args, **fields):
+        cls.log(ERROR, event, message, *args, **fields)
+
+    @staticmethod
+    def _format(message, args):
+        try:
+            return message % args if args else message
+        except (TypeError, ValueError):
+            return f"{message} {args!r}"
+
+    @classmethod
+    def start_test(cls, test_name):
+        """
+        Starts a new test. finish_test() empties the buffer, so it holds this test's events plus
+        any logged since the previous test ended (e.g. session fixtures starting the browser pool).
+        """
+        with cls._lock:
+            cls._test_name = test_name
+
+    @classmethod
+    def records(cls):
+        """The buffered events as dicts, formatted now."""
+        with cls._lock:
+            buffered = list(cls._buffer)
+        return [dict({"time": round(timestamp, 3), "level": _LEVEL_NAMES[level], "event": event,
+                      "message": cls._format(message, args)},
+                     **{key: value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+                        for key, value in fields.items()})
+                for timestamp, level, event, message, args, fields in buffered]
+
+    @classmethod
+    def flush(cls, file_path):
+        """Writes the buffered events as JSON lines. Returns the path, or None if there was nothing to write."""
+        records = cls.records()
+        if not records:
+            return None
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as log_file:
+            for record in records:
+                log_file.write(json.dumps(record) + "\n")
+        return file_path
+
+    @classmethod
+    def finish_test(cls, failed, verbose=False):
+        """Writes the test's events to Config.EVENT_LOG_DIR if it failed (or always, when verbose)."""
+        file_path = None
+        if failed or verbose or Config.EVENT_LOG_ALWAYS_FLUSH:
+            file_path = cls.flush(os.path.join(Config.EVENT_LOG_DIR, slug(cls._test_name.replace("::", "__"), 150) + ".jsonl"))
+            if file_path:
+                cls._written[cls._test_name] = file_path
+        with cls._lock:
+            cls._buffer.clear()
+            cls._test_name = None
+        return file_path
+
+    @classmethod
+    def written(cls):
+        """{test name: JSON lines file} for every test whose events were written this session."""
+        return dict(cls._written)
@@ -0,0 +1,6 @@
+import re
+
+
+def slug(text, max_length=80):
+    """Turns a test or step name into a safe file/folder name (at most max_length characters)."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_")[:max_length] or "step"
@@ -0,0 +1,225 @@
+import argparse
+import ast
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+
+# Allow running this file directly (python utils/impact_analysis.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+
+
+class ImportGraph:
+    """
+    Static import graph of the project's Python files (tests → pages → locators/utils → config).
+
+    Imports are read with ast, never by importing the modules. The parsed imports of each file are
+    cached in Config.IMPACT_CACHE_PATH keyed by modification time and size, so only changed files
+    are parsed again.
+    """
+
+    def __init__(self, root=None, cache_path=None):
+        self.root = root or Config.PROJECT_ROOT
+        self.cache_path = cache_path or Config.IMPACT_CACHE_PATH
+        self.dependencies = {}  # file -> set of project files it imports (all paths relative, '/'-separated)
+
+    def python_files(self):
+        files = []
+        for directory, subdirectories, file_names in os.walk(self.root):
+            subdirectories[:] = [name for name in subdirectories
+                                 if not name.startswith(".") and name not in Config.IMPACT_SKIPPED_DIRS]
+            for file_name in file_names:
+                if file_name.endswith(".py"):
+                    files.append(os.path.relpath(os.path.join(directory, file_name), self.root).replace(os.sep, "/"))
+        return sorted(files)
+
+    def _module_candidates(self, file_path, node):
+        """Yields, per import statement target, the dotted module names it may refer to (most specific first)."""
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield [alias.name]
+            return
+        base = node.module or ""
+        if node.level:
+            # Relative import: resolve against the importing file's package
+            directory = os.path.dirname(file_path)
+            package = directory.split("/") if directory else []
+            package = package[:len(package) - (node.level - 1)]
+            base = ".".join(package + ([base] if base else []))
+        for alias in node.names:
+            # 'from utils import readiness' imports a module, 'from pages.x import Page' a name in one
+            yield [f"{base}.{alias.name}" if base else alias.name, base]
+
+    def _resolve(self, module):
+        """Maps a dotted module name to a project file, or None for third-party/stdlib modules."""
+        if not module:
+            return None
+        path = module.replace(".", "/")
+        for candidate in (path + ".py", path + "/__init__.py"):
+            if os.path.exists(os.path.join(self.root, candidate)):
+                return candidate
+        return None
+
+    def _parse(self, file_path):
+        with open(os.path.join(self.root, file_path), "rb") as source_file:
+            tree = ast.parse(source_file.read(), filename=file_path)
+        imports = set()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                for candidates in self._module_candidates(file_path, node):
+                    for module in candidates:
+                        resolved = self._resolve(module)
+                        if resolved:
+                            imports.add(resolved)
+                            break
+        return sorted(imports)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def build(self):
+        """Builds (or refreshes from the cache) the graph and returns self."""
+        cache = self._load_cache()
+        fresh = {}
+        parsed = 0
+        for file_path in self.python_files():
+            stat = os.stat(os.path.join(self.root, file_path))
+            key = [stat.st_mtime_ns, stat.st_size]
+            entry = cache.get(file_path)
+            if entry is None or entry["key"] != key:
+                try:
+                    entry = {"key": key, "imports": self._parse(file_path)}
+                except SyntaxError:
+                    entry = {"key": key, "imports": []}  # pytest will report the broken file itself
+                parsed += 1
+            fresh[file_path] = entry
+            self.dependencies[file_path] = set(entry["imports"])
+        if parsed or set(fresh) != set(cache):
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w") as cache_file:
+                json.dump(fresh, cache_file, indent=1, sort_keys=True)
+        return self
+
+    def transitive_dependencies(self, file_path):
+        seen = set()
+        stack = [file_path]
+        while stack:
+            for dependency in self.dependencies.get(stack.pop(), ()):
+                if dependency not in seen:
+                    seen.add(dependency)
+                    stack.append(dependency)
+        return seen
+
+
+class ImpactAnalysis:
+    """
+    Maps changed files to the test files they can affect.
+
+    A test file is affected when it changed itself, or imports a changed file directly or
+    transitively, or when a conftest.py it is loaded with (or anything that conftest imports)
+    changed. Files matching Config.IMPACT_IGNORED_PATTERNS (docs, IDE settings) affect nothing.
+    Any other non-Python file (test data, requirements, drivers) selects every test, to be safe.
+    """
+
+    def __init__(self, graph=None):
+        self.graph = graph or ImportGraph().build()
+
+    def test_files(self):
+        return [path for path in self.graph.dependencies
+                if fnmatch.fnmatch(os.path.basename(path), "test_*.py")]
+
+    def _conftests_for(self, test_file):
+        """conftest.py files pytest loads for a test file: in its directory and every parent directory."""
+        directory = os.path.dirname(test_file)
+        conftests = []
+        while True:
+            candidate = f"{directory}/conftest.py" if directory else "conftest.py"
+            if candidate in self.graph.dependencies:
+                conftests.append(candidate)
+            if not directory:
+                return conftests
+            directory = os.path.dirname(directory)
+
+    def affected_tests(self, changed_files):
+        """
+        Returns (test files, reasons): the sorted test files to run and, for each,
+        the changed file that selected it. test files is None when every test has to run.
+        """
+        changed = set()
+        for path in changed_files:
+            if any(fnmatch.fnmatch(path, pattern) for pattern in Config.IMPACT_IGNORED_PATTERNS):
+                continue
+            if not path.endswith(".py"):
+                return None, {"*": path}
+            changed.add(path)
+
+        reasons = {}
+        for test_file in self.test_files():
+            roots = [test_file] + self._conftests_for(test_file)
+            for root in roots:
+                touched = ({root} | self.graph.transitive_dependencies(root)) & changed
+                if touched:
+                    reasons[test_file] = sorted(touched)[0]
+                    break
+        return sorted(reasons), reasons
+
+
+def changed_files(base_ref, root=None):
+    """
+    Files changed since the merge base of base_ref and HEAD, including uncommitted
+    and untracked files, as '/'-separated paths relative to the project root.
+    """
+    root = root or Config.PROJECT_ROOT
+
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    merge_base = git("merge-base", base_ref, "HEAD").strip()
+    names = git("diff", "--name-only", merge_base).splitlines()
+    names += git("ls-files", "--others", "--exclude-standard").splitlines()
+    # git prints paths relative to the repository root, which may be above the project root
+    top_level = git("rev-parse", "--show-toplevel").strip()
+    prefix = os.path.relpath(root, top_level).replace(os.sep, "/")
+    if prefix != ".":
+        names = [name[len(prefix) + 1:] for name in names if name.startswith(prefix + "/")]
+    return sorted(set(name for name in names if name))
+
+
+def select_tests(base_ref):
+    """Convenience wrapper: (test files or None for all, reasons, changed files) for changes since base_ref."""
+    changed = changed_files(base_ref)
+    tests, reasons = ImpactAnalysis().affected_tests(changed)
+    return tests, reasons, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the test files affected by changes since a git ref.")
+    parser.add_argument("base", nargs="?", default=Config.IMPACT_BASE_REF,
+                        help="Git ref to compare against (default: Config.IMPACT_BASE_REF).")
+    args = parser.parse_args(argv)
+
+    tests, reasons, changed = select_tests(args.base)
+    print(f"{len(changed)} changed file(s) since {args.base}.")
+    if tests is None:
+        print(f"All tests affected ({reasons['*']} is not a Python file).")
+    elif not tests:
+        print("No tests affected.")
+    for test_file in tests or ():
+        print(f"{test_file}  (via {reasons[test_file]})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import html
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.config import Config
+
+# Markup mirrors https://the-internet.herokuapp.com/upload closely enough for UploadPage/UploadLocators.
+# As on the real page, only Dropzone shows a preview: a file dropped on the drop area, or chosen through
+# the hidden input Dropzone appends to the body (clicking the area opens it). Choosing a file in the
+# form's own #file-upload input shows nothing. (The real Dropzone also uploads the file right away;
+# the stand-in only previews it.)
+UPLOAD_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head><title>The Internet</title>
+<style>
+  #drag-drop-upload { border: 2px dashed #999; min-height: 120px; margin-top: 20px; padding: 10px; }
+</style>
+</head>
+<body>
+<div class="row">
+  <div id="content" class="large-12 columns">
+    <div class="example">
+      <h3>File Uploader</h3>
+      <p>Choose a file on your system and then click upload. Or, drag and drop a file into the area below.</p>
+      <form method="POST" action="/upload" enctype="multipart/form-data">
+        <input id="file-upload" type="file" name="file">
+        <br><input class="button" id="file-submit" type="submit" value="Upload">
+      </form>
+      <div id="drag-drop-upload" class="dropzone panel"></div>
+    </div>
+  </div>
+</div>
+<script>
+  var dropArea = document.getElementById('drag-drop-upload');
+  function showPreview(files) {
+    for (var i = 0; i < files.length; i++) {
+      var preview = document.createElement('div');
+      preview.className = 'dz-preview dz-file-preview';
+      preview.innerHTML = '<div class="dz-details"><div class="dz-filename"><span data-dz-name=""></span></div></div>';
+      preview.querySelector('[data-dz-name]').textContent = files[i].name;
+      dropArea.appendChild(preview);
+    }
+  }
+  var dropzoneInput = document.createElement('input');
+  dropzoneInput.type = 'file';
+  dropzoneInput.multiple = true;
+  dropzoneInput.className = 'dz-hidden-input';
+  dropzoneInput.style.cssText = 'visibility: hidden; position: absolute; top: 0; left: 0; height: 0; width: 0;';
+  document.body.appendChild(dropzoneInput);
+  dropzoneInput.addEventListener('change', function () { showPreview(this.files); });
+  dropArea.addEventListener('click', function () { dropzoneInput.click(); });
+  dropArea.addEventListener('dragover', function (e) { e.preventDefault(); });
+  dropArea.addEventListener('drop', function (e) { e.preventDefault(); showPreview(e.dataTransfer.files); });
+</script>
+</body>
+</html>
+"""
+
+UPLOAD_SUCCESS_HTML = """<!DOCTYPE html>
+<html>
+<head><title>The Internet</title></head>
+<body>
+<div class="row">
+  <div id="content" class="large-12 columns">
+    <div class="example">
+      <h3>File Uploaded!</h3>
+      <div id="uploaded-files" class="panel text-center">{file_names}</div>
+    </div>
+  </div>
+</div>
+</body>
+</html>
+"""
+
+# Same markup and HTML5 drag-and-drop handlers as https://the-internet.herokuapp.com/drag_and_drop
+DRAG_AND_DROP_HTML = """<!DOCTYPE html>
+<html>
+<head><title>The Internet</title>
+<style>
+  .column { height: 150px; width: 150px; float: left; border: 2px solid #666; margin-right: 5px;
+            text-align: center; cursor: move; }
+  .column header { color: #fff; background: #333; padding: 5px; }
+</style>
+</head>
+<body>
+<div class="row">
+  <div id="content" class="large-12 columns">
+    <div class="example">
+      <h3>Drag and Drop</h3>
+      <div id="columns">
+        <div class="column" draggable="true" id="column-a"><header>A</header></div>
+        <div class="column" draggable="true" id="column-b"><header>B</header></div>
+      </div>
+    </div>
+  </div>
+</div>
+<script>
+  var dragSource = null;
+  function handleDragStart(e) {
+    dragSource = this;
+    e.dataTransfer.effectAllowed = 'move';
+    e.dataTransfer.setData('text/html', this.innerHTML);
+  }
+  function handleDragOver(e) {
+    e.preventDefault();
+    e.dataTransfer.dropEffect = 'move';
+    return false;
+  }
+  function handleDrop(e) {
+    e.stopPropagation();
+    e.preventDefault();
+    if (dragSource && dragSource !== this) {
+      dragSource.innerHTML = this.innerHTML;
+      this.innerHTML = e.dataTransfer.getData('text/html');
+    }
+    return false;
+  }
+  var columns = document.querySelectorAll('#columns .column');
+  for (var i = 0; i < columns.length; i++) {
+    columns[i].addEventListener('dragstart', handleDragStart, false);
+    columns[i].addEventListener('dragover', handleDragOver, false);
+    columns[i].addEventListener('drop', handleDrop, false);
+  }
+</script>
+</body>
+</html>
+"""
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _parse_content_disposition(value):
+    """Parses 'form-data; name="file"; filename="a.pdf"' into {'name': 'file', 'filename': 'a.pdf'}."""
+    params = {}
+    for part in value.split(";")[1:]:
+        key, _, raw = part.strip().partition("=")
+        params[key.lower()] = raw.strip().strip('"')
+    return params
+
+
+def read_multipart(stream, content_length, boundary):
+    """
+    Streams a multipart/form-data body from stream without holding it in memory.
+    Returns one dict per part: {"name", "filename", "size"}. File contents are counted and discarded.
+    """
+    delimiter = b"\r\n--" + boundary
+    # Prefix CRLF so the first boundary looks like every other one
+    buffer = b"\r\n"
+    remaining = content_length
+    parts = []
+    state = "boundary"
+    current = None
+
+    def fill():
+        nonlocal buffer, remaining
+        if remaining <= 0:
+            return False
+        chunk = stream.read(min(_READ_CHUNK_SIZE, remaining))
+        if not chunk:
+            remaining = 0
+            return False
+        remaining -= len(chunk)
+        buffer += chunk
+        return True
+
+    while True:
+        if state == "boundary":
+            index = buffer.find(delimiter)
+            if index == -1 or len(buffer) < index + len(delimiter) + 2:
+                if not fill():
+                    break
+                continue
+            marker = buffer[index + len(delimiter):index + len(delimiter) + 2]
+            buffer = buffer[index + len(delimiter) + 2:]
+            if marker == b"--":
+                break  # Closing boundary
+            state = "headers"
+        elif state == "headers":
+            index = buffer.find(b"\r\n\r\n")
+            if index == -1:
+                if not fill():
+                    break
+                continue
+            headers = {}
+            for line in buffer[:index].decode("utf-8", "replace").split("\r\n"):
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            disposition = _parse_content_disposition(headers.get("content-disposition", ""))
+            current = {"name": disposition.get("name"), "filename": disposition.get("filename"), "size": 0}
+            parts.append(current)
+            buffer = buffer[index + 4:]
+            state = "body"
+        else:  # body
+            index = buffer.find(delimiter)
+            if index != -1:
+                current["size"] += index
+                buffer = buffer[index:]
+                state = "boundary"
+                continue
+            # Keep a tail that could be the start of the delimiter, count the rest
+            keep = len(delimiter) - 1
+            if len(buffer) > keep:
+                current["size"] += len(buffer) - keep
+                buffer = buffer[-keep:]
+            if not fill():
+                break
+    # Drain anything after the closing boundary so the keep-alive connection stays usable
+    while remaining > 0 and fill():
+        buffer = b""
+    return parts
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Timings are recorded by LocalTestServer instead of logged per request
+
+    def _send_html(self, body, status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def _handle(self):
+        start = time.perf_counter()
+        path = self.path.split("?")[0].rstrip("/") or "/"
+        bytes_in = int(self.headers.get("Content-Length") or 0)
+
+        if self.command == "GET" and path == "/upload":
+            status, bytes_out = 200, self._send_html(UPLOAD_PAGE_HTML)
+        elif self.command == "GET" and path == "/drag_and_drop":
+            status, bytes_out = 200, self._send_html(DRAG_AND_DROP_HTML)
+        elif self.command == "POST" and path == "/upload":
+            content_type = self.headers.get("Content-Type", "")
+            boundary = content_type.partition("boundary=")[2].strip('"').encode("latin-1")
+            if boundary:
+                parts = read_multipart(self.rfile, bytes_in, boundary)
+            else:
+                self.rfile.read(bytes_in)
+                parts = []
+            files = [part for part in parts if part["filename"]]
+            received = time.perf_counter()
+            # Recorded before responding, so it is visible as soon as the client sees the result page
+            self.server.owner.record_upload({"files": files, "bytes": sum(part["size"] for part in files),
+                                             "receive_ms": (received - start) * 1000})
+            if files:
+                names = ", ".join(html.escape(part["filename"]) for part in files)
+                status, bytes_out = 200, self._send_html(UPLOAD_SUCCESS_HTML.format(file_names=names))
+            else:
+                status, bytes_out = 500, self._send_html("<h1>Internal Server Error</h1>", status=500)
+        else:
+            status, bytes_out = 404, self._send_html("<h1>Not Found</h1>", status=404)
+
+        self.server.owner.record(self.command, path, status, bytes_in, bytes_out,
+                                 (time.perf_counter() - start) * 1000)
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class LocalTestServer:
+    """
+    Hermetic stand-in for the-internet.herokuapp.com's /upload and /drag_and_drop pages.
+    Runs in a background thread and records the server-side timing of every request,
+    so page-object latency can be measured without network noise.
+    """
+
+    def __init__(self, host=None, port=None):
+        self.host = host or Config.LOCAL_SERVER_HOST
+        self.port = Config.LOCAL_SERVER_PORT if port is None else port
+        self.timings = []
+        self.uploads = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self._httpd.server_address[1]}"
+
+    def start(self):
+        """Starts serving in a daemon thread and returns the base URL."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-test-server", daemon=True)
+        self._thread.start()
+        print(f"Local stand-in server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            print("Local stand-in server stopped.")
+
+    def record(self, method, path, status, bytes_in, bytes_out, duration_ms):
+        """Called by the request handler once a response has been sent."""
+        entry = {"method": method, "path": path, "status": status, "bytes_in": bytes_in,
+                 "bytes_out": bytes_out, "duration_ms": round(duration_ms, 3)}
+        with self._lock:
+            self.timings.append(entry)
+
+    def record_upload(self, upload):
+        """Called by the request handler once an upload body has been read: {"files", "bytes", "receive_ms"}."""
+        with self._lock:
+            self.uploads.append(upload)
+
+    def timing_summary(self):
+        """Returns {"GET /upload": {"count", "median_ms", "max_ms"}, ...}."""
+        with self._lock:
+            timings = list(self.timings)
+        grouped = {}
+        for entry in timings:
+            grouped.setdefault(f"{entry['method']} {entry['path']}", []).append(entry["duration_ms"])
+        return {key: {"count": len(values), "median_ms": round(statistics.median(values), 3),
+                      "max_ms": round(max(values), 3)}
+                for key, values in grouped.items()}
+
+    def write_timings(self, file_path):
+        """Writes the raw request timings and the summary as JSON."""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with self._lock:
+            data = {"requests": list(self.timings), "uploads": list(self.uploads)}
+        data["summary"] = self.timing_summary()
+        with open(file_path, "w") as timings_file:
+            json.dump(data, timings_file, indent=2)
+        return file_path
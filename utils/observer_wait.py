@@ -0,0 +1,85 @@
+import functools
+import inspect
+import time
+
+from selenium.common.exceptions import InvalidSelectorException, JavascriptException, TimeoutException
+
+from config.config import Config
+from utils.browser_scripts import OBSERVE_CONDITION_JS, locator_specs
+from utils.step_tracer import TracedWait, _describe_condition, _is_locator
+
+# selenium expected condition -> (in-page condition, name of the closure variable holding the locator)
+_OBSERVABLE_CONDITIONS = {
+    "presence_of_element_located": ("present", "locator"),
+    "visibility_of_element_located": ("displayed", "locator"),
+    "element_to_be_clickable": ("clickable", "mark"),
+    "text_to_be_present_in_element": ("text", "locator"),
+    "invisibility_of_element_located": ("invisible", "locator"),
+}
+
+
+def _observable(method):
+    """
+    Returns (condition, locator, text) when method is one of the expected conditions the in-page
+    observer can evaluate, created from a locator (not a WebElement); None otherwise.
+    """
+    name, _ = _describe_condition(method)
+    if name not in _OBSERVABLE_CONDITIONS:
+        return None
+    condition, locator_variable = _OBSERVABLE_CONDITIONS[name]
+    try:
+        variables = inspect.getclosurevars(method).nonlocals
+    except TypeError:
+        return None
+    locator = variables.get(locator_variable)
+    if not _is_locator(locator):
+        return None
+    return condition, locator, variables.get("text_")
+
+
+class ObserverWait(TracedWait):
+    """
+    TracedWait whose until() runs the common expected conditions (presence, visibility, clickable,
+    text present, invisibility) inside the page: one async script installs a MutationObserver and
+    returns as soon as the condition holds, instead of one WebDriver command per poll interval.
+    Any other condition (and until_not) is polled as usual, so callers keep passing EC conditions.
+    """
+
+    def until(self, method, message=""):
+        observable = _observable(method)
+        if observable is None:
+            return super().until(method, message)
+        name, locator = _describe_condition(method)
+        return self._traced(functools.partial(self._observe, *observable), f"wait.until {name}", locator,
+                            method, message)
+
+    def _observe(self, condition, locator, text, method, message):
+        specs = locator_specs({"0": locator})
+        deadline = time.monotonic() + self._timeout
+        while True:
+            # One script may not outlive the driver's script timeout; longer waits take several
+            remaining_ms = max(0, min(int((deadline - time.monotonic()) * 1000), (Config.SCRIPT_TIMEOUT - 1) * 1000))
+            try:
+                result = self._driver.execute_async_script(OBSERVE_CONDITION_JS, specs, condition, text,
+                                                           remaining_ms, Config.OBSERVER_FALLBACK_POLL_MS)
+            except JavascriptException:
+                # The document was replaced mid-wait (navigation); observe the new one
+                result = None
+                time.sleep(Config.READINESS_POLL_INTERVAL)
+            if result is not None:
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutException(message)
+        if "error" in result:
+            raise InvalidSelectorException(f"Invalid locator {locator}: {result['error']}")
+        # Like the expected conditions: the element, or True for text present / invisibility
+        return result["element"] if condition in ("present", "displayed", "clickable") else True
+
+
+def create_wait(driver, timeout, **kwargs):
+    """Returns the explicit wait for Config.WAIT_BACKEND: an ObserverWait, or a polling TracedWait."""
+    if Config.WAIT_BACKEND == "observer":
+        return ObserverWait(driver, timeout, **kwargs)
+    if Config.WAIT_BACKEND != "poll":
+        raise ValueError(f"Unknown wait backend: {Config.WAIT_BACKEND!r} (expected 'poll' or 'observer')")
+    return TracedWait(driver, timeout, **kwargs)
@@ -0,0 +1,163 @@
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+# Allow running this file directly (python utils/parallel_runner.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+from utils.duration_history import DurationHistory
+
+
+class ParallelRunner:
+    """
+    Runs the scenario suite on a pool of isolated browser workers.
+
+    Each worker is a separate pytest process with its own Chrome instance and its own
+    user-data-dir (see Config.worker_profile_dir). Scenarios are collected once, split
+    into one shard per worker, and the per-worker JUnit reports are merged at the end.
+
+    Shards are balanced on expected durations (see DurationHistory): tests are assigned
+    longest first, each to the worker with the least work so far, so the shards finish close
+    together. The measured durations are recorded afterwards for the next run.
+    """
+
+    def __init__(self, workers=None, pytest_args=None):
+        self.workers = workers or Config.PARALLEL_WORKERS or os.cpu_count() or 1
+        self.pytest_args = list(pytest_args or [])
+        self.reports_dir = Config.REPORTS_DIR
+        self.history = DurationHistory()
+
+    def collect(self):
+        """
+        Collects the test node ids (e.g. 'tests/test_upload_scenario.py::test_scenario_1_file_upload')
+        without starting any browser.
+        """
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", *self.pytest_args],
+            cwd=Config.PROJECT_ROOT, capture_output=True, text=True)
+        node_ids = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+        if not node_ids:
+            raise RuntimeError(f"No tests collected. pytest output:\n{result.stdout}{result.stderr}")
+        return node_ids
+
+    def shard(self, node_ids):
+        """
+        Splits the node ids into one shard per worker with longest-processing-time-first scheduling.
+        Returns the shards; self.expected_shard_seconds holds their expected durations.
+        """
+        worker_count = min(self.workers, len(node_ids))
+        shards = [[] for _ in range(worker_count)]
+        loads = [(0.0, worker_id) for worker_id in range(worker_count)]  # (expected seconds, worker) min-heap
+        estimates = {node_id: self.history.estimate(node_id) for node_id in node_ids}
+        for node_id in sorted(node_ids, key=lambda node_id: estimates[node_id], reverse=True):
+            load, worker_id = heapq.heappop(loads)
+            shards[worker_id].append(node_id)
+            heapq.heappush(loads, (load + estimates[node_id], worker_id))
+        self.expected_shard_seconds = [sum(estimates[node_id] for node_id in shard) for shard in shards]
+        # No schedule can beat a perfect split of the total, or the single longest test
+        self.ideal_seconds = max(sum(estimates.values()) / worker_count, max(estimates.values()))
+        return shards
+
+    def _run_worker(self, worker_id, node_ids):
+        """Runs one shard in its own pytest process and returns its outcome."""
+        env = dict(os.environ)
+        env[Config.WORKER_ID_ENV_VAR] = str(worker_id)
+        junit_path = os.path.join(self.reports_dir, f"worker-{worker_id}.xml")
+        log_path = os.path.join(self.reports_dir, f"worker-{worker_id}.log")
+
+        start = time.perf_counter()
+        with open(log_path, "w") as log_file:
+            process = subprocess.run(
+                [sys.executable, "-m", "pytest", *node_ids, f"--junitxml={junit_path}", *self.pytest_args],
+                cwd=Config.PROJECT_ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        duration = time.perf_counter() - start
+
+        print(f"Worker {worker_id} finished {len(node_ids)} test(s) in {duration:.1f}s "
+              f"(exit code {process.returncode}). Log: {log_path}")
+        durations_path = DurationHistory.worker_durations_path(worker_id)
+        durations = {}
+        if os.path.exists(durations_path):
+            with open(durations_path) as durations_file:
+                durations = json.load(durations_file)
+            os.remove(durations_path)
+        return {"worker_id": worker_id, "returncode": process.returncode, "duration": duration,
+                "junit_path": junit_path, "durations": durations}
+
+    def merge_reports(self, outcomes):
+        """
+        Merges the per-worker JUnit files into reports/merged-junit.xml.
+        Returns the merged totals as a dict.
+        """
+        merged = ET.Element("testsuites")
+        totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+        for outcome in outcomes:
+            if not os.path.exists(outcome["junit_path"]):
+                # The worker crashed before pytest could write its report
+                totals["errors"] += 1
+                continue
+            root = ET.parse(outcome["junit_path"]).getroot()
+            suites = [root] if root.tag == "testsuite" else list(root)
+            for suite in suites:
+                suite.set("name", f"worker-{outcome['worker_id']}")
+                for key in totals:
+                    totals[key] += int(suite.get(key, 0))
+                merged.append(suite)
+        for key, value in totals.items():
+            merged.set(key, str(value))
+
+        merged_path = os.path.join(self.reports_dir, "merged-junit.xml")
+        ET.ElementTree(merged).write(merged_path, encoding="utf-8", xml_declaration=True)
+        print(f"Merged report written to: {merged_path}")
+        return totals
+
+    def run(self):
+        """
+        Collects, shards and runs the suite in parallel.
+        Returns a process exit code (0 only if every worker passed).
+        """
+        os.makedirs(self.reports_dir, exist_ok=True)
+        node_ids = self.collect()
+        shards = self.shard(node_ids)
+        print(f"Running {len(node_ids)} test(s) on {len(shards)} parallel browser worker(s).")
+        expected = ", ".join(f"worker {worker_id}: {seconds:.0f}s"
+                             for worker_id, seconds in enumerate(self.expected_shard_seconds))
+        print(f"Expected shard durations: {expected} (ideal balanced time {self.ideal_seconds:.0f}s).")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            futures = [executor.submit(self._run_worker, worker_id, shard)
+                       for worker_id, shard in enumerate(shards)]
+            outcomes = [future.result() for future in futures]
+        wall_time = time.perf_counter() - start
+
+        for outcome in outcomes:
+            self.history.record_many(outcome["durations"])
+        self.history.save()
+
+        totals = self.merge_reports(outcomes)
+        print(f"Total: {totals['tests']} test(s), {totals['failures']} failure(s), "
+              f"{totals['errors']} error(s), {totals['skipped']} skipped in {wall_time:.1f}s wall time.")
+        return max(outcome["returncode"] for outcome in outcomes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scenario suite on parallel browser workers.")
+    parser.add_argument("-n", "--workers", type=int, default=None,
+                        help="Number of browser workers (default: Config.PARALLEL_WORKERS or CPU count).")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER,
+                        help="Extra arguments passed to every pytest process (e.g. -k upload).")
+    args = parser.parse_args(argv)
+    return ParallelRunner(workers=args.workers, pytest_args=args.pytest_args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
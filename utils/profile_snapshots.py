@@ -0,0 +1,136 @@
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from config.config import Config
+from utils.event_log import EventLog
+
+# Files Chrome leaves behind while (or after) a profile is in use; they must not be cloned
+_PROFILE_LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+
+
+class ProfileSnapshots:
+    """
+    Pre-baked Chrome user-data-dirs, one per site, so browsers start with consent already given
+    and the site's static assets already in the HTTP cache.
+
+    A snapshot is built once by a browser that visits the site (see BasePage.prepare_profile) and
+    is then quit, which flushes cookies and cache to disk. It is stored as a template under
+    Config.PROFILE_SNAPSHOTS_DIR/<site>/ and rebuilt when older than Config.PROFILE_SNAPSHOT_TTL.
+    Every browser gets its own clone of the template (Chrome cannot share a profile), made with a
+    copy-on-write copy where the filesystem supports it and a plain copy otherwise. Hardlinks are
+    not used: Chrome updates its SQLite files (cookies, history) in place, which would write
+    through to the template.
+
+    <site>/current.json names the active template directory, so a snapshot can be replaced while
+    other processes are still cloning the previous one.
+    """
+
+    @staticmethod
+    def _site_dir(site):
+        return os.path.join(Config.PROFILE_SNAPSHOTS_DIR, site)
+
+    @classmethod
+    def current(cls, site):
+        """Metadata of the site's active snapshot ({directory, created_at, cookies}), or None."""
+        try:
+            with open(os.path.join(cls._site_dir(site), "current.json")) as current_file:
+                snapshot = json.load(current_file)
+        except (OSError, ValueError):
+            return None
+        if not os.path.isdir(snapshot["directory"]):
+            return None
+        return snapshot
+
+    @classmethod
+    def is_fresh(cls, site):
+        snapshot = cls.current(site)
+        return snapshot is not None and time.time() - snapshot["created_at"] < Config.PROFILE_SNAPSHOT_TTL
+
+    @classmethod
+    def ensure(cls, site, prepare):
+        """
+        Returns the site's snapshot metadata, building the snapshot first if it is missing or expired.
+        prepare(driver) is called with a browser on the template profile to visit the site.
+        Returns None (and the caller should fall back to an empty profile) if the build fails.
+        """
+        if cls.is_fresh(site):
+            return cls.current(site)
+        try:
+            return cls.build(site, prepare)
+        except Exception as e:
+            EventLog.warning("profile", "Building the '%s' profile snapshot failed (%s: %s); using an empty profile.", site, e.__class__.__name__, e)
+            return None
+
+    @classmethod
+    def build(cls, site, prepare):
+        # Imported here: DriverManager uses this class to clone snapshots into new browsers
+        from utils.driver_manager import DriverManager
+
+        start = time.perf_counter()
+        site_dir = cls._site_dir(site)
+        os.makedirs(site_dir, exist_ok=True)
+        template_dir = tempfile.mkdtemp(prefix=f"{time.strftime('%Y%m%d-%H%M%S')}-", dir=site_dir)
+
+        driver = DriverManager.create_driver(user_data_dir=template_dir)
+        try:
+            prepare(driver)
+            # Kept with the snapshot: resetting a pooled browser clears cookies, and these are put back
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except BaseException:
+            DriverManager._quit(driver)
+            shutil.rmtree(template_dir, ignore_errors=True)
+            raise
+        DriverManager._quit(driver)  # Flushes cookies and the HTTP cache to disk
+
+        for lock_file in _PROFILE_LOCK_FILES:
+            for path in glob.glob(os.path.join(template_dir, "**", lock_file), recursive=True):
+                os.remove(path)
+
+        snapshot = {"directory": template_dir, "created_at": time.time(), "cookies": cookies}
+        current_path = os.path.join(site_dir, "current.json")
+        with open(current_path + ".tmp", "w") as current_file:
+            json.dump(snapshot, current_file, indent=1)
+        os.replace(current_path + ".tmp", current_path)
+        cls._remove_stale(site, keep=template_dir)
+        EventLog.info("profile", "Built '%s' profile snapshot in %.1f s: %s", site, time.perf_counter() - start, template_dir)
+        return snapshot
+
+    @classmethod
+    def _remove_stale(cls, site, keep):
+        """Deletes replaced templates once they are old enough that nobody can still be cloning them."""
+        for directory in glob.glob(os.path.join(cls._site_dir(site), "*" + os.sep)):
+            directory = directory.rstrip(os.sep)
+            if directory != keep and time.time() - os.path.getmtime(directory) > Config.PROFILE_SNAPSHOT_TTL:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    @staticmethod
+    def _copy_tree(source, destination):
+        """Copy-on-write copy where the OS and filesystem support it (btrfs/XFS/APFS), a full copy otherwise."""
+        if sys.platform.startswith("linux"):
+            command = ["cp", "-a", "--reflink=auto", source, destination]
+        elif sys.platform == "darwin":
+            command = ["cp", "-c", "-R", source, destination]
+        else:
+            command = None
+        if command is not None and subprocess.run(command, capture_output=True).returncode == 0:
+            return
+        shutil.rmtree(destination, ignore_errors=True)
+        shutil.copytree(source, destination, symlinks=True)
+
+    @classmethod
+    def clone(cls, site, parent_dir=None):
+        """Copies the site's active snapshot into a new user-data-dir and returns its path."""
+        snapshot = cls.current(site)
+        if snapshot is None:
+            raise FileNotFoundError(f"No profile snapshot for '{site}'; call ProfileSnapshots.ensure() first.")
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        clone_dir = os.path.join(tempfile.mkdtemp(prefix=f"{site}-", dir=parent_dir), "profile")
+        cls._copy_tree(snapshot["directory"], clone_dir)
+        return clone_dir
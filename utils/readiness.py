@@ -0,0 +1,186 @@
+"""
+Readiness conditions for BasePage.wait_until_ready().
+
+Each function returns a predicate in the same style as selenium's expected_conditions:
+it takes the driver and returns a truthy value once the condition holds, False otherwise.
+They can be mixed freely with EC conditions in a single wait_until_ready() call.
+"""
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+from config.config import Config
+from utils.event_log import EventLog
+
+# Installed into every document (through DevTools when available, lazily otherwise).
+# Tracks in-flight fetch/XHR requests, the last network activity and the last DOM mutation.
+# Inline style changes are ignored so CSS animations (carousels, spinners) don't keep the page "busy".
+READINESS_TRACKER_JS = """
+(function () {
+  if (window.__aubergineReadiness) { return; }
+  var state = window.__aubergineReadiness = {
+    inflight: 0, lastMutation: performance.now(), lastNetwork: performance.now()
+  };
+  function touchNetwork() { state.lastNetwork = performance.now(); }
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+      state.inflight++; touchNetwork();
+      return originalFetch.apply(this, arguments).finally(function () { state.inflight--; touchNetwork(); });
+    };
+  }
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    state.inflight++; touchNetwork();
+    this.addEventListener('loadend', function () { state.inflight--; touchNetwork(); });
+    return originalSend.apply(this, arguments);
+  };
+  if (window.PerformanceObserver) {
+    try { new PerformanceObserver(touchNetwork).observe({type: 'resource'}); } catch (e) {}
+  }
+  new MutationObserver(function (mutations) {
+    for (var i = 0; i < mutations.length; i++) {
+      if (mutations[i].type !== 'attributes' || mutations[i].attributeName !== 'style') {
+        state.lastMutation = performance.now();
+        return;
+      }
+    }
+  }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+_READINESS_STATE_JS = READINESS_TRACKER_JS + """
+var state = window.__aubergineReadiness, now = performance.now();
+return {
+  readyState: document.readyState,
+  inflight: state.inflight,
+  sinceMutation: now - state.lastMutation,
+  sinceNetwork: now - state.lastNetwork
+};
+"""
+
+
+def install_readiness_probes(driver):
+    """
+    Registers the readiness tracker to run at the start of every new document, so requests
+    and mutations made before the first readiness check are seen too. Only done once per driver.
+    Falls back silently to lazy injection when the driver has no DevTools access.
+    """
+    if getattr(driver, "_readiness_probes_installed", False):
+        return
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_TRACKER_JS})
+    except (AttributeError, WebDriverException):
+        pass  # Not a Chromium driver; the tracker is injected on the first check instead
+    driver._readiness_probes_installed = True
+
+
+def _readiness_state(driver):
+    return driver.execute_script(_READINESS_STATE_JS)
+
+
+def document_ready():
+    """The document has finished loading (document.readyState == 'complete')."""
+    def _predicate(driver):
+        return driver.execute_script("return document.readyState;") == "complete"
+    return _predicate
+
+
+def document_interactive():
+    """
+    The document is parsed (document.readyState is 'interactive' or 'complete'), even if images,
+    fonts and other subresources are still loading. The about:blank page a fresh browser
+    starts on never counts, so this is safe to poll right after a non-blocking navigation.
+    """
+    def _predicate(driver):
+        return driver.execute_script(
+            "return document.readyState !== 'loading' && window.location.href !== 'about:blank';")
+    return _predicate
+
+
+def _give_up_timer(what, best_effort):
+    """
+    Returns a function that is True once Config.QUIET_MAX_WAIT seconds have passed since its first
+    call (logging a warning), or never when best_effort is False.
+    """
+    started = []
+
+    def give_up(state):
+        if not best_effort:
+            return False
+        now = time.monotonic()
+        if not started:
+            started.append(now)
+        if now - started[0] < Config.QUIET_MAX_WAIT:
+            return False
+        EventLog.warning("wait", "%s not reached within %s s (mutations %.0f ms ago, %d request(s) in flight); "
+                         "proceeding anyway.", what, Config.QUIET_MAX_WAIT, state["sinceMutation"], state["inflight"])
+        return True
+    return give_up
+
+
+def dom_stable(quiet_ms=None, best_effort=True):
+    """
+    The document is parsed and no DOM mutation has happened for quiet_ms milliseconds.
+    On pages that never stop mutating, gives up after Config.QUIET_MAX_WAIT seconds with a warning
+    (unless best_effort is False) once the document is parsed.
+    """
+    quiet_ms = Config.DOM_QUIET_MS if quiet_ms is None else quiet_ms
+    give_up = _give_up_timer("DOM quiet", best_effort)
+
+    def _predicate(driver):
+        state = _readiness_state(driver)
+        return state["readyState"] != "loading" and (state["sinceMutation"] >= quiet_ms or give_up(state))
+    return _predicate
+
+
+def network_idle(quiet_ms=None, best_effort=True):
+    """
+    No fetch/XHR request is in flight and no resource finished loading for quiet_ms milliseconds.
+    On pages that keep polling, gives up after Config.QUIET_MAX_WAIT seconds with a warning
+    (unless best_effort is False).
+    """
+    quiet_ms = Config.NETWORK_QUIET_MS if quiet_ms is None else quiet_ms
+    give_up = _give_up_timer("Network idle", best_effort)
+
+    def _predicate(driver):
+        state = _readiness_state(driver)
+        return (state["inflight"] <= 0 and state["sinceNetwork"] >= quiet_ms) or give_up(state)
+    return _predicate
+
+
+def page_settled(quiet_ms=None, best_effort=True):
+    """Shorthand for dom_stable() and network_idle() in one browser round trip (giving up the same way)."""
+    dom_quiet_ms = Config.DOM_QUIET_MS if quiet_ms is None else quiet_ms
+    network_quiet_ms = Config.NETWORK_QUIET_MS if quiet_ms is None else quiet_ms
+    give_up = _give_up_timer("Page settled", best_effort)
+
+    def _predicate(driver):
+        state = _readiness_state(driver)
+        quiet = (state["sinceMutation"] >= dom_quiet_ms
+                 and state["inflight"] <= 0 and state["sinceNetwork"] >= network_quiet_ms)
+        return state["readyState"] != "loading" and (quiet or give_up(state))
+    return _predicate
+
+
+def element_settled(locator, attribute=None, settle_time=None):
+    """
+    The element's text (or the given attribute) has stopped changing for settle_time seconds.
+    Returns the element once settled.
+    """
+    settle_time = Config.ELEMENT_SETTLE_TIME if settle_time is None else settle_time
+    last = {"value": None, "since": None}
+
+    def _predicate(driver):
+        try:
+            element = driver.find_element(*locator)
+            value = element.get_attribute(attribute) if attribute else element.text
+        except StaleElementReferenceException:
+            last["since"] = None
+            return False
+        now = time.monotonic()
+        if last["since"] is None or value != last["value"]:
+            last["value"], last["since"] = value, now
+            return False
+        return element if now - last["since"] >= settle_time else False
+    return _predicate
@@ -0,0 +1,303 @@
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.config import Config
+from utils.event_log import EventLog
+from utils.file_names import slug
+
+# Headers that describe one connection rather than the response, plus ones recomputed on replay
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+                       "te", "trailer", "trailers", "transfer-encoding", "upgrade", "content-length", "alt-svc"}
+
+
+def request_key(method, url, body=b""):
+    """
+    Identifies a request in a recording: method, URL with Config.REPLAY_IGNORED_QUERY_PARAMS
+    (cache busters, timestamps) removed and the rest sorted, and a hash of the body if there is one.
+    """
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name not in Config.REPLAY_IGNORED_QUERY_PARAMS)
+    key = f"{method} {urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))}"
+    if body:
+        key += f" body:{hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+def ensure_certificate(directory):
+    """
+    Returns (certificate, key) paths of the self-signed certificate the proxy presents for every
+    HTTPS site, creating it with openssl on first use. Browsers using the proxy are started with
+    --ignore-certificate-errors, so one certificate serves every host.
+    """
+    cert_path = os.path.join(directory, "proxy-cert.pem")
+    key_path = os.path.join(directory, "proxy-key.pem")
+    if not (os.path.exists(cert_path) and os.path.exists(key_path)):
+        os.makedirs(directory, exist_ok=True)
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+                        "-subj", "/CN=Auberginetest replay proxy", "-keyout", key_path, "-out", cert_path],
+                       check=True, capture_output=True)
+    return cert_path, key_path
+
+
+class ResponseStore:
+    """
+    On-disk recording store. Response bodies are content-addressed (objects/<sha256[:2]>/<sha256>),
+    so an asset shared by many pages or scenarios is stored once. Each cassette (one per test) is a
+    JSON index {request key: [response, ...]} in cassettes/, responses in the order they were recorded.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or Config.REPLAY_STORE_DIR
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def put_body(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "wb") as body_file:
+                body_file.write(body)
+            os.replace(temporary_path, path)
+        return digest
+
+    def get_body(self, digest):
+        with open(self._object_path(digest), "rb") as body_file:
+            return body_file.read()
+
+    def cassette_path(self, name):
+        return os.path.join(self.directory, "cassettes", slug(name.replace("::", "__"), 150) + ".json")
+
+    def load_cassette(self, name):
+        try:
+            with open(self.cassette_path(name)) as cassette_file:
+                return json.load(cassette_file)["responses"]
+        except (OSError, ValueError):
+            return {}
+
+    def save_cassette(self, name, responses):
+        path = self.cassette_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as cassette_file:
+            json.dump({"name": name, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "responses": responses},
+                      cassette_file, indent=1, sort_keys=True)
+        return path
+
+
+class _ProxyRequestHandler(BaseHTTPRequestHandler):
+    """
+    Forward proxy handler. HTTPS requests arrive as CONNECT; the tunnel is terminated here with
+    the proxy's own certificate and the requests inside it are handled like plain ones.
+    """
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a CONNECT tunnel can carry many requests
+    _tunnel_origin = None
+
+    def log_message(self, format, *args):
+        pass  # Keep pytest output clean
+
+    def do_CONNECT(self):
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.wfile.flush()
+        host, _, port = self.path.partition(":")
+        try:
+            tls = self.server.owner.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        # From here on the connection speaks HTTP inside TLS to the same client
+        self.connection = tls
+        self.rfile = tls.makefile("rb", self.rbufsize)
+        self.wfile = tls.makefile("wb")
+        self._tunnel_origin = f"https://{host}" + ("" if port in ("", "443") else f":{port}")
+        self.close_connection = False
+
+    def _handle(self):
+        if self.path.startswith(("http://", "https://")):
+            url = self.path
+        elif self._tunnel_origin:
+            url = self._tunnel_origin + self.path
+        else:
+            self._respond(400, "Bad Request", [], b"Not a proxy request")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.headers.get("Upgrade"):
+            self._respond(501, "Not Implemented", [], b"WebSockets are not proxied")
+            return
+        owner = self.server.owner
+        key = request_key(self.command, url, body)
+
+        if owner.mode == "replay":
+            response = owner.lookup(key)
+            if response is not None:
+                if owner.latency_ms:
+                    time.sleep(owner.latency_ms / 1000)
+                self._respond(response["status"], response["reason"], response["headers"],
+                              owner.store.get_body(response["body"]))
+                return
+            if Config.REPLAY_ON_MISS != "passthrough":
+                self._respond(504, "Not Recorded", [("Content-Type", "text/plain")],
+                              f"Not in the recording: {key}".encode())
+                return
+
+        try:
+            status, reason, headers, response_body = self._fetch(url, body)
+        except (OSError, http.client.HTTPException) as e:
+            self._respond(502, "Bad Gateway", [("Content-Type", "text/plain")], f"Upstream error: {e}".encode())
+            return
+        if owner.mode == "record":
+            owner.record(key, {"status": status, "reason": reason, "headers": headers,
+                               "body": owner.store.put_body(response_body)})
+        self._respond(status, reason, headers, response_body)
+
+    def _fetch(self, url, body):
+        """Sends the request to the real server. The response body is kept exactly as sent (still compressed)."""
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(parts.hostname, parts.port or 443, timeout=Config.DEFAULT_WAIT_TIME,
+                                                     context=ssl.create_default_context())
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=Config.DEFAULT_WAIT_TIME)
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS}
+        try:
+            connection.request(self.command, urlunsplit(("", "", parts.path or "/", parts.query, "")),
+                               body=body or None, headers=headers)
+            response = connection.getresponse()
+            response_body = response.read()
+            response_headers = [(name, value) for name, value in response.getheaders()
+                                if name.lower() not in _HOP_BY_HOP_HEADERS]
+            return response.status, response.reason, response_headers, response_body
+        finally:
+            connection.close()
+
+    def _respond(self, status, reason, headers, body):
+        self.send_response(status, reason)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD" and status not in (204, 304):
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _handle
+
+
+class ReplayProxy:
+    """
+    Local record-and-replay HTTP(S) proxy for the scenarios on live third-party sites.
+
+    "record": every request is forwarded to the real site and its response stored in the current
+    cassette. "replay": responses are served from the cassette only, after Config.REPLAY_LATENCY_MS
+    of fixed latency, so a scenario runs offline, deterministically and at local-disk speed.
+    A request that was not recorded gets a 504 (or goes to the real site with
+    Config.REPLAY_ON_MISS = "passthrough"). Loopback addresses (the local stand-in server) are
+    never proxied by Chrome.
+    """
+    session_stats = {}  # cassette -> {"recorded", "replayed", "missed"}, for the session summary
+
+    def __init__(self, mode, store_dir=None, latency_ms=None, host=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay proxy mode: {mode!r} (expected 'record' or 'replay')")
+        self.mode = mode
+        self.store = ResponseStore(store_dir)
+        self.latency_ms = Config.REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        self.host = host or Config.LOCAL_SERVER_HOST
+        self.ssl_context = None
+        self.cassette = None
+        self._responses = {}
+        self._positions = {}  # request key -> index of the next recorded response to serve
+        self._lock = threading.Lock()
+        self._httpd = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self._httpd.server_address[1]}"
+
+    def start(self):
+        """Starts the proxy in a daemon thread and returns its URL (for Chrome's --proxy-server)."""
+        cert_path, key_path = ensure_certificate(self.store.directory)
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(cert_path, key_path)
+        self.ssl_context.set_alpn_protocols(["http/1.1"])
+        self._httpd = ThreadingHTTPServer((self.host, 0), _ProxyRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        threading.Thread(target=self._httpd.serve_forever, name="replay-proxy", daemon=True).start()
+        EventLog.info("replay", "Replay proxy (%s mode) listening on %s", self.mode, self.url)
+        return self.url
+
+    def stop(self):
+        self.save()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def use_cassette(self, name):
+        """Switches to another recording (one per test); in record mode the previous one is saved first."""
+        self.save()
+        with self._lock:
+            self.cassette = name
+            self._responses = self.store.load_cassette(name) if self.mode == "replay" else {}
+            self._positions = {}
+            self.session_stats[name] = {"recorded": 0, "replayed": 0, "missed": 0}
+
+    @contextmanager
+    def using_cassette(self, name):
+        """
+        Records into / replays from another cassette for a while (e.g. during a profile snapshot
+        build), then returns to the current one where it left off.
+        """
+        self.save()
+        with self._lock:
+            previous = (self.cassette, self._responses, self._positions)
+        self.use_cassette(name)
+        try:
+            yield
+        finally:
+            self.save()
+            with self._lock:
+                self.cassette, self._responses, self._positions = previous
+
+    def save(self):
+        """Writes the current cassette (record mode only, and only if something was recorded)."""
+        with self._lock:
+            if self.mode != "record" or not self.cassette or not self._responses:
+                return None
+            responses = dict(self._responses)
+        path = self.store.save_cassette(self.cassette, responses)
+        EventLog.info("replay", "Recorded %d request(s) for %s: %s", len(responses), self.cassette, path)
+        return path
+
+    def record(self, key, response):
+        with self._lock:
+            self._responses.setdefault(key, []).append(response)
+            if self.cassette in self.session_stats:
+                self.session_stats[self.cassette]["recorded"] += 1
+
+    def lookup(self, key):
+        """Next recorded response for a request; a request repeated more often than recorded gets the last one."""
+        with self._lock:
+            responses = self._responses.get(key)
+            stats = self.session_stats.get(self.cassette, {"replayed": 0, "missed": 0})
+            if not responses:
+                stats["missed"] += 1
+                EventLog.warning("replay", "Not in the recording: %s", key)
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            stats["replayed"] += 1
+            return responses[min(position, len(responses) - 1)]
@@ -0,0 +1,126 @@
+import json
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import Config
+from utils.driver_manager import DriverManager
+from utils.event_log import EventLog
+from utils.window_registry import WindowRegistry
+
+# Network.setBlockedURLs only matches URLs, so resource types are blocked by file extension
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "mp3", "wav", "m3u8"),
+    "stylesheet": ("css",),
+}
+
+
+def _extension_patterns(extensions):
+    """
+    Patterns for paths ending in one of the extensions, with or without a query string. The extension
+    is anchored, so "*.webp" does not match runtime.webpack.js and "*.ico" not /x.icons/app.js.
+    Chrome matches these with '*' and '?' as wildcards, so the query's '?' is escaped.
+    """
+    return tuple(pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}\\?*"))
+
+
+RESOURCE_TYPE_URL_PATTERNS = {resource_type: _extension_patterns(extensions)
+                              for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()}
+
+
+class ResourceBlocker:
+    """
+    Applies a page object's block list through Chrome DevTools (Network.setBlockedURLs)
+    before navigation, and reports how many requests and bytes the blocking saved,
+    based on the DevTools network events in Chrome's performance log.
+    """
+    _report = {}  # page object name -> counters
+    _lock = threading.Lock()
+
+    @staticmethod
+    def patterns_for(blocked_url_patterns, blocked_resource_types, allowed_url_patterns):
+        """
+        Builds the final list of URL patterns to block.
+        Allowed patterns are removed from the block list, so a page can re-enable entries of a shared list.
+        """
+        patterns = list(blocked_url_patterns)
+        for resource_type in blocked_resource_types:
+            if resource_type not in RESOURCE_TYPE_URL_PATTERNS:
+                raise ValueError(f"Unknown resource type to block: {resource_type}. "
+                                 f"Known types: {sorted(RESOURCE_TYPE_URL_PATTERNS)}")
+            patterns.extend(RESOURCE_TYPE_URL_PATTERNS[resource_type])
+        allowed = set(allowed_url_patterns)
+        return sorted(set(pattern for pattern in patterns if pattern not in allowed))
+
+    @classmethod
+    def apply(cls, driver, patterns, page_name):
+        """
+        Sends the block list to the current tab (DevTools settings are per tab). Skipped when the tab
+        already has exactly this list, so repeated navigations by the same page object cost no extra round trips.
+        """
+        driver._blocking_page = page_name if patterns else None
+        applied = getattr(driver, "_blocked_url_patterns", None) or {}  # window handle -> patterns
+        window = WindowRegistry.for_driver(driver).current
+        if applied.get(window, []) == patterns:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            applied[window] = patterns
+            driver._blocked_url_patterns = applied
+            if patterns:
+                EventLog.debug("blocking", "Blocking %d URL pattern(s) for %s.", len(patterns), page_name)
+        except WebDriverException as e:
+            EventLog.warning("blocking", "Could not apply resource blocking for %s: %s", page_name, e.__class__.__name__)
+
+    @classmethod
+    def collect(cls, driver):
+        """
+        Reads (and drains) the browser's performance log and adds the blocked requests, loaded bytes
+        and estimated saved bytes to the report of the page object that set the block list.
+        The saving per blocked request is estimated from the average size of loaded requests of the same type.
+        """
+        page_name = getattr(driver, "_blocking_page", None)
+        try:
+            messages = DriverManager.read_performance_log(driver)
+        except WebDriverException:
+            return  # No performance log (not a Chromium browser)
+        if not page_name or not Config.RESOURCE_BLOCKING_REPORT:
+            return
+
+        request_types = {}
+        loaded_bytes_by_type = {}
+        blocked_types = []
+        for message in messages:
+            params = message.get("params", {})
+            if message.get("method") == "Network.requestWillBeSent":
+                request_types[params.get("requestId")] = params.get("type", "Other")
+            elif message.get("method") == "Network.loadingFinished":
+                resource_type = request_types.get(params.get("requestId"), "Other")
+                loaded_bytes_by_type.setdefault(resource_type, []).append(params.get("encodedDataLength", 0))
+            elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason") == "inspector":
+                blocked_types.append(params.get("type") or request_types.get(params.get("requestId"), "Other"))
+
+        all_sizes = [size for sizes in loaded_bytes_by_type.values() for size in sizes]
+        overall_average = sum(all_sizes) / len(all_sizes) if all_sizes else 0
+        estimated_saved = 0
+        for resource_type in blocked_types:
+            sizes = loaded_bytes_by_type.get(resource_type)
+            estimated_saved += sum(sizes) / len(sizes) if sizes else overall_average
+
+        with cls._lock:
+            report = cls._report.setdefault(page_name, {"requests_blocked": 0, "bytes_loaded": 0,
+                                                        "estimated_bytes_saved": 0, "blocked_by_type": {}})
+            report["requests_blocked"] += len(blocked_types)
+            report["bytes_loaded"] += int(sum(all_sizes))
+            report["estimated_bytes_saved"] += int(estimated_saved)
+            for resource_type in blocked_types:
+                report["blocked_by_type"][resource_type] = report["blocked_by_type"].get(resource_type, 0) + 1
+
+    @classmethod
+    def report(cls):
+        """Returns {page object name: {"requests_blocked", "bytes_loaded", "estimated_bytes_saved", "blocked_by_type"}}."""
+        with cls._lock:
+            return json.loads(json.dumps(cls._report))
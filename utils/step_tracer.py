@@ -0,0 +1,196 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.config import Config
+from utils.artifacts import ArtifactCollector
+
+
+def _is_locator(value):
+    """A locator is a (By.<strategy>, value) tuple, e.g. (By.ID, 'file-upload')."""
+    return isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str)
+
+
+def _describe_condition(condition):
+    """
+    Returns a readable (name, locator) pair for an expected condition, e.g.
+    ('visibility_of_element_located', ('css selector', '#content')).
+    The locator is dug out of the condition's closure when there is one.
+    """
+    name = getattr(condition, "__qualname__", type(condition).__name__).split(".<locals>")[0]
+    locator = None
+    for cell in getattr(condition, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if _is_locator(value):
+            locator = value
+            break
+    return name, locator
+
+
+class StepTracer:
+    """
+    Records a start/end timestamp, locator, outcome and wait time for every BasePage action and
+    explicit wait of the current test. Traces are exported per test in Chrome trace-event JSON
+    (open them in chrome://tracing or https://ui.perfetto.dev).
+    """
+    _events = []          # Trace events of the current test
+    _stack = []           # Currently open steps, used to attribute nested wait time to the outer step
+    _test_name = None
+    _top_level_steps = []  # (duration_ms, test_name, step_name, target) for the session summary
+    _lock = threading.Lock()
+
+    @classmethod
+    def start_test(cls, test_name):
+        """Clears the trace and starts recording steps for a new test."""
+        with cls._lock:
+            cls._events = []
+            cls._stack = []
+            cls._test_name = test_name
+
+    @classmethod
+    @contextmanager
+    def step(cls, name, category, target=None):
+        """
+        Context manager that records one step.
+        category is one of 'navigation', 'action', 'read', 'wait', 'script', 'window'.
+        """
+        if not Config.STEP_TRACE_ENABLED:
+            yield
+            return
+
+        frame = {"wait_us": 0}
+        cls._stack.append(frame)
+        start_us = time.perf_counter_ns() // 1000
+        outcome = "ok"
+        try:
+            yield
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            duration_us = time.perf_counter_ns() // 1000 - start_us
+            cls._stack.pop()
+            if category == "wait":
+                frame["wait_us"] = duration_us
+            if cls._stack:
+                # Waits (and steps that waited) count towards the wait time of the enclosing step
+                cls._stack[-1]["wait_us"] += frame["wait_us"]
+
+            event = {
+                "name": name, "cat": category, "ph": "X", "ts": start_us, "dur": duration_us,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+                "args": {"target": None if target is None else str(target)[:200], "outcome": outcome,
+                         "wait_ms": round(frame["wait_us"] / 1000, 1), "depth": len(cls._stack)},
+            }
+            with cls._lock:
+                cls._events.append(event)
+                if not cls._stack:
+                    cls._top_level_steps.append((duration_us / 1000, cls._test_name, name, event["args"]["target"]))
+
+    @classmethod
+    def depth(cls):
+        """Number of steps currently open (0 outside any page-object step)."""
+        return len(cls._stack)
+
+    @classmethod
+    def events(cls):
+        """Returns a copy of the trace events recorded for the current test."""
+        with cls._lock:
+            return list(cls._events)
+
+    @classmethod
+    def export_test(cls, file_path):
+        """Writes the current test's trace as Chrome trace-event JSON."""
+        with cls._lock:
+            events = list(cls._events)
+        if not events:
+            return None
+        metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": cls._test_name}}
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as trace_file:
+            json.dump({"traceEvents": [metadata] + events, "displayTimeUnit": "ms"}, trace_file)
+        return file_path
+
+    @classmethod
+    def slowest_steps(cls, top_n=None):
+        """Returns the top-N slowest top-level steps of the session, slowest first."""
+        top_n = top_n or Config.TRACE_SUMMARY_TOP_N
+        with cls._lock:
+            return sorted(cls._top_level_steps, key=lambda step: step[0], reverse=True)[:top_n]
+
+
+def _mark_failure(error, step_name, target, frame_path=None):
+    """
+    Records on the exception the innermost step it was raised from. Nothing is captured here:
+    conftest.browser_setup captures the browser state only if the exception reaches the test,
+    so a timeout a page object handles itself (an optional spinner or cookie banner) leaves no artifacts.
+    """
+    if getattr(error, "_failed_step", None) is not None:
+        return
+    try:
+        error._failed_step = {
+            "step": step_name,
+            "reason": f"{step_name} failed: {type(error).__name__}" + (f" ({target})" if target else ""),
+            "frame_path": list(frame_path) if frame_path else [],
+        }
+    except AttributeError:
+        pass  # Exceptions that refuse attributes are captured as a plain test failure
+
+
+def traced(category):
+    """
+    Decorator for BasePage methods: records the call as a step named after the method.
+    The first positional argument (a locator or URL) is recorded as the step target.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            target = args[0] if args and (_is_locator(args[0]) or isinstance(args[0], str)) else None
+            top_level = StepTracer.depth() == 0
+            try:
+                with StepTracer.step(func.__name__, category, target=target):
+                    result = func(self, *args, **kwargs)
+            except Exception as e:
+                _mark_failure(e, func.__name__, target, getattr(self, "frame_path", None))
+                raise
+            if top_level and Config.ARTIFACTS_ON_PASS:
+                ArtifactCollector.capture(self.driver, f"{func.__name__} passed", step=func.__name__,
+                                          frame_path=getattr(self, "frame_path", None))
+            return result
+        return wrapper
+    return decorator
+
+
+class TracedWait(WebDriverWait):
+    """
+    WebDriverWait that records every until()/until_not() call as a 'wait' step.
+    A timeout outside any page-object step is marked as a failure of this wait (inside one, the
+    step marks whatever it raises); artifacts are captured only if it reaches the test.
+    """
+
+    def until(self, method, message=""):
+        name, locator = _describe_condition(method)
+        return self._traced(super().until, f"wait.until {name}", locator, method, message)
+
+    def until_not(self, method, message=""):
+        name, locator = _describe_condition(method)
+        return self._traced(super().until_not, f"wait.until_not {name}", locator, method, message)
+
+    def _traced(self, wait, step_name, locator, method, message):
+        top_level = StepTracer.depth() == 0
+        try:
+            with StepTracer.step(step_name, "wait", target=locator):
+                return wait(method, message)
+        except TimeoutException as e:
+            if top_level:
+                _mark_failure(e, step_name, locator)
+            raise
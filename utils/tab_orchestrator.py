@@ -0,0 +1,129 @@
+import inspect
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, JavascriptException
+
+from config.config import Config
+from utils.event_log import EventLog, INFO, WARNING
+from utils.window_registry import WindowRegistry
+
+
+class _TabTask:
+    def __init__(self, name, page_class, run, url):
+        self.name = name
+        self.page_class = page_class
+        self.run = run
+        self.url = url
+        self.handle = None
+        self.page = None
+        self.conditions = ()  # What the task is waiting for before it can continue
+        self.steps = None  # Generator of a task that yields conditions
+        self.started = None
+        self.outcome = {"result": None, "error": None, "ready_ms": None, "duration_ms": None}
+
+
+class TabOrchestrator:
+    """
+    Runs independent page-object tasks in separate tabs of one browser, overlapping their network waits.
+
+    Navigation is started in every tab first (BasePage.start_navigation returns immediately). The
+    orchestrator then cycles through the tabs, and whenever a tab's page is ready (its
+    ready_conditions() hold) it runs that tab's task. A task is called with its page object and either
+    returns a result directly, or is a generator that yields readiness conditions (any predicate taking
+    the driver) whenever it would otherwise block; the orchestrator resumes it once they hold and
+    meanwhile serves the other tabs. The value of the generator's return statement is its result.
+
+        orchestrator = TabOrchestrator(driver)
+        orchestrator.add("upload", UploadPage, upload_task)
+        orchestrator.add("dnd", DragAndDropPage, drag_task)
+        results = orchestrator.run()  # {"upload": {"result", "error", "ready_ms", "duration_ms"}, ...}
+    """
+
+    def __init__(self, driver, timeout=None, poll_interval=None):
+        self.driver = driver
+        self.timeout = timeout or Config.DEFAULT_WAIT_TIME
+        self.poll_interval = poll_interval or Config.READINESS_POLL_INTERVAL
+        self.windows = WindowRegistry.for_driver(driver)
+        self.tasks = []
+
+    def add(self, name, page_class, run, url=None):
+        """Adds a task: run(page) is called in its own tab once page_class's page at url (default: page.url) is ready."""
+        if any(task.name == name for task in self.tasks):
+            raise ValueError(f"Duplicate tab task name: {name}")
+        self.tasks.append(_TabTask(name, page_class, run, url))
+        return self
+
+    def _conditions_hold(self, task):
+        for condition in task.conditions:
+            try:
+                if not condition(self.driver):
+                    return False
+            except (NoSuchElementException, StaleElementReferenceException, JavascriptException):
+                return False
+        return True
+
+    def _advance(self, task, started):
+        """Runs the task until it finishes or yields conditions that do not hold yet. Returns True when finished."""
+        if task.steps is None:
+            if task.outcome["ready_ms"] is None:
+                task.outcome["ready_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            result = task.run(task.page)
+            if not inspect.isgenerator(result):
+                task.outcome["result"] = result
+                return True
+            task.steps = result
+        while True:
+            try:
+                yielded = next(task.steps)
+            except StopIteration as stop:
+                task.outcome["result"] = stop.value
+                return True
+            task.conditions = yielded if isinstance(yielded, (list, tuple)) else (yielded,)
+            task.started = time.perf_counter()
+            if not self._conditions_hold(task):
+                return False
+
+    def run(self):
+        """Runs every task and returns {name: {"result", "error", "ready_ms", "duration_ms"}}."""
+        origin = self.windows.current
+        started = time.perf_counter()
+        try:
+            for task in self.tasks:
+                task.handle = self.windows.open_tab(task.name)
+                task.page = task.page_class(self.driver)
+                task.conditions = task.page.start_navigation(task.url)
+                task.started = time.perf_counter()
+            EventLog.info("tabs", "Started %d tab(s): %s", len(self.tasks), ", ".join(task.name for task in self.tasks))
+
+            pending = list(self.tasks)
+            while pending:
+                progressed = False
+                for task in list(pending):
+                    self.windows.switch_to(task.handle)
+                    try:
+                        if self._conditions_hold(task):
+                            progressed = True
+                            finished = self._advance(task, started)
+                        elif time.perf_counter() - task.started > self.timeout:
+                            raise TimeoutError(f"Tab '{task.name}' not ready within {self.timeout} seconds.")
+                        else:
+                            finished = False
+                    except Exception as e:
+                        task.outcome["error"] = f"{e.__class__.__name__}: {e}"
+                        finished = True
+                    if finished:
+                        task.outcome["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                        pending.remove(task)
+                        EventLog.log(WARNING if task.outcome["error"] else INFO, "tabs",
+                                     "Tab '%s' finished in %.0f ms (error: %s).", task.name,
+                                     task.outcome["duration_ms"], task.outcome["error"])
+                if pending and not progressed:
+                    time.sleep(self.poll_interval)
+        finally:
+            for task in self.tasks:
+                if task.handle in self.windows.known:
+                    self.windows.close(task.handle)
+            if origin:
+                self.windows.switch_to(origin)
+        EventLog.info("tabs", "All tabs finished in %.0f ms.", (time.perf_counter() - started) * 1000)
+        return {task.name: task.outcome for task in self.tasks}
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+# Allow running this file directly (python utils/upload_benchmark.py) as well as with -m
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config.config import Config
+from pages.upload_page import UploadPage
+from utils.benchmark import _percentile
+from utils.driver_manager import DriverManager
+from utils.local_server import LocalTestServer
+
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+_WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+def parse_size(text):
+    """Parses '1KB', '10MB', '1.5GB' or '512' (bytes) into a number of bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*", text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r} (expected e.g. 1KB, 10MB, 1GB)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2) or "B"])
+
+
+def generate_file(directory, label, size_bytes):
+    """
+    Writes a synthetic file of exactly size_bytes, one chunk at a time, so even
+    multi-hundred-MB files never sit in memory. The content is random (incompressible)
+    bytes: one random chunk repeated, which is much cheaper than os.urandom for every byte.
+    """
+    path = os.path.join(directory, f"upload-{label}.bin")
+    chunk = os.urandom(min(_WRITE_CHUNK_SIZE, size_bytes))
+    remaining = size_bytes
+    with open(path, "wb") as generated_file:
+        while remaining > 0:
+            generated_file.write(chunk[:remaining])
+            remaining -= len(chunk)
+    return path
+
+
+def _stats(values):
+    return {"median": round(statistics.median(values), 1), "p95": round(_percentile(values, 95), 1)}
+
+
+def _mb_per_s(size_bytes, duration_ms):
+    return round(size_bytes / 1024 ** 2 / (duration_ms / 1000), 2) if duration_ms > 0 else None
+
+
+class UploadBenchmark:
+    """
+    Measures how the browser upload path scales with payload size.
+
+    For every size bucket a synthetic file is generated into a temp directory and uploaded
+    through UploadPage against the local stand-in server, Config.UPLOAD_BENCHMARK_RUNS times.
+    Reported per bucket (median/p95):
+      select_ms         - file path sent to the input until its name is shown in the preview
+      submit_ms         - Upload clicked until the "File Uploaded!" page is shown (end to end)
+      server_receive_ms - time the server spent reading the multipart body
+    plus end-to-end and server-side throughput in MB/s.
+    """
+
+    def __init__(self, sizes=None, runs=None, tmp_dir=None):
+        self.sizes = list(sizes or Config.UPLOAD_BENCHMARK_SIZES)
+        self.runs = runs or Config.UPLOAD_BENCHMARK_RUNS
+        self.tmp_dir = tmp_dir or Config.UPLOAD_BENCHMARK_TMP_DIR
+        self.size_bytes = {label: parse_size(label) for label in self.sizes}
+
+    def _upload_once(self, driver, server, file_path):
+        """Uploads one file and returns its timings in milliseconds."""
+        page = UploadPage(driver)
+        page.load()
+
+        start = time.perf_counter()
+        page.upload_file_by_drag_drop_area(file_path)
+        page.get_displayed_file_name(os.path.basename(file_path))
+        selected = time.perf_counter()
+
+        page.click_upload_button()
+        message = page.get_upload_success_message(timeout=Config.UPLOAD_BENCHMARK_TIMEOUT)
+        submitted = time.perf_counter()
+        if "File Uploaded!" not in message:
+            raise AssertionError(f"Unexpected upload result: {message!r}")
+
+        upload = server.uploads[-1]
+        return {"select_ms": (selected - start) * 1000, "submit_ms": (submitted - selected) * 1000,
+                "server_receive_ms": upload["receive_ms"], "server_bytes": upload["bytes"]}
+
+    def run(self):
+        """Returns {size label: metrics}; a bucket whose upload failed is reported as {"error": ...}."""
+        server = LocalTestServer()
+        original_base_url = Config.THE_INTERNET_BASE_URL
+        driver = None
+        results = {}
+        try:
+            Config.use_the_internet_base_url(server.start())
+            driver = DriverManager.acquire()
+            # Submitting a large file keeps the click busy until the next page has loaded
+            driver.set_page_load_timeout(Config.UPLOAD_BENCHMARK_TIMEOUT)
+            with tempfile.TemporaryDirectory(prefix="upload-benchmark-", dir=self.tmp_dir) as directory:
+                for label in self.sizes:
+                    size_bytes = self.size_bytes[label]
+                    file_path = generate_file(directory, label, size_bytes)
+                    samples = []
+                    try:
+                        for run_index in range(self.runs):
+                            sample = self._upload_once(driver, server, file_path)
+                            print(f"[{label}] run {run_index + 1}/{self.runs}: "
+                                  f"{sample['submit_ms']:.0f} ms submit, {sample['server_receive_ms']:.0f} ms server")
+                            samples.append(sample)
+                    except Exception as e:
+                        print(f"[{label}] upload FAILED: {e}")
+                        results[label] = {"error": f"{e.__class__.__name__}: {e}"}
+                        continue
+                    finally:
+                        os.remove(file_path)
+                    results[label] = self._summarize(size_bytes, samples)
+        finally:
+            if driver is not None:
+                driver.set_page_load_timeout(Config.DEFAULT_WAIT_TIME)
+                DriverManager.release(driver)
+            DriverManager.shutdown()
+            Config.use_the_internet_base_url(original_base_url)
+            server.stop()
+        return results
+
+    @staticmethod
+    def _summarize(size_bytes, samples):
+        submit_ms = [sample["submit_ms"] for sample in samples]
+        receive_ms = [sample["server_receive_ms"] for sample in samples]
+        return {
+            "bytes": size_bytes,
+            "server_bytes": samples[-1]["server_bytes"],
+            "select_ms": _stats([sample["select_ms"] for sample in samples]),
+            "submit_ms": _stats(submit_ms),
+            "server_receive_ms": _stats(receive_ms),
+            "e2e_mb_per_s": _mb_per_s(size_bytes, statistics.median(submit_ms)),
+            "server_mb_per_s": _mb_per_s(size_bytes, statistics.median(receive_ms)),
+        }
+
+    @staticmethod
+    def write_results(results, file_path=None):
+        file_path = file_path or os.path.join(Config.REPORTS_DIR, "upload_benchmark.json")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+        print(f"Upload benchmark results written to: {file_path}")
+        return file_path
+
+
+def print_results(results):
+    print(f"\n{'size':>8} {'select (med/p95)':>20} {'submit (med/p95)':>20} {'server (med/p95)':>20} "
+          f"{'e2e MB/s':>9} {'server MB/s':>12}")
+    for label, metrics in results.items():
+        if "error" in metrics:
+            print(f"{label:>8}  {metrics['error']}")
+            continue
+        columns = [f"{metrics[key]['median']:.0f}/{metrics[key]['p95']:.0f} ms"
+                   for key in ("select_ms", "submit_ms", "server_receive_ms")]
+        print(f"{label:>8} {columns[0]:>20} {columns[1]:>20} {columns[2]:>20} "
+              f"{metrics['e2e_mb_per_s'] or 0:>9.2f} {metrics['server_mb_per_s'] or 0:>12.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark browser uploads of generated files against the local server.")
+    parser.add_argument("--sizes", default=None,
+                        help="Comma-separated file sizes (default: Config.UPLOAD_BENCHMARK_SIZES, e.g. 1KB,10MB,500MB).")
+    parser.add_argument("-k", "--runs", type=int, default=None, help="Uploads per size (default: Config.UPLOAD_BENCHMARK_RUNS).")
+    parser.add_argument("--tmp-dir", default=None, help="Directory for the generated files (default: system temp).")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: reports/upload_benchmark.json).")
+    args = parser.parse_args(argv)
+
+    benchmark = UploadBenchmark(sizes=args.sizes.split(",") if args.sizes else None, runs=args.runs,
+                                tmp_dir=args.tmp_dir)
+    results = benchmark.run()
+    print_results(results)
+    benchmark.write_results(results, args.output)
+    return 1 if any("error" in metrics for metrics in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+class WindowRegistry:
+    """
+    Keeps track of the browser windows/tabs of one driver, so page objects never have to
+    guess which handle is which from len(window_handles) or window_handles[0].
+
+    One registry is shared by every page object of a driver (see for_driver). It remembers
+    the main window, the handles it has already seen, optional names for them and the
+    window the driver is currently switched to.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.main_handle = driver.current_window_handle
+        self.current = self.main_handle
+        self.names = {}  # name -> handle
+        self.known = set(driver.window_handles)
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Returns the driver's registry, creating it on first use."""
+        registry = getattr(driver, "_window_registry", None)
+        if registry is None:
+            registry = cls(driver)
+            driver._window_registry = registry
+        return registry
+
+    @staticmethod
+    def detach(driver):
+        """Removes and returns the driver's registry (e.g. when a pooled browser is reset)."""
+        registry = getattr(driver, "_window_registry", None)
+        driver._window_registry = None
+        return registry
+
+    def register(self, handle, name=None):
+        self.known.add(handle)
+        if name:
+            self.names[name] = handle
+        return handle
+
+    def handle(self, name):
+        if name not in self.names:
+            raise KeyError(f"No window registered as '{name}'. Known names: {sorted(self.names)}")
+        return self.names[name]
+
+    def new_window_opened(self):
+        """Wait predicate: returns the first window handle this registry has not seen yet."""
+        def _predicate(driver):
+            unknown = [handle for handle in driver.window_handles if handle not in self.known]
+            return unknown[0] if unknown else False
+        return _predicate
+
+    def switch_to(self, handle):
+        """Switches the driver to handle, skipping the round trip when it is already the current window."""
+        if handle != self.current:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+        return handle
+
+    def open_tab(self, name=None):
+        """Opens a new blank tab, switches to it and registers it."""
+        self.driver.switch_to.new_window("tab")
+        self.current = self.driver.current_window_handle
+        return self.register(self.current, name)
+
+    def close(self, handle):
+        """Closes the window with this handle and forgets it. Call switch_to() before using the driver again."""
+        self.switch_to(handle)
+        self.driver.close()
+        self.known.discard(handle)
+        self.names = {name: known for name, known in self.names.items() if known != handle}
+        self.current = None  # The driver has no current window until the next switch_to()